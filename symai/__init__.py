@@ -94,6 +94,7 @@ def _start_symai():
         _speech_engine_model_           = os.environ.get('SPEECH_ENGINE_MODEL', None)
         _indexing_engine_api_key_       = os.environ.get('INDEXING_ENGINE_API_KEY', None)
         _indexing_engine_environment_   = os.environ.get('INDEXING_ENGINE_ENVIRONMENT', None)
+        _indexing_engine_               = os.environ.get('INDEXING_ENGINE', None)
         _caption_engine_environment_    = os.environ.get('CAPTION_ENGINE_ENVIRONMENT', None)
 
         # SET/UPDATE THE API KEYS
@@ -120,6 +121,7 @@ def _start_symai():
         if _speech_engine_model_:         _symai_config_['SPEECH_ENGINE_MODEL']         = _speech_engine_model_
         if _indexing_engine_api_key_:     _symai_config_['INDEXING_ENGINE_API_KEY']     = _indexing_engine_api_key_
         if _indexing_engine_environment_: _symai_config_['INDEXING_ENGINE_ENVIRONMENT'] = _indexing_engine_environment_
+        if _indexing_engine_:             _symai_config_['INDEXING_ENGINE']             = _indexing_engine_
         if _caption_engine_environment_:  _symai_config_['CAPTION_ENGINE_ENVIRONMENT']  = _caption_engine_environment_
 
         # VERIFY IF THE CONFIGURATION FILE HAS CHANGED AND UPDATE IT
@@ -164,6 +166,7 @@ from .exceptions import *
 from .formatter import *
 from .imports import *
 from .interfaces import *
+from .lazy import LazyGraph, LazySymbol
 from .memory import *
 from .post_processors import *
 from .pre_processors import *
@@ -1,17 +1,27 @@
+import asyncio
 import logging
 import os
 import time
 from abc import ABC
-from typing import Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from .cache import InMemoryCache
+from .usage import usage_monitor
 
 
 class Engine(ABC):
+    # engines whose responses only depend on the rendered prompts and sampling parameters
+    cacheable = False
+
     def __init__(self) -> None:
         super().__init__()
         self.verbose    = False
         self.logging    = False
         self.log_level  = logging.DEBUG
         self.time_clock = False
+        self.cache      = None
+        self.rate_limit = None
         # create formatter
         os.makedirs('outputs', exist_ok=True)
         logging.basicConfig(filename="outputs/engine.log", filemode="a", format='%(asctime)s %(name)s %(levelname)s %(message)s')
@@ -33,9 +43,145 @@ class Engine(ABC):
             }
         }
         start_time = time.time()
-        res, metadata = self.forward(*args, **kwds)
+        key, cached = self._cache_lookup(kwds)
+        if cached is not None:
+            res, metadata = cached, {'cached': True}
+        else:
+            res, metadata = self.forward(*args, **kwds)
+            self._cache_store(key, res)
         req_time = time.time() - start_time
+        return self._log_call(log, res, metadata, req_time, kwds)
+
+    async def __acall__(self, *args: Any, **kwds: Any) -> List[str]:
+        log = {
+            'Input': {
+                'self': self,
+                'args': args,
+                **kwds
+            }
+        }
+        start_time = time.time()
+        key, cached = self._cache_lookup(kwds)
+        if cached is not None:
+            res, metadata = cached, {'cached': True}
+        else:
+            res, metadata = await self.aforward(*args, **kwds)
+            self._cache_store(key, res)
+        req_time = time.time() - start_time
+        return self._log_call(log, res, metadata, req_time, kwds)
+
+    def batch(self, wrp_params_list: List[Dict[str, Any]]) -> List[Any]:
+        start_time = time.time()
+        lookups    = [self._cache_lookup(kwds) for kwds in wrp_params_list]
+        misses     = [kwds for kwds, (_, cached) in zip(wrp_params_list, lookups) if cached is None]
+        outputs    = iter(self.batch_forward(misses) if len(misses) > 0 else [])
+        req_time   = time.time() - start_time
+        results    = []
+        for kwds, (key, cached) in zip(wrp_params_list, lookups):
+            if cached is not None:
+                output = (cached, {'cached': True})
+            else:
+                output = next(outputs)
+                if not isinstance(output, Exception):
+                    self._cache_store(key, output[0])
+            if isinstance(output, Exception):
+                results.append(output)
+                continue
+            log = {
+                'Input': {
+                    'self': self,
+                    'args': (),
+                    **kwds
+                }
+            }
+            res, metadata = output
+            results.append(self._log_call(log, res, metadata, req_time, kwds))
+        return results
+
+    def _cache_lookup(self, kwds: Dict[str, Any]):
+        if self.cache is None or not self.cacheable or 'prompts' not in kwds or ('stream' in kwds and kwds['stream']):
+            return None, None
+        key = self.cache.key(self, kwds)
+        return key, self.cache.get(key)
+
+    def _cache_store(self, key: str, res: Any) -> None:
+        if key is not None:
+            self.cache.set(key, res)
+
+    def _throttle(self, tokens: int) -> None:
+        if self.rate_limit is not None:
+            self.rate_limit.acquire(tokens)
+
+    async def _athrottle(self, tokens: int) -> None:
+        if self.rate_limit is not None:
+            await self.rate_limit.aacquire(tokens)
+
+    def _prepare_stream(self, res, prompts_: List[str], kwargs, delta) -> tuple:
+        # wraps a streamed API response into a (sync or async) generator of text deltas
+        output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+        # the usage of a stream is only known once it is exhausted (or closed), it is recorded for the trackers which
+        # were active when the request was sent
+        accumulators   = usage_monitor.attached()
+        start_time     = time.time()
+        usage          = {}
+        texts          = []
+
+        def _consume(chunk):
+            if output_handler:
+                output_handler(chunk)
+            if isinstance(chunk, dict) and chunk.get('usage'):
+                usage.update(chunk['usage'])
+            text = delta(chunk)
+            if text:
+                texts.append(text)
+            return text
+
+        def _record():
+            if len(usage) == 0:
+                usage['prompt_tokens']     = self._count_tokens(prompts_)
+                usage['completion_tokens'] = self._count_tokens(''.join(texts))
+            usage_monitor.record(self, kwargs, {'usage': usage}, time.time() - start_time, accumulators=accumulators)
+
+        def _deltas():
+            try:
+                for chunk in res:
+                    text = _consume(chunk)
+                    if text:
+                        yield text
+            finally:
+                _record()
+
+        async def _adeltas():
+            try:
+                async for chunk in res:
+                    text = _consume(chunk)
+                    if text:
+                        yield text
+            finally:
+                _record()
+
+        metadata = {'stream': True}
+        if 'metadata' in kwargs and kwargs['metadata']:
+            metadata['kwargs'] = kwargs
+            metadata['input']  = prompts_
+            metadata['output'] = res
+
+        return [_adeltas() if hasattr(res, '__aiter__') else _deltas()], metadata
+
+    def _count_tokens(self, prompts) -> int:
+        # token count of the prompts or the response of a streamed call, which reports no usage
+        try:
+            if isinstance(prompts, str):
+                return len(self.tokenizer.encode(prompts, disallowed_special=())) if hasattr(self, 'tokenizer') else 0
+            return self.compute_required_tokens(prompts) if hasattr(self, 'compute_required_tokens') else 0
+        except Exception:
+            return 0
+
+    def _log_call(self, log, res, metadata, req_time, kwds):
         metadata['time'] = req_time
+        # streamed calls are recorded by their stream once it is consumed
+        if not ('stream' in metadata and metadata['stream']):
+            usage_monitor.record(self, kwds, metadata, req_time, cached='cached' in metadata and metadata['cached'])
         if self.time_clock:
             print(f"{kwds['func']}: {req_time} sec")
         log['Output'] = res
@@ -53,6 +199,20 @@ class Engine(ABC):
     def forward(self, *args: Any, **kwds: Any) -> List[str]:
         raise NotADirectoryError()
 
+    def batch_forward(self, wrp_params_list: List[Dict[str, Any]]) -> List[Any]:
+        # engines without a native batch endpoint fan the requests out concurrently
+        def _forward(kwds):
+            try:
+                return self.forward(**kwds)
+            except Exception as e:
+                return e
+        with ThreadPoolExecutor(max_workers=max(len(wrp_params_list), 1)) as executor:
+            return list(executor.map(_forward, wrp_params_list))
+
+    async def aforward(self, *args: Any, **kwds: Any) -> List[str]:
+        # engines without a native async client run the blocking call in a worker thread
+        return await asyncio.to_thread(self.forward, *args, **kwds)
+
     def prepare(self, args, kwargs, wrp_params):
         raise NotImplementedError()
 
@@ -65,3 +225,10 @@ class Engine(ABC):
             self.log_level = wrp_params['log_level']
         if 'time_clock' in wrp_params:
             self.time_clock = wrp_params['time_clock']
+        if 'cache' in wrp_params:
+            # True enables an in-memory LRU cache, a ResponseCache instance selects the backend, False / None disables caching
+            cache      = wrp_params['cache']
+            self.cache = InMemoryCache() if cache is True else (None if cache is False else cache)
+        if 'rate_limit' in wrp_params:
+            # a RateLimiter instance throttles the engine requests, None disables client-side throttling
+            self.rate_limit = wrp_params['rate_limit']
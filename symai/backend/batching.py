@@ -0,0 +1,84 @@
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+
+_batch_scheduler: ContextVar[Optional['BatchScheduler']] = ContextVar('batch_scheduler', default=None)
+
+
+def current_batch_scheduler() -> Optional['BatchScheduler']:
+    return _batch_scheduler.get()
+
+
+class _BatchRequest:
+    def __init__(self, wrp_params: Dict[str, Any]):
+        self.wrp_params = wrp_params
+        self.result     = None
+        self.error      = None
+        self.done       = threading.Event()
+
+
+class BatchScheduler:
+    '''
+    Collects engine requests issued concurrently from multiple threads and dispatches them as one batched engine call.
+    The first request of a batch waits up to `max_wait` seconds for others to join (or until `max_batch_size` is reached),
+    then sends the whole batch through `Engine.batch` and hands every caller its own result.
+    The scheduler is activated for the current context with a `with` block.
+    '''
+    def __init__(self, max_batch_size: int = 32, max_wait: float = 0.05):
+        self.max_batch_size = max_batch_size
+        self.max_wait       = max_wait
+        self._cond          = threading.Condition()
+        self._pending       = {}
+        self._token         = None
+
+    def __enter__(self) -> 'BatchScheduler':
+        self._token = _batch_scheduler.set(self)
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        _batch_scheduler.reset(self._token)
+
+    def submit(self, engine, wrp_params: Dict[str, Any]):
+        request = _BatchRequest(wrp_params)
+        with self._cond:
+            queue  = self._pending.setdefault(id(engine), [])
+            queue.append(request)
+            leader = len(queue) == 1
+            if len(queue) >= self.max_batch_size:
+                self._cond.notify_all()
+
+        if leader:
+            deadline = time.time() + self.max_wait
+            with self._cond:
+                while len(queue) < self.max_batch_size:
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                # later requests open a new queue with their own leader
+                del self._pending[id(engine)]
+            self._dispatch(engine, queue)
+
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _dispatch(self, engine, queue: List[_BatchRequest]) -> None:
+        for i in range(0, len(queue), self.max_batch_size):
+            batch = queue[i:i + self.max_batch_size]
+            try:
+                outputs = engine.batch([request.wrp_params for request in batch])
+                for request, output in zip(batch, outputs):
+                    if isinstance(output, Exception):
+                        request.error  = output
+                    else:
+                        request.result = output
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+            finally:
+                for request in batch:
+                    request.done.set()
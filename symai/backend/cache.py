@@ -0,0 +1,351 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+# request parameters which change the response of an engine and therefore are part of the cache key
+SAMPLING_PARAMS = ['max_tokens', 'temperature', 'top_p', 'top_k', 'stop', 'suffix', 'template_suffix',
+                   'frequency_penalty', 'presence_penalty', 'n', 'seed']
+
+
+class ResponseCache:
+    '''
+    Base class of the engine response caches.
+    Entries are addressed by a stable hash over the engine, the model, the rendered prompts and the sampling parameters.
+    Subclasses implement the storage backend via `_get`, `_set`, `_clear` and `__len__`.
+    '''
+    def __init__(self, ttl: Optional[float] = None, max_size: int = 10_000):
+        self.ttl      = ttl
+        self.max_size = max_size
+        self.hits     = 0
+        self.misses   = 0
+        self._lock    = threading.RLock()
+
+    @staticmethod
+    def key(engine, wrp_params: Dict[str, Any]) -> str:
+        model  = wrp_params['model'] if 'model' in wrp_params else getattr(engine, 'model', None)
+        params = {k: wrp_params[k] for k in SAMPLING_PARAMS if k in wrp_params}
+        entry  = {
+            'engine':  type(engine).__name__,
+            'model':   model,
+            'prompts': wrp_params['prompts'],
+            'params':  params
+        }
+        data = json.dumps(entry, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._get(key)
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits   += 1
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._set(key, value)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clear()
+            self.hits   = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits':     self.hits,
+                'misses':   self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0.,
+                'size':     len(self)
+            }
+
+    def _expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError()
+
+    def _set(self, key: str, value: Any) -> None:
+        raise NotImplementedError()
+
+    def _clear(self) -> None:
+        raise NotImplementedError()
+
+    def __len__(self) -> int:
+        raise NotImplementedError()
+
+
+class InMemoryCache(ResponseCache):
+    '''
+    Least-recently-used response cache kept in process memory.
+    '''
+    def __init__(self, ttl: Optional[float] = None, max_size: int = 10_000):
+        super().__init__(ttl=ttl, max_size=max_size)
+        self._entries = OrderedDict()
+
+    def _get(self, key: str) -> Optional[Any]:
+        if key not in self._entries:
+            return None
+        created, value = self._entries[key]
+        if self._expired(created):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.time(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(ResponseCache):
+    '''
+    Persistent response cache stored in a SQLite database, shared across processes and runs.
+    Least-recently-used entries are evicted once `max_size` is exceeded.
+    '''
+    def __init__(self, path: Optional[str] = None, ttl: Optional[float] = None, max_size: int = 100_000):
+        super().__init__(ttl=ttl, max_size=max_size)
+        if path is None:
+            path = Path.home() / '.symai' / 'cache' / 'responses.db'
+        os.makedirs(Path(path).parent, exist_ok=True)
+        self.path  = str(path)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, value BLOB, created REAL, accessed REAL)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)')
+        self._conn.commit()
+
+    def _get(self, key: str) -> Optional[Any]:
+        row = self._conn.execute('SELECT value, created FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        value, created = row
+        if self._expired(created):
+            self._conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+            self._conn.commit()
+            return None
+        self._conn.execute('UPDATE responses SET accessed = ? WHERE key = ?', (time.time(), key))
+        self._conn.commit()
+        return pickle.loads(value)
+
+    def _set(self, key: str, value: Any) -> None:
+        now = time.time()
+        self._conn.execute('INSERT OR REPLACE INTO responses (key, value, created, accessed) VALUES (?, ?, ?, ?)',
+                           (key, pickle.dumps(value), now, now))
+        if self.ttl is not None:
+            self._conn.execute('DELETE FROM responses WHERE created < ?', (now - self.ttl,))
+        overflow = len(self) - self.max_size
+        if overflow > 0:
+            self._conn.execute('DELETE FROM responses WHERE key IN (SELECT key FROM responses ORDER BY accessed ASC LIMIT ?)', (overflow,))
+        self._conn.commit()
+
+    def _clear(self) -> None:
+        self._conn.execute('DELETE FROM responses')
+        self._conn.commit()
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM responses').fetchone()[0]
+
+
+class _EmbeddingStore:
+    def __init__(self, path: Path, growth: int = 1024):
+        self.path     = path
+        self.growth   = growth
+        self.index    = {}
+        self.dim      = None
+        self.capacity = 0
+        self.vectors  = None
+        os.makedirs(path, exist_ok=True)
+        meta_path = path / 'meta.json'
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            self.dim      = meta['dim']
+            self.capacity = meta['capacity']
+            self.vectors  = np.memmap(path / 'vectors.f32', dtype=np.float32, mode='r+', shape=(self.capacity, self.dim))
+        if os.path.exists(path / 'keys.txt'):
+            with open(path / 'keys.txt', 'r') as f:
+                for row, key in enumerate(f):
+                    self.index[key.strip()] = row
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self.index.get(key)
+        return None if row is None else self.vectors[row]
+
+    def put(self, keys: List[str], vectors: np.ndarray) -> None:
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+        rows = len(self.index)
+        if rows + len(keys) > self.capacity:
+            self._grow(rows + len(keys))
+        self.vectors[rows:rows + len(keys)] = vectors
+        self.vectors.flush()
+        # the key file is appended last, so an interrupted write never indexes an incomplete vector
+        with open(self.path / 'keys.txt', 'a') as f:
+            f.write(''.join(f'{key}\n' for key in keys))
+        for i, key in enumerate(keys):
+            self.index[key] = rows + i
+
+    def _grow(self, size: int) -> None:
+        capacity = max(size, self.capacity * 2, self.growth)
+        if self.vectors is not None:
+            self.vectors.flush()
+            del self.vectors
+        with open(self.path / 'vectors.f32', 'ab') as f:
+            f.truncate(capacity * self.dim * np.dtype(np.float32).itemsize)
+        self.capacity = capacity
+        self.vectors  = np.memmap(self.path / 'vectors.f32', dtype=np.float32, mode='r+', shape=(self.capacity, self.dim))
+        with open(self.path / 'meta.json', 'w') as f:
+            json.dump({'dim': self.dim, 'capacity': self.capacity}, f)
+
+
+class EmbeddingCache:
+    '''
+    Persistent embedding cache keyed by (model, text hash).
+    The vectors of each model are kept in a memory-mapped float32 matrix next to a key index, so lookups
+    do not load the whole store into memory and only uncached texts need to be sent to the embedding API.
+    '''
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            path = Path.home() / '.symai' / 'cache' / 'embeddings'
+        self.path    = Path(path)
+        self.hits    = 0
+        self.misses  = 0
+        self._stores = {}
+        self._lock   = threading.Lock()
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(str(text).encode('utf-8')).hexdigest()
+
+    def _store(self, model: str) -> _EmbeddingStore:
+        if model not in self._stores:
+            self._stores[model] = _EmbeddingStore(self.path / model.replace('/', '_'))
+        return self._stores[model]
+
+    def get(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        with self._lock:
+            store   = self._store(model)
+            vectors = [store.get(self.key(text)) for text in texts]
+            vectors = [None if v is None else v.tolist() for v in vectors]
+            misses  = sum([v is None for v in vectors])
+            self.misses += misses
+            self.hits   += len(vectors) - misses
+            return vectors
+
+    def put(self, model: str, texts: List[str], vectors: List[List[float]]) -> None:
+        with self._lock:
+            store = self._store(model)
+            keys  = []
+            rows  = []
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                if key in store.index or key in keys:
+                    continue
+                keys.append(key)
+                rows.append(vector)
+            if len(keys) > 0:
+                store.put(keys, np.asarray(rows, dtype=np.float32))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits':     self.hits,
+                'misses':   self.misses,
+                'hit_rate': self.hits / total if total > 0 else 0.,
+                'size':     sum([len(store.index) for store in self._stores.values()])
+            }
+
+
+class FileTextCache:
+    '''
+    Persistent cache of the text extracted from files, stored in a SQLite database.
+    An entry is valid as long as the modification time and the size of the file are unchanged. Texts extracted with
+    different reader arguments are stored as separate variants of the file. Least-recently-used entries are evicted
+    once more than `max_size` entries or `max_chars` characters are stored.
+    '''
+    def __init__(self, path: Optional[str] = None, max_size: int = 10_000, max_chars: int = 200_000_000):
+        if path is None:
+            path = Path.home() / '.symai' / 'cache' / 'files.db'
+        os.makedirs(Path(path).parent, exist_ok=True)
+        self.path      = str(path)
+        self.max_size  = max_size
+        self.max_chars = max_chars
+        self.hits      = 0
+        self.misses    = 0
+        self._lock     = threading.Lock()
+        self._conn     = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('DROP TABLE IF EXISTS files') # entries of the former schema without variants
+        self._conn.execute('CREATE TABLE IF NOT EXISTS file_texts (key TEXT PRIMARY KEY, mtime REAL, size INTEGER, '
+                           'length INTEGER, accessed REAL, text TEXT)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS file_texts_accessed ON file_texts (accessed)')
+        self._conn.commit()
+
+    @staticmethod
+    def key(path: str, variant: str = '') -> str:
+        return f'{os.path.abspath(path)}\0{variant}'
+
+    def get(self, path: str, variant: str = '') -> Optional[str]:
+        stat = os.stat(path)
+        key  = self.key(path, variant)
+        with self._lock:
+            row = self._conn.execute('SELECT mtime, size, text FROM file_texts WHERE key = ?', (key,)).fetchone()
+            if row is None or row[0] != stat.st_mtime or row[1] != stat.st_size:
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE file_texts SET accessed = ? WHERE key = ?', (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[2]
+
+    def put(self, path: str, text: str, stat: Optional[os.stat_result] = None, variant: str = '') -> None:
+        # pass the stat taken before reading the file, so that a concurrent modification invalidates the entry
+        stat = os.stat(path) if stat is None else stat
+        with self._lock:
+            self._conn.execute('INSERT OR REPLACE INTO file_texts (key, mtime, size, length, accessed, text) VALUES (?, ?, ?, ?, ?, ?)',
+                               (self.key(path, variant), stat.st_mtime, stat.st_size, len(text), time.time(), text))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        count, chars = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(length), 0) FROM file_texts').fetchone()
+        if count <= self.max_size and chars <= self.max_chars:
+            return
+        evicted = []
+        for key, length in self._conn.execute('SELECT key, length FROM file_texts ORDER BY accessed ASC').fetchall():
+            if count <= self.max_size and chars <= self.max_chars:
+                break
+            evicted.append((key,))
+            count -= 1
+            chars -= length
+        self._conn.executemany('DELETE FROM file_texts WHERE key = ?', evicted)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM file_texts').fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM file_texts')
+            self._conn.commit()
@@ -8,6 +8,7 @@ from bardapi import Bard
 from .base import Engine
 from .mixin.openai import OpenAIMixin
 from .settings import SYMAI_CONFIG
+from ..utils import CachedTokenizer
 
 
 class GPTXCompletionEngine(Engine, OpenAIMixin):
@@ -18,7 +19,7 @@ class GPTXCompletionEngine(Engine, OpenAIMixin):
         self.api_key    = config['NEUROSYMBOLIC_ENGINE_API_KEY']
         self.model      = config['NEUROSYMBOLIC_ENGINE_MODEL']
         logger          = logging.getLogger('openai')
-        self.tokenizer  = tiktoken.encoding_for_model(self.model)
+        self.tokenizer  = CachedTokenizer(tiktoken.encoding_for_model(self.model))
         self.pricing    = self.api_pricing()
         self.max_tokens = self.api_max_tokens()
         self.bard       = None
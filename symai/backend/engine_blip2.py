@@ -1,6 +1,5 @@
 from typing import List
 
-import requests
 import torch
 from accelerate import init_empty_weights
 from lavis.models import load_model, load_model_and_preprocess, load_preprocess
@@ -9,6 +8,7 @@ from lavis.processors import load_processor
 from PIL import Image
 
 from .base import Engine
+from .sessions import session_pool
 from .settings import SYMAI_CONFIG
 
 
@@ -47,7 +47,7 @@ class Blip2Engine(Engine):
             input_handler((image, prompt))
 
         if 'http' in image:
-            image = Image.open(requests.get(image, stream=True).raw).convert('RGB')
+            image = Image.open(session_pool().get(image, stream=True).raw).convert('RGB')
         elif '/' in image or '\\' in image:
             image = Image.open(image).convert('RGB')
 
@@ -1,10 +1,10 @@
 from typing import List
 
-import requests
 from PIL import Image
 from transformers import CLIPModel, CLIPProcessor
 
 from .base import Engine
+from .sessions import session_pool
 from .settings import SYMAI_CONFIG
 
 
@@ -37,14 +37,14 @@ class CLIPEngine(Engine):
             input_handler((image_url, text))
 
         if text is None:
-            image = Image.open(requests.get(image_url, stream=True).raw)
+            image = Image.open(session_pool().get(image_url, stream=True).raw)
             inputs = self.processor(images=image, return_tensors="pt")
             rsp = self.model.get_image_features(**inputs)
         elif image_url is None:
             inputs = self.processor(text=text, return_tensors="pt")
             rsp = self.model.get_text_features(**inputs)
         else:
-            image = Image.open(requests.get(image_url, stream=True).raw)
+            image = Image.open(session_pool().get(image_url, stream=True).raw)
             inputs = self.processor(text=text, images=image, return_tensors="pt", padding=True)
             outputs = self.model(**inputs)
             logits_per_image = outputs.logits_per_image  # this is the image-text similarity score
@@ -1,54 +1,117 @@
+import asyncio
+import functools
 import logging
 from typing import List
 
 import openai
 
 from .base import Engine
+from .cache import EmbeddingCache
 from .mixin.openai import OpenAIMixin
+from .ratelimit import shared_rate_limiter
 from .settings import SYMAI_CONFIG
 
 
 class EmbeddingEngine(Engine, OpenAIMixin):
+    cacheable = True
+
     def __init__(self):
         super().__init__()
         logger = logging.getLogger('openai')
         logger.setLevel(logging.WARNING)
         config                  = SYMAI_CONFIG
-        openai.api_key          = config['EMBEDDING_ENGINE_API_KEY']
+        self.api_key            = config['EMBEDDING_ENGINE_API_KEY']
         self.model              = config['EMBEDDING_ENGINE_MODEL']
         self.pricing            = self.api_pricing()
         self.max_tokens         = self.api_max_tokens()
+        self.embedding_cache    = EmbeddingCache() if config.get('EMBEDDING_ENGINE_CACHE', False) else None
+        self.rate_limit         = shared_rate_limiter('EMBEDDING_ENGINE', config.get('EMBEDDING_ENGINE_RPM'), config.get('EMBEDDING_ENGINE_TPM'))
 
     def command(self, wrp_params):
         super().command(wrp_params)
         if 'EMBEDDING_ENGINE_API_KEY' in wrp_params:
-            openai.api_key = wrp_params['EMBEDDING_ENGINE_API_KEY']
+            self.api_key = wrp_params['EMBEDDING_ENGINE_API_KEY']
         if 'EMBEDDING_ENGINE_MODEL' in wrp_params:
             self.model = wrp_params['EMBEDDING_ENGINE_MODEL']
+        if 'embedding_cache' in wrp_params:
+            # True enables the default on-disk cache, an EmbeddingCache instance selects another location
+            cache                = wrp_params['embedding_cache']
+            self.embedding_cache = EmbeddingCache() if cache is True else (None if cache is False else cache)
+
+    def compute_required_tokens(self, prompts: List[str]) -> int:
+        # rough estimate of ~4 characters per token, the embedding engine does not load a tokenizer
+        return sum([len(str(p)) for p in prompts]) // 4 + 1
 
     def forward(self, prompts: List[str], *args, **kwargs) -> List[str]:
+        prompts_, missing, rsp = self._prepare_request(prompts, kwargs)
+        except_remedy          = kwargs['except_remedy'] if 'except_remedy' in kwargs else None
+
+        res = None
+        if len(missing) > 0:
+            inputs = [prompts_[i] for i in missing]
+            self._throttle(self.compute_required_tokens(inputs))
+            try:
+                res = openai.Embedding.create(api_key=self.api_key,
+                                              model=self.model,
+                                              input=inputs)
+                output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+                if output_handler:
+                    output_handler(res)
+            except Exception as e:
+                if except_remedy is None:
+                    raise e
+                callback = functools.partial(openai.Embedding.create, api_key=self.api_key)
+                res = except_remedy(e, inputs, callback, self, *args, **kwargs)
+
+        return self._prepare_response(res, prompts_, missing, rsp, kwargs)
+
+    async def aforward(self, prompts: List[str], *args, **kwargs) -> List[str]:
+        prompts_, missing, rsp = self._prepare_request(prompts, kwargs)
+        except_remedy          = kwargs['except_remedy'] if 'except_remedy' in kwargs else None
+
+        res = None
+        if len(missing) > 0:
+            inputs = [prompts_[i] for i in missing]
+            await self._athrottle(self.compute_required_tokens(inputs))
+            try:
+                res = await openai.Embedding.acreate(api_key=self.api_key,
+                                                     model=self.model,
+                                                     input=inputs)
+                output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+                if output_handler:
+                    output_handler(res)
+            except Exception as e:
+                if except_remedy is None:
+                    raise e
+                callback = functools.partial(openai.Embedding.create, api_key=self.api_key)
+                res = await asyncio.to_thread(except_remedy, e, inputs, callback, self, *args, **kwargs)
+
+        return self._prepare_response(res, prompts_, missing, rsp, kwargs)
+
+    def _prepare_request(self, prompts: List[str], kwargs) -> tuple:
         prompts_      = prompts if isinstance(prompts, list) else [prompts]
-        except_remedy = kwargs['except_remedy'] if 'except_remedy' in kwargs else None
         input_handler = kwargs['input_handler'] if 'input_handler' in kwargs else None
 
         if input_handler:
             input_handler((prompts_,))
 
-        try:
-            res = openai.Embedding.create(model=self.model,
-                                            input=prompts_)
-            output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
-            if output_handler:
-                output_handler(res)
-        except Exception as e:
-            if except_remedy is None:
-                raise e
-            callback = openai.Embedding.create
-            res = except_remedy(e, prompts_, callback, self, *args, **kwargs)
-
-        rsp = [r['embedding'] for r in res['data']]
-
-        metadata = {}
+        # only texts without a cached embedding are sent to the API
+        if self.embedding_cache is not None:
+            rsp = self.embedding_cache.get(self.model, prompts_)
+        else:
+            rsp = [None] * len(prompts_)
+        missing = [i for i, emb in enumerate(rsp) if emb is None]
+        return prompts_, missing, rsp
+
+    def _prepare_response(self, res, prompts_: List[str], missing: List[int], rsp: List, kwargs) -> tuple:
+        if res is not None:
+            embeddings = [r['embedding'] for r in res['data']]
+            for i, emb in zip(missing, embeddings):
+                rsp[i] = emb
+            if self.embedding_cache is not None:
+                self.embedding_cache.put(self.model, [prompts_[i] for i in missing], embeddings)
+
+        metadata = {'usage': res['usage'] if res is not None and 'usage' in res else None}
         if 'metadata' in kwargs and kwargs['metadata']:
             metadata['kwargs'] = kwargs
             metadata['input']  = prompts_
@@ -1,14 +1,69 @@
-from typing import List
+import hashlib
+import multiprocessing
+import os
+import threading
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import List, Optional
 
 import PyPDF2
 from tika import unpack
 
 from .base import Engine
+from .cache import SQLiteCache
+
+
+def _extract_pages(path: str, pages: List[int]) -> List[str]:
+    # runs in a worker process, every worker parses the document on its own
+    with open(path, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        return [pdf_reader.pages[i].extract_text() for i in pages]
+
+
+def _file_digest(path: str, block_size: int = 1 << 20) -> str:
+    sha = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            sha.update(block)
+    return sha.hexdigest()
 
 
 class FileEngine(Engine):
-    def __init__(self):
+    '''
+    Reads PDFs with PyPDF2 and all other files with tika.
+    By default the pages of a PDF are extracted in the calling process. With `workers > 1` large documents are extracted
+    in a pool of up to `workers` processes shared by all calls of the engine. The workers are spawned and import the
+    `__main__` module of the caller, so a script which enables the pool must guard its entry point with
+    `if __name__ == '__main__':`. If the pool can not be started the pages are extracted in the calling process.
+    '''
+    def __init__(self, workers: Optional[int] = None, min_pages_per_worker: int = 16):
         super().__init__()
+        # upper bound of extraction processes, shared by all concurrent `read_pdf` calls of the engine
+        self.workers              = workers or 0
+        self.min_pages_per_worker = min_pages_per_worker
+        self.pdf_cache            = None
+        self._pool                = None
+        self._pool_lock           = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        # created on the first large document; the workers are spawned instead of forked, since the engine is called
+        # from multiple threads (e.g. by the FileMerger) and forking a multi-threaded process is unsafe
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def close(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+
+    def _pdf_cache(self) -> SQLiteCache:
+        if self.pdf_cache is None:
+            self.pdf_cache = SQLiteCache(path=os.path.join(os.path.expanduser('~'), '.symai', 'cache', 'pdf.db'), max_size=1_000)
+        return self.pdf_cache
 
     def reset_eof_of_pdf_return_stream(self, pdf_stream_in: list):
         actual_line = len(pdf_stream_in)  # Predefined value in case EOF not found
@@ -39,17 +94,42 @@ class FileEngine(Engine):
         return fixed_pdf
 
     def read_text(self, pdf_reader, range_):
-        txt = ''
         n_pages = len(pdf_reader.pages)
-        if range_ is None:
-            for i in range(n_pages):
-                page = pdf_reader.pages[i]
-                txt += page.extract_text()
-        else:
-            for i in range(n_pages)[range_]:
-                page = pdf_reader.pages[i]
-                txt += page.extract_text()
-        return txt
+        pages   = range(n_pages) if range_ is None else range(n_pages)[range_]
+        return ''.join([pdf_reader.pages[i].extract_text() for i in pages])
+
+    def read_pdf(self, path: str, range_) -> str:
+        '''
+        Extracts the text of the selected pages only. Large page selections are split into contiguous shards which are
+        extracted in the process pool of the engine. The page texts are cached by the hash of the file content.
+        '''
+        digest = _file_digest(path)
+        with open(path, 'rb') as f:
+            n_pages = len(PyPDF2.PdfReader(f).pages)
+        pages   = list(range(n_pages) if range_ is None else range(n_pages)[range_])
+        cache   = self._pdf_cache()
+        cached  = cache.get(digest) or {}
+        missing = [i for i in pages if i not in cached]
+
+        if len(missing) > 0:
+            workers = min(self.workers, len(missing) // self.min_pages_per_worker)
+            if workers > 1:
+                size   = -(-len(missing) // workers)
+                shards = [missing[i:i + size] for i in range(0, len(missing), size)]
+                try:
+                    texts = [txt for shard in self._executor().map(_extract_pages, [path] * len(shards), shards) for txt in shard]
+                except BrokenProcessPool as e:
+                    warnings.warn(f'PDF extraction pool failed ({e}), extracting the pages in-process instead. '
+                                  f"Scripts using FileEngine(workers > 1) need an `if __name__ == '__main__':` guard.")
+                    self.close()
+                    self.workers = 0
+                    texts = _extract_pages(path, missing)
+            else:
+                texts = _extract_pages(path, missing)
+            cached = {**cached, **dict(zip(missing, texts))}
+            cache.set(digest, cached)
+
+        return ''.join([cached[i] for i in pages])
 
     def forward(self, *args, **kwargs) -> List[str]:
         path          = kwargs['prompt']
@@ -66,10 +146,7 @@ class FileEngine(Engine):
         if '.pdf' in path:
             rsp = ''
             try:
-                with open(str(path), 'rb') as f:
-                    # creating a pdf reader object
-                    pdf_reader = PyPDF2.PdfReader(f)
-                    rsp = self.read_text(pdf_reader, range_)
+                rsp = self.read_pdf(str(path), range_)
             except Exception as e:
                 print(f'Error reading PDF: {e} | {path}')
                 if 'fix_pdf' not in kwargs or not kwargs['fix_pdf']:
@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import logging
 from typing import List
 
@@ -6,26 +8,31 @@ import tiktoken
 
 from .base import Engine
 from .mixin.openai import OpenAIMixin
+from .ratelimit import shared_rate_limiter
 from .settings import SYMAI_CONFIG
 from ..strategy import InvalidRequestErrorRemedyChatStrategy
+from ..utils import CachedTokenizer
 
 
 class GPTXChatEngine(Engine, OpenAIMixin):
+    cacheable = True
+
     def __init__(self):
         super().__init__()
         logger = logging.getLogger('openai')
         logger.setLevel(logging.WARNING)
         config          = SYMAI_CONFIG
-        openai.api_key  = config['NEUROSYMBOLIC_ENGINE_API_KEY']
+        self.api_key    = config['NEUROSYMBOLIC_ENGINE_API_KEY']
         self.model      = config['NEUROSYMBOLIC_ENGINE_MODEL']
-        self.tokenizer  = tiktoken.encoding_for_model(self.model)
+        self.tokenizer  = CachedTokenizer(tiktoken.encoding_for_model(self.model))
         self.pricing    = self.api_pricing()
         self.max_tokens = self.api_max_tokens() - 100 # TODO: account for tolerance. figure out how their magic number works to compute reliably the precise max token size
+        self.rate_limit = shared_rate_limiter('NEUROSYMBOLIC_ENGINE', config.get('NEUROSYMBOLIC_ENGINE_RPM'), config.get('NEUROSYMBOLIC_ENGINE_TPM'))
 
     def command(self, wrp_params):
         super().command(wrp_params)
         if 'NEUROSYMBOLIC_ENGINE_API_KEY' in wrp_params:
-            openai.api_key = wrp_params['NEUROSYMBOLIC_ENGINE_API_KEY']
+            self.api_key = wrp_params['NEUROSYMBOLIC_ENGINE_API_KEY']
         if 'NEUROSYMBOLIC_ENGINE_MODEL' in wrp_params:
             self.model = wrp_params['NEUROSYMBOLIC_ENGINE_MODEL']
 
@@ -41,6 +48,39 @@ class GPTXChatEngine(Engine, OpenAIMixin):
         return int((self.max_tokens - val) * 0.99) # TODO: figure out how their magic number works to compute reliably the precise max token size
 
     def forward(self, prompts: List[str], *args, **kwargs) -> List[str]:
+        prompts_, params, except_remedy = self._prepare_request(prompts, kwargs)
+        self._throttle(self.compute_required_tokens(prompts_) + params['max_tokens'])
+
+        try:
+            res = openai.ChatCompletion.create(**params)
+            if params['stream']:
+                return self._prepare_stream(res, prompts_, kwargs, lambda chunk: chunk['choices'][0]['delta'].get('content'))
+            output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+            if output_handler:
+                output_handler(res)
+        except Exception as e:
+            res = self._handle_exception(e, prompts_, except_remedy, *args, **kwargs)
+
+        return self._prepare_response(res, prompts, prompts_, kwargs)
+
+    async def aforward(self, prompts: List[str], *args, **kwargs) -> List[str]:
+        prompts_, params, except_remedy = self._prepare_request(prompts, kwargs)
+        await self._athrottle(self.compute_required_tokens(prompts_) + params['max_tokens'])
+
+        try:
+            res = await openai.ChatCompletion.acreate(**params)
+            if params['stream']:
+                return self._prepare_stream(res, prompts_, kwargs, lambda chunk: chunk['choices'][0]['delta'].get('content'))
+            output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+            if output_handler:
+                output_handler(res)
+        except Exception as e:
+            # remedy strategies retry through the blocking client
+            res = await asyncio.to_thread(self._handle_exception, e, prompts_, except_remedy, *args, **kwargs)
+
+        return self._prepare_response(res, prompts, prompts_, kwargs)
+
+    def _prepare_request(self, prompts: List[str], kwargs) -> tuple:
         prompts_            = prompts
         input_handler       = kwargs['input_handler'] if 'input_handler' in kwargs else None
         if input_handler:
@@ -57,36 +97,38 @@ class GPTXChatEngine(Engine, OpenAIMixin):
         presence_penalty    = kwargs['presence_penalty'] if 'presence_penalty' in kwargs else 0
         top_p               = kwargs['top_p'] if 'top_p' in kwargs else 1
         except_remedy       = kwargs['except_remedy'] if 'except_remedy' in kwargs else None
-
+        stream              = kwargs['stream'] if 'stream' in kwargs else False
+
+        params = {
+            'api_key': self.api_key,
+            'model': model,
+            'messages': prompts_,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'frequency_penalty': frequency_penalty,
+            'presence_penalty': presence_penalty,
+            'top_p': top_p,
+            'stop': stop,
+            'stream': stream,
+            'n': 1
+        }
+        return prompts_, params, except_remedy
+
+    def _handle_exception(self, e: Exception, prompts_: List[str], except_remedy, *args, **kwargs):
+        callback = functools.partial(openai.ChatCompletion.create, api_key=self.api_key)
+        kwargs['model'] = kwargs['model'] if 'model' in kwargs else self.model
+        if except_remedy is not None:
+            return except_remedy(e, prompts_, callback, self, *args, **kwargs)
         try:
-            res = openai.ChatCompletion.create(model=model,
-                                               messages=prompts_,
-                                               max_tokens=max_tokens,
-                                               temperature=temperature,
-                                               frequency_penalty=frequency_penalty,
-                                               presence_penalty=presence_penalty,
-                                               top_p=top_p,
-                                               stop=stop,
-                                               n=1)
-            output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
-            if output_handler:
-                output_handler(res)
-        except Exception as e:
-            callback = openai.ChatCompletion.create
-            kwargs['model'] = kwargs['model'] if 'model' in kwargs else self.model
-            if except_remedy is not None:
-                res = except_remedy(e, prompts_, callback, self, *args, **kwargs)
-            else:
-                try:
-                    # implicit remedy strategy
-                    except_remedy = InvalidRequestErrorRemedyChatStrategy()
-                    res = except_remedy(e, prompts_, callback, self, *args, **kwargs)
-                except Exception as e2:
-                    ex = Exception(f'Failed to handle exception: {e}. Also failed implicit remedy strategy after retry: {e2}')
-                    raise ex from e
-
-
-        metadata = {}
+            # implicit remedy strategy
+            except_remedy = InvalidRequestErrorRemedyChatStrategy()
+            return except_remedy(e, prompts_, callback, self, *args, **kwargs)
+        except Exception as e2:
+            ex = Exception(f'Failed to handle exception: {e}. Also failed implicit remedy strategy after retry: {e2}')
+            raise ex from e
+
+    def _prepare_response(self, res, prompts: List[str], prompts_: List[str], kwargs) -> tuple:
+        metadata = {'usage': res['usage'] if 'usage' in res else None}
         if 'metadata' in kwargs and kwargs['metadata']:
             metadata['kwargs'] = kwargs
             metadata['input']  = prompts_
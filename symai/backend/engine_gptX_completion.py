@@ -1,3 +1,5 @@
+import asyncio
+import functools
 import logging
 from typing import List
 
@@ -6,26 +8,31 @@ import tiktoken
 
 from .base import Engine
 from .mixin.openai import OpenAIMixin
+from .ratelimit import shared_rate_limiter
 from .settings import SYMAI_CONFIG
 from ..strategy import InvalidRequestErrorRemedyCompletionStrategy
+from ..utils import CachedTokenizer
 
 
 class GPTXCompletionEngine(Engine, OpenAIMixin):
+    cacheable = True
+
     def __init__(self):
         super().__init__()
         config          = SYMAI_CONFIG
-        openai.api_key  = config['NEUROSYMBOLIC_ENGINE_API_KEY']
+        self.api_key    = config['NEUROSYMBOLIC_ENGINE_API_KEY']
         self.model      = config['NEUROSYMBOLIC_ENGINE_MODEL']
         logger          = logging.getLogger('openai')
-        self.tokenizer  = tiktoken.encoding_for_model(self.model)
+        self.tokenizer  = CachedTokenizer(tiktoken.encoding_for_model(self.model))
         self.pricing    = self.api_pricing()
         self.max_tokens = self.api_max_tokens() - 100 # TODO: account for tolerance. figure out how their magic number works to compute reliably the precise max token size
+        self.rate_limit = shared_rate_limiter('NEUROSYMBOLIC_ENGINE', config.get('NEUROSYMBOLIC_ENGINE_RPM'), config.get('NEUROSYMBOLIC_ENGINE_TPM'))
         logger.setLevel(logging.WARNING)
 
     def command(self, wrp_params):
         super().command(wrp_params)
         if 'NEUROSYMBOLIC_ENGINE_API_KEY' in wrp_params:
-            openai.api_key = wrp_params['NEUROSYMBOLIC_ENGINE_API_KEY']
+            self.api_key = wrp_params['NEUROSYMBOLIC_ENGINE_API_KEY']
         if 'NEUROSYMBOLIC_ENGINE_MODEL' in wrp_params:
             self.model = wrp_params['NEUROSYMBOLIC_ENGINE_MODEL']
 
@@ -40,6 +47,80 @@ class GPTXCompletionEngine(Engine, OpenAIMixin):
         return int((self.max_tokens - val) * 0.99) # TODO: figure out how their magic number works to compute reliably the precise max token size
 
     def forward(self, prompts: List[str], *args, **kwargs) -> List[str]:
+        prompts_, params, except_remedy = self._prepare_request(prompts, kwargs)
+        self._throttle(self.compute_required_tokens(prompts_) + params['max_tokens'])
+
+        try:
+            res = openai.Completion.create(**params)
+            if params['stream']:
+                return self._prepare_stream(res, prompts_, kwargs, lambda chunk: chunk['choices'][0]['text'])
+            output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+            if output_handler:
+                output_handler(res)
+        except Exception as e:
+            res = self._handle_exception(e, prompts_, except_remedy, *args, **kwargs)
+
+        return self._prepare_response(res, prompts, prompts_, kwargs)
+
+    def batch_forward(self, wrp_params_list: List[dict]) -> List[tuple]:
+        # group requests with equal sampling parameters and send each group as one prompt array
+        groups = {}
+        for i, kwargs in enumerate(wrp_params_list):
+            prompts_, params, _ = self._prepare_request(kwargs['prompts'], kwargs)
+            # an explicit max_tokens is part of the key, only the remaining context computed per prompt may be shared
+            key = {k: v for k, v in params.items() if k != 'prompt' and k != 'max_tokens'}
+            key['max_tokens'] = kwargs['max_tokens'] if 'max_tokens' in kwargs else None
+            groups.setdefault(str(key), []).append((i, prompts_, params))
+
+        outputs = [None] * len(wrp_params_list)
+        for group in groups.values():
+            params               = dict(group[0][2])
+            params['prompt']     = [p for _, prompts_, _ in group for p in prompts_]
+            params['max_tokens'] = min([params_['max_tokens'] for _, _, params_ in group])
+            self._throttle(sum([self.compute_required_tokens([p]) for p in params['prompt']]) + params['max_tokens'] * len(params['prompt']))
+            try:
+                res = openai.Completion.create(**params)
+            except Exception:
+                # fall back to single requests which apply the remedy strategies
+                for i, _, _ in group:
+                    try:
+                        outputs[i] = self.forward(**wrp_params_list[i])
+                    except Exception as e:
+                        outputs[i] = e
+                continue
+
+            choices = sorted(res['choices'], key=lambda c: c['index'])
+            offset  = 0
+            for i, prompts_, _ in group:
+                kwargs  = wrp_params_list[i]
+                # the usage of the batched call is accounted once, with its first request
+                res_    = {**res, 'choices': choices[offset:offset + len(prompts_)], 'usage': res['usage'] if offset == 0 and 'usage' in res else None}
+                offset += len(prompts_)
+                output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+                if output_handler:
+                    output_handler(res_)
+                outputs[i] = self._prepare_response(res_, kwargs['prompts'], prompts_, kwargs)
+
+        return outputs
+
+    async def aforward(self, prompts: List[str], *args, **kwargs) -> List[str]:
+        prompts_, params, except_remedy = self._prepare_request(prompts, kwargs)
+        await self._athrottle(self.compute_required_tokens(prompts_) + params['max_tokens'])
+
+        try:
+            res = await openai.Completion.acreate(**params)
+            if params['stream']:
+                return self._prepare_stream(res, prompts_, kwargs, lambda chunk: chunk['choices'][0]['text'])
+            output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+            if output_handler:
+                output_handler(res)
+        except Exception as e:
+            # remedy strategies retry through the blocking client
+            res = await asyncio.to_thread(self._handle_exception, e, prompts_, except_remedy, *args, **kwargs)
+
+        return self._prepare_response(res, prompts, prompts_, kwargs)
+
+    def _prepare_request(self, prompts: List[str], kwargs) -> tuple:
         prompts_            = prompts if isinstance(prompts, list) else [prompts]
         input_handler       = kwargs['input_handler'] if 'input_handler' in kwargs else None
         if input_handler:
@@ -55,36 +136,39 @@ class GPTXCompletionEngine(Engine, OpenAIMixin):
         presence_penalty    = kwargs['presence_penalty'] if 'presence_penalty' in kwargs else 0
         top_p               = kwargs['top_p'] if 'top_p' in kwargs else 1
         except_remedy       = kwargs['except_remedy'] if 'except_remedy' in kwargs else None
-
+        stream              = kwargs['stream'] if 'stream' in kwargs else False
+
+        params = {
+            'api_key': self.api_key,
+            'model': model,
+            'prompt': prompts_,
+            'suffix': suffix,
+            'max_tokens': max_tokens,
+            'temperature': temperature,
+            'frequency_penalty': frequency_penalty,
+            'presence_penalty': presence_penalty,
+            'top_p': top_p,
+            'stop': stop,
+            'stream': stream,
+            'n': 1
+        }
+        return prompts_, params, except_remedy
+
+    def _handle_exception(self, e: Exception, prompts_: List[str], except_remedy, *args, **kwargs):
+        callback = functools.partial(openai.Completion.create, api_key=self.api_key)
+        kwargs['model'] = kwargs['model'] if 'model' in kwargs else self.model
+        if except_remedy is not None:
+            return except_remedy(e, prompts_, callback, self, *args, **kwargs)
         try:
-            res = openai.Completion.create(model=model,
-                                           prompt=prompts_,
-                                           suffix=suffix,
-                                           max_tokens=max_tokens,
-                                           temperature=temperature,
-                                           frequency_penalty=frequency_penalty,
-                                           presence_penalty=presence_penalty,
-                                           top_p=top_p,
-                                           stop=stop,
-                                           n=1)
-            output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
-            if output_handler:
-                output_handler(res)
-        except Exception as e:
-            callback = openai.Completion.create
-            kwargs['model'] = kwargs['model'] if 'model' in kwargs else self.model
-            if except_remedy is not None:
-                res = except_remedy(e, prompts_, callback, self, *args, **kwargs)
-            else:
-                try:
-                    # implicit remedy strategy
-                    except_remedy = InvalidRequestErrorRemedyCompletionStrategy()
-                    res = except_remedy(e, prompts_, callback, self, *args, **kwargs)
-                except Exception as e2:
-                    ex = Exception(f'Failed to handle exception: {e}. Also failed implicit remedy strategy after retry: {e2}')
-                    raise ex from e
-
-        metadata = {}
+            # implicit remedy strategy
+            except_remedy = InvalidRequestErrorRemedyCompletionStrategy()
+            return except_remedy(e, prompts_, callback, self, *args, **kwargs)
+        except Exception as e2:
+            ex = Exception(f'Failed to handle exception: {e}. Also failed implicit remedy strategy after retry: {e2}')
+            raise ex from e
+
+    def _prepare_response(self, res, prompts: List[str], prompts_: List[str], kwargs) -> tuple:
+        metadata = {'usage': res['usage'] if 'usage' in res else None}
         if 'metadata' in kwargs and kwargs['metadata']:
             metadata['kwargs'] = kwargs
             metadata['input']  = prompts_
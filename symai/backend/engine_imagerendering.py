@@ -1,3 +1,4 @@
+import functools
 import logging
 from typing import List
 
@@ -11,7 +12,7 @@ class ImageRenderingEngine(Engine):
     def __init__(self, size: int = 512):
         super().__init__()
         config = SYMAI_CONFIG
-        openai.api_key = config['IMAGERENDERING_ENGINE_API_KEY']
+        self.api_key = config['IMAGERENDERING_ENGINE_API_KEY']
         logger = logging.getLogger('openai')
         logger.setLevel(logging.WARNING)
         self.size = size
@@ -19,7 +20,7 @@ class ImageRenderingEngine(Engine):
     def command(self, wrp_params):
         super().command(wrp_params)
         if 'IMAGERENDERING_ENGINE_API_KEY' in wrp_params:
-            openai.api_key = wrp_params['IMAGERENDERING_ENGINE_API_KEY']
+            self.api_key = wrp_params['IMAGERENDERING_ENGINE_API_KEY']
 
     def forward(self, prompt: str, *args, **kwargs) -> List[str]:
         size          = f"{kwargs['image_size']}x{kwargs['image_size']}" if 'image_size' in kwargs else f"{self.size}x{self.size}"
@@ -32,8 +33,9 @@ class ImageRenderingEngine(Engine):
                 if input_handler:
                     input_handler((prompt,))
 
-                callback = openai.Image.create
+                callback = functools.partial(openai.Image.create, api_key=self.api_key)
                 res = openai.Image.create(
+                    api_key=self.api_key,
                     prompt=prompt,
                     n=1,
                     size=size
@@ -46,8 +48,9 @@ class ImageRenderingEngine(Engine):
                 if input_handler:
                     input_handler((prompt, image_path))
 
-                callback = openai.Image.create_variation
+                callback = functools.partial(openai.Image.create_variation, api_key=self.api_key)
                 res = openai.Image.create_variation(
+                    api_key=self.api_key,
                     image=open(image_path, "rb"),
                     n=1,
                     size=size
@@ -62,8 +65,9 @@ class ImageRenderingEngine(Engine):
                 if input_handler:
                     input_handler((prompt, image_path, mask_path))
 
-                callback = openai.Image.create_edit
+                callback = functools.partial(openai.Image.create_edit, api_key=self.api_key)
                 res = openai.Image.create_edit(
+                    api_key=self.api_key,
                     image=open(image_path, "rb"),
                     mask=open(mask_path, "rb"),
                     prompt=prompt,
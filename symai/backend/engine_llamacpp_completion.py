@@ -1,12 +1,11 @@
+import json
 import logging
 from typing import List
 
 from .base import Engine
+from .sessions import session_pool
 from .settings import SYMAI_CONFIG
 
-import requests
-import json
-
 
 class LLaMACppCompletionClient():
     def __init__(self, base_url="http://localhost:8000"):
@@ -19,10 +18,10 @@ class LLaMACppCompletionClient():
             'Accept': 'application/json'
         }
 
-        # Performing POST request
-        response = requests.post(f"{self.base_url}/v1/engines/copilot-codex/completions",
-                                 data=json.dumps(completion_request),
-                                 headers=headers)
+        # Performing POST request over a pooled keep-alive connection
+        response = session_pool().post(f"{self.base_url}/v1/engines/copilot-codex/completions",
+                                       data=json.dumps(completion_request),
+                                       headers=headers)
 
         print(response)
 
@@ -34,6 +33,8 @@ class LLaMACppCompletionClient():
 
 
 class LLaMACppCompletionEngine(Engine):
+    cacheable = True
+
     def __init__(self):
         super().__init__()
         config          = SYMAI_CONFIG
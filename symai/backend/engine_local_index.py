@@ -0,0 +1,248 @@
+import os
+import threading
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from .base import Engine
+from .index_store import SegmentStore
+
+
+class LocalIndexEngine(Engine):
+    '''
+    In-process vector index with the same `add` / `delete` / `search` / `config` operations and result format as the Pinecone `IndexEngine`.
+    Vectors are kept in contiguous float32 blocks and scored with one matrix-vector product per block, the top-k
+    selection uses `argpartition`. With `index_nlist > 0` an inverted file (IVF) is trained on the vectors via k-means
+    and searches only score the entries of the `index_nprobe` closest lists. The index is stored as memory-mapped
+    segments under `path` (see `SegmentStore`), so opening an existing index does not load it into memory.
+    '''
+    _default_index_name     = 'data-index'
+    _default_index_dims     = 1536
+    _default_index_top_k    = 5
+    _default_index_metric   = 'cosine'
+    _default_index_values   = True
+    _default_index_metadata = True
+    _default_index_nlist    = 0
+    _default_index_nprobe   = 8
+    _default_path           = Path.home() / '.symai' / 'indices' / 'local'
+    _train_size             = 16_384
+
+    def __init__(
+            self,
+            index_name=_default_index_name,
+            index_dims=_default_index_dims,
+            index_top_k=_default_index_top_k,
+            index_metric=_default_index_metric,
+            index_values=_default_index_values,
+            index_metadata=_default_index_metadata,
+            index_nlist=_default_index_nlist,
+            index_nprobe=_default_index_nprobe,
+            path=_default_path,
+            **kwargs
+        ):
+        super().__init__()
+        assert index_metric in ['cosine', 'dotproduct', 'euclidean'], f'Unsupported metric: {index_metric}'
+        self.index_name     = index_name
+        self.index_dims     = index_dims
+        self.index_top_k    = index_top_k
+        self.index_metric   = index_metric
+        self.index_values   = index_values
+        self.index_metadata = index_metadata
+        self.index_nlist    = index_nlist
+        self.index_nprobe   = index_nprobe
+        self.path           = Path(path)
+        self.index          = None
+        self._lock          = threading.RLock()
+
+    def forward(self, *args, **kwargs) -> List[str]:
+        operation     = kwargs['operation']
+        query         = kwargs['prompt']
+        input_handler = kwargs['input_handler'] if 'input_handler' in kwargs else None
+        rsp           = None
+
+        if self.index is None:
+            self._init_index_engine()
+
+        if input_handler:
+            input_handler((query, ))
+
+        if operation == 'search':
+            index_top_k    = kwargs['index_top_k'] if 'index_top_k' in kwargs else self.index_top_k
+            index_values   = kwargs['index_values'] if 'index_values' in kwargs else self.index_values
+            index_metadata = kwargs['index_metadata'] if 'index_metadata' in kwargs else self.index_metadata
+
+            rsp = self._query(query, index_top_k, index_values, index_metadata)
+
+        elif operation == 'add':
+            # every add writes one segment, so the vectors are not split into chunks
+            self._upsert(list(query))
+
+        elif operation == 'delete':
+            self._delete(list(query))
+
+        elif operation == 'lookup':
+            rsp = {'matches': self.index.lookup(list(query)), 'namespace': ''}
+
+        elif operation == 'config':
+            index_name = kwargs['index_name'] if 'index_name' in kwargs else self.index_name
+
+            del_ = kwargs['index_del'] if 'index_del' in kwargs else False
+            if self.index is not None and del_:
+                self._delete_index(index_name)
+
+            get_ = kwargs['index_get'] if 'index_get' in kwargs else False
+            if self.index is not None and get_:
+                self.index_name = index_name
+                self._init_index_engine()
+
+        else:
+            raise ValueError('Invalid operation')
+
+        output_handler = kwargs['output_handler'] if 'output_handler' in kwargs else None
+        if output_handler:
+            output_handler(rsp)
+
+        metadata = {}
+        if 'metadata' in kwargs and kwargs['metadata']:
+            metadata['kwargs'] = kwargs
+            metadata['input']  = (operation, query)
+            metadata['output'] = rsp
+
+        return [rsp], metadata
+
+    def prepare(self, args, kwargs, wrp_params):
+        wrp_params['prompt'] = wrp_params['prompt']
+
+    def _index_path(self, index_name=None) -> Path:
+        return self.path / (index_name if index_name is not None else self.index_name)
+
+    def _init_index_engine(self):
+        with self._lock:
+            self.index = SegmentStore(self._index_path(), self.index_dims)
+            self.index_dims   = self.index.dims
+            self.index_metric = self.index.attrs.get('metric', self.index_metric)
+            self.index.attrs['metric'] = self.index_metric
+            centroids         = self.index.path / 'centroids.npy'
+            self._centroids   = np.load(centroids) if os.path.exists(centroids) else None
+
+    @property
+    def size(self) -> int:
+        return len(self.index)
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # storage
+
+    def _upsert(self, vectors):
+        with self._lock:
+            ids    = [v[0] for v in vectors]
+            values = np.asarray([v[1] for v in vectors], dtype=np.float32).reshape(len(ids), -1)
+            meta   = [v[2] if len(v) > 2 else {} for v in vectors]
+            lists  = self._assign(values) if self._centroids is not None else None
+            self.index.append(ids, values, meta, lists)
+            self._maybe_train()
+
+    def _delete(self, ids: List[str]) -> int:
+        with self._lock:
+            return self.index.delete(ids)
+
+    def _delete_index(self, index_name: str):
+        with self._lock:
+            store = self.index if index_name == self.index_name else SegmentStore(self._index_path(index_name), self.index_dims)
+            store.clear()
+            if os.path.exists(store.path / 'centroids.npy'):
+                os.remove(store.path / 'centroids.npy')
+            if index_name == self.index_name:
+                self._init_index_engine()
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # inverted file
+
+    def _maybe_train(self):
+        # (re-)train the coarse quantizer once enough vectors are available and whenever the index doubled in size
+        size = self.size
+        if self.index_nlist <= 0 or size < 4 * self.index_nlist:
+            return
+        if self._centroids is not None and size < 2 * self.index.attrs.get('trained', 0):
+            return
+        self.index.wait() # a running compaction would carry over the outdated lists
+        segments  = self.index.segments()
+        rng       = np.random.default_rng(0)
+        data      = np.concatenate([s.vectors[np.nonzero(~s.deleted)[0]] for s in segments])
+        if len(data) > self._train_size:
+            data  = data[rng.choice(len(data), self._train_size, replace=False)]
+        centroids = data[rng.choice(len(data), self.index_nlist, replace=False)].copy()
+        for _ in range(10):
+            assign = self._assign(data, centroids)
+            for c in range(self.index_nlist):
+                members = data[assign == c]
+                if len(members) > 0:
+                    centroids[c] = members.mean(axis=0)
+        self._centroids = centroids
+        for segment in segments:
+            segment.set_lists(np.concatenate([self._assign(segment.vectors[i:i + 65_536]) for i in range(0, segment.count, 65_536)]))
+        np.save(self.index.path / 'centroids.npy', centroids)
+        self.index.attrs['trained'] = size
+        self.index.save_attrs()
+
+    def _assign(self, data: np.ndarray, centroids: np.ndarray = None) -> np.ndarray:
+        centroids = self._centroids if centroids is None else centroids
+        dists     = (data ** 2).sum(axis=1)[:, None] - 2 * data @ centroids.T + (centroids ** 2).sum(axis=1)[None, :]
+        return np.argmin(dists, axis=1)
+
+    def _probe(self, query: np.ndarray):
+        if self._centroids is None:
+            return None
+        nprobe = min(self.index_nprobe, len(self._centroids))
+        dists  = ((self._centroids - query) ** 2).sum(axis=1)
+        return np.argpartition(dists, nprobe - 1)[:nprobe]
+
+    # ----------------------------------------------------------------------------------------------------------------
+    # search
+
+    def _scores(self, query: np.ndarray, vectors: np.ndarray, norms: np.ndarray) -> np.ndarray:
+        dots = vectors @ query
+        if self.index_metric == 'dotproduct':
+            return dots
+        if self.index_metric == 'cosine':
+            return dots / np.maximum(norms * np.linalg.norm(query), 1e-12)
+        # euclidean: negated squared distance, so that larger is always better
+        return -(norms ** 2 - 2 * dots + query @ query)
+
+    def _search(self, query: np.ndarray, index_top_k: int, probe=None):
+        candidates = []
+        for segment in self.index.segments():
+            if probe is not None and segment.lists is not None:
+                rows   = np.nonzero(np.isin(segment.lists, probe) & ~segment.deleted)[0]
+                scores = self._scores(query, segment.vectors[rows], segment.norms[rows])
+            else:
+                rows   = None
+                scores = self._scores(query, segment.vectors, segment.norms)
+                scores[segment.deleted] = -np.inf
+            k = min(index_top_k, len(scores))
+            if k == 0:
+                continue
+            top = np.argpartition(-scores, k - 1)[:k]
+            for i in top:
+                if np.isfinite(scores[i]):
+                    candidates.append((float(scores[i]), segment, int(i) if rows is None else int(rows[i])))
+        candidates.sort(key=lambda c: -c[0])
+        return candidates[:index_top_k]
+
+    def _query(self, query, index_top_k, index_values, index_metadata):
+        query      = np.asarray(query, dtype=np.float32).reshape(-1)
+        probe      = self._probe(query)
+        candidates = self._search(query, index_top_k, probe)
+        if probe is not None and len(candidates) < index_top_k:
+            candidates = self._search(query, index_top_k) # too few candidates in the probed lists, fall back to the exact search
+
+        matches = []
+        for score, segment, row in candidates:
+            record = segment.record(row)
+            match  = {'id': record['id'], 'score': -score if self.index_metric == 'euclidean' else score}
+            if index_values:
+                match['values'] = segment.vectors[row].tolist()
+            if index_metadata:
+                match['metadata'] = record['metadata']
+            matches.append(match)
+        return {'matches': matches, 'namespace': ''}
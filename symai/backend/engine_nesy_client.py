@@ -9,6 +9,8 @@ rpyc.core.protocol.DEFAULT_CONFIG['allow_pickle'] = True
 
 
 class NeSyClientEngine(Engine):
+    cacheable = True
+
     def __init__(self, host: str = 'localhost', port: int = 18100, timeout: int = 240):
         super().__init__()
         logger = logging.getLogger('nesy_client')
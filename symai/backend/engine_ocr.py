@@ -1,8 +1,7 @@
 from typing import List
 
-import requests
-
 from .base import Engine
+from .sessions import session_pool
 from .settings import SYMAI_CONFIG
 
 
@@ -32,7 +31,7 @@ class OCREngine(Engine):
         if input_handler:
             input_handler((url, payload))
 
-        response    = requests.request("GET", url, headers=self.headers, data = payload)
+        response    = session_pool().get(url, headers=self.headers, data = payload)
         status_code = response.status_code
         if status_code != 200:
             raise Exception(f"OCR request failed with status code {status_code}")
@@ -99,6 +99,16 @@ class IndexEngine(Engine):
             for ids_vectors_chunk in chunks(query, batch_size=100):
                 self._upsert(ids_vectors_chunk)
 
+        elif operation == 'delete':
+            for ids_chunk in chunks(query, batch_size=1000):
+                self._delete(ids_chunk)
+
+        elif operation == 'lookup':
+            rsp = {'matches': [], 'namespace': ''}
+            for ids_chunk in chunks(query, batch_size=1000):
+                vectors = self._fetch(ids_chunk)['vectors']
+                rsp['matches'] += [{'id': v['id'], 'metadata': v['metadata']} for v in vectors.values()]
+
         elif operation == 'config':
             index_name = kwargs['index_name'] if 'index_name' in kwargs else self.index_name
 
@@ -143,6 +153,20 @@ class IndexEngine(Engine):
 
         return _func()
 
+    def _delete(self, ids):
+        @retry(tries=self.tries, delay=self.delay, max_delay=self.max_delay, backoff=self.backoff, jitter=self.jitter)
+        def _func():
+            return self.index.delete(ids=ids)
+
+        return _func()
+
+    def _fetch(self, ids):
+        @retry(tries=self.tries, delay=self.delay, max_delay=self.max_delay, backoff=self.backoff, jitter=self.jitter)
+        def _func():
+            return self.index.fetch(ids=ids)
+
+        return _func()
+
     def _query(self, query, index_top_k, index_values, index_metadata):
         @retry(tries=self.tries, delay=self.delay, max_delay=self.max_delay, backoff=self.backoff, jitter=self.jitter)
         def _func():
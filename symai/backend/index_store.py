@@ -0,0 +1,305 @@
+import json
+import mmap
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+class Segment:
+    '''
+    Immutable block of an index on disk. A segment `<name>` consists of the files
+        <name>.vec   float32 vectors, row-major (count x dims)
+        <name>.norm  float32 L2 norms of the vectors (count)
+        <name>.off   int64 offsets table into the record blob (count + 1)
+        <name>.txt   UTF-8 blob of the JSON records `{"id": ..., "metadata": ...}`
+        <name>.ids   JSON list of the ids, only read to resolve upserts and deletes
+        <name>.ivf   optional int32 inverted file list of every row (count)
+    All files are memory-mapped, so opening a segment does not read its contents.
+    Deleted rows are tombstoned in the manifest until the next compaction.
+    '''
+    def __init__(self, path: Path, name: str, count: int, dims: int, deleted: List[int] = ()):
+        self.path    = path
+        self.name    = name
+        self.count   = count
+        self.dims    = dims
+        self.vectors = np.memmap(self.file('vec'), dtype=np.float32, mode='r', shape=(count, dims))
+        self.norms   = np.memmap(self.file('norm'), dtype=np.float32, mode='r', shape=(count,))
+        self.offsets = np.memmap(self.file('off'), dtype=np.int64, mode='r', shape=(count + 1,))
+        self.deleted = np.zeros(count, dtype=bool)
+        self.deleted[list(deleted)] = True
+        self.lists   = np.fromfile(self.file('ivf'), dtype=np.int32) if os.path.exists(self.file('ivf')) else None
+        with open(self.file('txt'), 'rb') as f:
+            self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] > 0 else b''
+
+    def file(self, ext: str) -> Path:
+        return self.path / f'{self.name}.{ext}'
+
+    def files(self) -> List[Path]:
+        return [self.file(ext) for ext in ['vec', 'norm', 'off', 'txt', 'ids', 'ivf']]
+
+    @property
+    def live(self) -> int:
+        return self.count - int(self.deleted.sum())
+
+    def raw_record(self, row: int) -> bytes:
+        return self._blob[int(self.offsets[row]):int(self.offsets[row + 1])]
+
+    def record(self, row: int) -> Dict[str, Any]:
+        return json.loads(self.raw_record(row).decode('utf-8'))
+
+    def ids(self) -> List[str]:
+        with open(self.file('ids'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def set_lists(self, lists: np.ndarray) -> None:
+        tmp = self.path / f'{self.name}.ivf.tmp'
+        np.asarray(lists, dtype=np.int32).tofile(tmp)
+        os.replace(tmp, self.file('ivf'))
+        self.lists = np.asarray(lists, dtype=np.int32)
+
+
+class SegmentWriter:
+    def __init__(self, path: Path, name: str, dims: int):
+        self.path    = path
+        self.name    = name
+        self.dims    = dims
+        self.count   = 0
+        self._offset = 0
+        self._ids    = []
+        self._lists  = []
+        self._files  = {ext: open(path / f'{name}.{ext}', 'wb') for ext in ['vec', 'norm', 'off', 'txt']}
+        self._files['off'].write(np.zeros(1, dtype=np.int64).tobytes())
+
+    def write(self, ids: List[str], vectors: np.ndarray, norms: np.ndarray, records: List[bytes], lists: Optional[np.ndarray] = None):
+        offsets = self._offset + np.cumsum([len(r) for r in records], dtype=np.int64)
+        self._files['vec'].write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        self._files['norm'].write(np.asarray(norms, dtype=np.float32).tobytes())
+        self._files['off'].write(offsets.tobytes())
+        self._files['txt'].write(b''.join(records))
+        self._offset  = int(offsets[-1]) if len(offsets) > 0 else self._offset
+        self.count   += len(ids)
+        self._ids    += list(ids)
+        self._lists   = None if lists is None or self._lists is None else self._lists + [np.asarray(lists, dtype=np.int32)]
+
+    def abort(self) -> None:
+        for ext, f in self._files.items():
+            f.close()
+            os.remove(self.path / f'{self.name}.{ext}')
+
+    def close(self) -> Segment:
+        for f in self._files.values():
+            f.close()
+        with open(self.path / f'{self.name}.ids', 'w', encoding='utf-8') as f:
+            json.dump(self._ids, f)
+        if self._lists is not None and self.count > 0:
+            np.concatenate(self._lists).tofile(self.path / f'{self.name}.ivf')
+        return Segment(self.path, self.name, self.count, self.dims)
+
+
+class SegmentStore:
+    '''
+    Append-only, memory-mapped vector store. Every append writes a new immutable segment and atomically replaces the
+    JSON manifest, which lists the segments and their tombstoned rows. Opening a store only reads the manifest.
+    Upserts tombstone the previous row of an id. Once there are more than `max_segments` segments or more than
+    `max_deleted` of the rows are tombstoned, the segments are merged in a background thread; readers keep their
+    snapshot of the old segments until they are done with it.
+    '''
+    MANIFEST = 'manifest.json'
+    VERSION  = 1
+
+    def __init__(self, path, dims: int, max_segments: int = 8, max_deleted: float = 0.3, background: bool = True):
+        self.path         = Path(path)
+        self.dims         = dims
+        self.max_segments = max_segments
+        self.max_deleted  = max_deleted
+        self.background   = background
+        self.attrs        = {}
+        self._segments    = []
+        self._next        = 0
+        self._locations   = None
+        self._compactor   = None
+        self._lock        = threading.RLock()
+        if os.path.exists(self.path / self.MANIFEST):
+            self._open()
+
+    def _open(self):
+        with open(self.path / self.MANIFEST, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest['version'] != self.VERSION:
+            raise ValueError(f'Unsupported index format version: {manifest["version"]}')
+        self.dims      = manifest['dims']
+        self.attrs     = manifest['attrs']
+        self._next     = manifest['next']
+        self._segments = [Segment(self.path, s['name'], s['count'], self.dims, s['deleted']) for s in manifest['segments']]
+
+    def _save(self):
+        manifest = {
+            'version':  self.VERSION,
+            'dims':     self.dims,
+            'attrs':    self.attrs,
+            'next':     self._next,
+            'segments': [{'name': s.name, 'count': s.count, 'deleted': np.nonzero(s.deleted)[0].tolist()} for s in self._segments]
+        }
+        tmp = self.path / f'{self.MANIFEST}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f)
+        os.replace(tmp, self.path / self.MANIFEST)
+
+    def _writer(self) -> SegmentWriter:
+        os.makedirs(self.path, exist_ok=True)
+        name = f'seg-{self._next:06d}'
+        self._next += 1
+        return SegmentWriter(self.path, name, self.dims)
+
+    def _resolve(self) -> Dict[str, Any]:
+        # id -> (segment, row) of the live rows, built on the first mutation
+        if self._locations is None:
+            self._locations = {}
+            for segment in self._segments:
+                for row, id_ in enumerate(segment.ids()):
+                    if not segment.deleted[row]:
+                        self._locations[id_] = (segment, row)
+        return self._locations
+
+    def __len__(self) -> int:
+        return sum([s.live for s in self.segments()])
+
+    def segments(self) -> List[Segment]:
+        with self._lock:
+            return list(self._segments)
+
+    def save_attrs(self) -> None:
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            self._save()
+
+    def append(self, ids: List[str], vectors: np.ndarray, metadata: List[Dict[str, Any]], lists: Optional[np.ndarray] = None) -> Optional[Segment]:
+        if len(ids) == 0:
+            return None
+        ids     = [str(id_) for id_ in ids]
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1)
+        if vectors.shape[1] != self.dims:
+            raise ValueError(f'Expected vectors of dimension {self.dims}, got {vectors.shape[1]}')
+        # the last occurrence of an id within the batch wins
+        last    = {id_: i for i, id_ in enumerate(ids)}
+        keep    = sorted(last.values())
+        ids     = [ids[i] for i in keep]
+        vectors = vectors[keep]
+        records = [json.dumps({'id': ids[i], 'metadata': metadata[j]}).encode('utf-8') for i, j in enumerate(keep)]
+        with self._lock:
+            locations = self._resolve()
+            writer    = self._writer()
+            writer.write(ids, vectors, np.linalg.norm(vectors, axis=1), records, None if lists is None else np.asarray(lists)[keep])
+            segment   = writer.close()
+            for row, id_ in enumerate(ids):
+                if id_ in locations:
+                    old, old_row = locations[id_]
+                    old.deleted[old_row] = True
+                locations[id_] = (segment, row)
+            self._segments.append(segment)
+            self._save()
+        self._maybe_compact()
+        return segment
+
+    def delete(self, ids: List[str]) -> int:
+        deleted = 0
+        with self._lock:
+            locations = self._resolve()
+            for id_ in ids:
+                if str(id_) in locations:
+                    segment, row = locations.pop(str(id_))
+                    segment.deleted[row] = True
+                    deleted += 1
+            if deleted > 0:
+                self._save()
+        self._maybe_compact()
+        return deleted
+
+    def lookup(self, ids: List[str]) -> List[Dict[str, Any]]:
+        '''
+        Returns the records of the given ids, ids which are not in the store are skipped.
+        '''
+        with self._lock:
+            locations = self._resolve()
+            return [locations[str(id_)][0].record(locations[str(id_)][1]) for id_ in ids if str(id_) in locations]
+
+    def clear(self) -> None:
+        self.wait()
+        with self._lock:
+            for segment in self._segments:
+                self._remove(segment)
+            if os.path.exists(self.path / self.MANIFEST):
+                os.remove(self.path / self.MANIFEST)
+            self.attrs      = {}
+            self._segments  = []
+            self._locations = None
+
+    def _remove(self, segment: Segment) -> None:
+        for file in segment.files():
+            try:
+                if os.path.exists(file):
+                    os.remove(file)
+            except OSError:
+                pass # still mapped by a reader on platforms which do not allow it
+
+    def _maybe_compact(self) -> None:
+        segments = self.segments()
+        count    = sum([s.count for s in segments])
+        deleted  = sum([s.count - s.live for s in segments])
+        if len(segments) > self.max_segments or (count > 0 and deleted / count > self.max_deleted):
+            self.compact(wait=not self.background)
+
+    def compact(self, wait: bool = True) -> None:
+        with self._lock:
+            if self._compactor is None or not self._compactor.is_alive():
+                self._compactor = threading.Thread(target=self._compact, daemon=True)
+                self._compactor.start()
+            compactor = self._compactor
+        if wait:
+            compactor.join()
+
+    def wait(self) -> None:
+        compactor = self._compactor
+        if compactor is not None:
+            compactor.join()
+
+    def _compact(self, chunk_size: int = 65_536) -> None:
+        with self._lock:
+            segments = list(self._segments)
+            if len(segments) <= 1 and all([s.live == s.count for s in segments]):
+                return
+            masks    = [~s.deleted.copy() for s in segments]
+            writer   = self._writer()
+        with_lists = all([s.lists is not None for s in segments])
+        # the segments are immutable, so the merge runs without holding the lock
+        for segment, mask in zip(segments, masks):
+            ids  = segment.ids()
+            rows = np.nonzero(mask)[0]
+            for i in range(0, len(rows), chunk_size):
+                chunk = rows[i:i + chunk_size]
+                writer.write([ids[r] for r in chunk],
+                             segment.vectors[chunk],
+                             segment.norms[chunk],
+                             [segment.raw_record(r) for r in chunk],
+                             segment.lists[chunk] if with_lists else None)
+        merged = None
+        if writer.count > 0:
+            merged = writer.close()
+        else:
+            writer.abort()
+        with self._lock:
+            offset = 0
+            for segment, mask in zip(segments, masks):
+                live = np.nonzero(mask)[0]
+                # rows deleted while merging
+                if merged is not None:
+                    merged.deleted[offset:offset + len(live)] = segment.deleted[live]
+                offset += len(live)
+            self._segments  = ([merged] if merged is not None else []) + [s for s in self._segments if s not in segments]
+            self._locations = None
+            self._save()
+        for segment in segments:
+            self._remove(segment)
@@ -0,0 +1,106 @@
+import math
+import re
+import sqlite3
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+
+_token_pattern = re.compile(r'\w+', re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    '''
+    Lower-cased word tokens. Identifiers like `index_top_k` are kept as a whole and additionally split into their parts,
+    so that exact identifiers rank highest while their parts still match natural language queries.
+    '''
+    tokens = []
+    for token in _token_pattern.findall(text.lower()):
+        tokens.append(token)
+        if '_' in token:
+            tokens += [part for part in token.split('_') if part]
+    return tokens
+
+
+class BM25Index:
+    '''
+    Persistent inverted index which ranks chunks with Okapi BM25.
+    Chunks are added and removed by id. The postings and the chunk lengths are kept in a SQLite database at `path` (in
+    memory without a path), every change only writes the rows of its chunk and `save` commits the pending changes.
+    The chunk texts are not stored, they are kept in the metadata of the vector index.
+    '''
+    def __init__(self, path: Optional[Path] = None, k1: float = 1.5, b: float = 0.75):
+        self.path  = Path(path) if path is not None else None
+        self.k1    = k1
+        self.b     = b
+        self._lock = threading.RLock()
+        if self.path is not None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path) if self.path is not None else ':memory:', check_same_thread=False)
+        self._conn.execute('CREATE TABLE IF NOT EXISTS postings (term TEXT, id TEXT, tf INTEGER, PRIMARY KEY (term, id)) WITHOUT ROWID')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS postings_id ON postings (id)')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS chunks (id TEXT PRIMARY KEY, length INTEGER)')
+        self._conn.commit()
+        # number of chunks and of their tokens, needed for the average chunk length
+        self._count, self._total = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(length), 0) FROM chunks').fetchone()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, id_: str) -> bool:
+        with self._lock:
+            return self._conn.execute('SELECT 1 FROM chunks WHERE id = ?', (id_,)).fetchone() is not None
+
+    def add(self, id_: str, text: str) -> None:
+        with self._lock:
+            self.remove(id_)
+            tokens = tokenize(text)
+            self._conn.executemany('INSERT INTO postings (term, id, tf) VALUES (?, ?, ?)',
+                                   [(term, id_, tf) for term, tf in Counter(tokens).items()])
+            self._conn.execute('INSERT INTO chunks (id, length) VALUES (?, ?)', (id_, len(tokens)))
+            self._count += 1
+            self._total += len(tokens)
+
+    def remove(self, id_: str) -> None:
+        with self._lock:
+            row = self._conn.execute('SELECT length FROM chunks WHERE id = ?', (id_,)).fetchone()
+            if row is None:
+                return
+            self._conn.execute('DELETE FROM postings WHERE id = ?', (id_,))
+            self._conn.execute('DELETE FROM chunks WHERE id = ?', (id_,))
+            self._count -= 1
+            self._total -= row[0]
+
+    def search(self, query: str, top_k: int = 10) -> List[Tuple[str, float]]:
+        with self._lock:
+            n = self._count
+            if n == 0:
+                return []
+            avg    = self._total / n
+            scores = {}
+            for term in set(tokenize(query)):
+                postings = self._conn.execute('SELECT p.id, p.tf, c.length FROM postings p JOIN chunks c ON c.id = p.id '
+                                              'WHERE p.term = ?', (term,)).fetchall()
+                if not postings:
+                    continue
+                idf = math.log(1 + (n - len(postings) + .5) / (len(postings) + .5))
+                for id_, tf, length in postings:
+                    norm = tf + self.k1 * (1 - self.b + self.b * length / avg)
+                    scores[id_] = scores.get(id_, 0.) + idf * tf * (self.k1 + 1) / norm
+            return sorted(scores.items(), key=lambda x: -x[1])[:top_k]
+
+    def save(self) -> None:
+        with self._lock:
+            self._conn.commit()
+
+
+def reciprocal_rank_fusion(rankings: List[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    '''
+    Merges several rankings of ids into one; every id scores `sum(1 / (k + rank))` over the rankings it appears in.
+    '''
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, id_ in enumerate(ranking):
+            scores[id_] = scores.get(id_, 0.) + 1. / (k + rank + 1)
+    return sorted(scores.items(), key=lambda x: -x[1])
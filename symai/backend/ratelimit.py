@@ -0,0 +1,171 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+class RateLimiter:
+    '''
+    Client-side token-bucket scheduler which enforces a requests-per-minute (`rpm`) and a tokens-per-minute (`tpm`) budget.
+    Both buckets refill continuously and hold at most one minute of budget. Callers are served strictly in arrival order
+    across threads and asyncio tasks, so a large request can not be starved by a stream of small ones.
+    '''
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.rpm           = rpm
+        self.tpm           = tpm
+        self._requests     = float(rpm) if rpm is not None else 0.
+        self._tokens       = float(tpm) if tpm is not None else 0.
+        self._updated      = time.monotonic()
+        self._cond         = threading.Condition()
+        self._next_ticket  = 0
+        self._serving      = 0
+        self._abandoned    = set() # tickets of cancelled requests which are skipped when they are due
+        # statistics
+        self._waiting      = 0
+        self._total        = 0
+        self._total_tokens = 0
+        self._wait_time    = 0.
+        self._max_wait     = 0.
+
+    def _refill(self) -> None:
+        now     = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.rpm is not None:
+            self._requests = min(float(self.rpm), self._requests + elapsed * self.rpm / 60.)
+        if self.tpm is not None:
+            self._tokens   = min(float(self.tpm), self._tokens + elapsed * self.tpm / 60.)
+
+    def _delay(self, tokens: int) -> float:
+        # seconds until both buckets hold enough budget for the request
+        self._refill()
+        delay = 0.
+        if self.rpm is not None and self._requests < 1:
+            delay = max(delay, (1 - self._requests) * 60. / self.rpm)
+        if self.tpm is not None and self._tokens < tokens:
+            delay = max(delay, (tokens - self._tokens) * 60. / self.tpm)
+        return delay
+
+    def acquire(self, tokens: int = 0) -> float:
+        '''
+        Blocks until the request fits into the budget and consumes it.
+
+        Args:
+            tokens (int, optional): The estimated number of tokens of the request (prompt and completion). Defaults to 0.
+
+        Returns:
+            float: The time in seconds the caller waited.
+        '''
+        tokens = self._clamp(tokens)
+        start  = time.monotonic()
+        with self._cond:
+            ticket = self._ticket()
+            while True:
+                if ticket == self._serving:
+                    delay = self._delay(tokens)
+                    if delay <= 0:
+                        break
+                    self._cond.wait(delay)
+                else:
+                    self._cond.wait()
+            return self._consume(tokens, start)
+
+    async def aacquire(self, tokens: int = 0, poll: float = 0.01) -> float:
+        '''
+        Awaits until the request fits into the budget and consumes it, without occupying a thread while waiting.
+        The request keeps its place in the FIFO queue shared with synchronous callers; a cancelled request gives its
+        place up.
+
+        Args:
+            tokens (int, optional): The estimated number of tokens of the request (prompt and completion). Defaults to 0.
+            poll (float, optional): The interval in seconds in which a queued request checks whether it is served next. Defaults to 0.01.
+
+        Returns:
+            float: The time in seconds the caller waited.
+        '''
+        tokens = self._clamp(tokens)
+        start  = time.monotonic()
+        with self._cond:
+            ticket = self._ticket()
+        try:
+            while True:
+                with self._cond:
+                    delay = poll
+                    if ticket == self._serving:
+                        delay = self._delay(tokens)
+                        if delay <= 0:
+                            return self._consume(tokens, start)
+                await asyncio.sleep(delay)
+        except BaseException:
+            with self._cond:
+                self._abandon(ticket)
+            raise
+
+    def _clamp(self, tokens: int) -> int:
+        # a request larger than the bucket would otherwise wait forever
+        return min(tokens, self.tpm) if self.tpm is not None else tokens
+
+    def _ticket(self) -> int:
+        ticket = self._next_ticket
+        self._next_ticket += 1
+        self._waiting     += 1
+        return ticket
+
+    def _advance(self) -> None:
+        # serves the next ticket, skipping the tickets of cancelled requests
+        self._serving += 1
+        while self._serving in self._abandoned:
+            self._abandoned.remove(self._serving)
+            self._serving += 1
+        self._cond.notify_all()
+
+    def _abandon(self, ticket: int) -> None:
+        if ticket < self._serving:
+            return # the request was already served
+        self._waiting -= 1
+        if ticket == self._serving:
+            self._advance()
+        else:
+            self._abandoned.add(ticket)
+
+    def _consume(self, tokens: int, start: float) -> float:
+        if self.rpm is not None:
+            self._requests -= 1
+        if self.tpm is not None:
+            self._tokens   -= tokens
+        self._waiting -= 1
+        waited = time.monotonic() - start
+        self._total        += 1
+        self._total_tokens += tokens
+        self._wait_time    += waited
+        self._max_wait      = max(self._max_wait, waited)
+        self._advance()
+        return waited
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                'queue_depth': self._waiting,
+                'requests':    self._total,
+                'tokens':      self._total_tokens,
+                'wait_time':   self._wait_time,
+                'avg_wait':    self._wait_time / self._total if self._total > 0 else 0.,
+                'max_wait':    self._max_wait
+            }
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def shared_rate_limiter(name: str, rpm: Optional[float] = None, tpm: Optional[float] = None) -> Optional[RateLimiter]:
+    '''
+    Returns the process-wide rate limiter registered under `name`, creating it on first use.
+    Engines sharing a quota (e.g. the same API key) pass the same name. Returns None if neither budget is set.
+    '''
+    if rpm is None and tpm is None:
+        return None
+    with _rate_limiters_lock:
+        if name not in _rate_limiters:
+            _rate_limiters[name] = RateLimiter(rpm=rpm, tpm=tpm)
+        return _rate_limiters[name]
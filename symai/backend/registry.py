@@ -0,0 +1,56 @@
+import threading
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+from .base import Engine
+
+
+class EngineScope:
+    '''
+    Binds a set of engines to the current context (thread or asyncio task) for the duration of a `with` block.
+    Engines which are not part of the scope resolve to the enclosing scope or the global defaults.
+    '''
+    def __init__(self, registry: 'EngineRegistry', engines: Dict[str, Engine]):
+        self.registry = registry
+        self.engines  = engines
+        self._tokens  = []
+
+    def __enter__(self) -> 'EngineScope':
+        bound = self.registry._scoped.get()
+        self._tokens.append(self.registry._scoped.set({**(bound or {}), **self.engines}))
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self.registry._scoped.reset(self._tokens.pop())
+
+
+class EngineRegistry:
+    '''
+    Resolves engines by name. Lookups first consult the engines bound to the current context via `scope`
+    and then fall back to the process-wide defaults, which are lazily initialized under a lock.
+    '''
+    def __init__(self):
+        self._defaults = {}
+        self._lock     = threading.RLock()
+        self._scoped   = ContextVar('engine_registry_scope', default=None)
+
+    def get(self, name: str, factory: Optional[Callable[[], Engine]] = None) -> Optional[Engine]:
+        bound = self._scoped.get()
+        if bound is not None and name in bound:
+            return bound[name]
+        engine = self._defaults.get(name)
+        if engine is None and factory is not None:
+            with self._lock:
+                # double-checked to initialize each default engine only once across threads
+                engine = self._defaults.get(name)
+                if engine is None:
+                    engine = factory()
+                    self._defaults[name] = engine
+        return engine
+
+    def register(self, name: str, engine: Engine) -> None:
+        with self._lock:
+            self._defaults[name] = engine
+
+    def scope(self, engines: Dict[str, Engine]) -> EngineScope:
+        return EngineScope(self, engines)
@@ -0,0 +1,113 @@
+import threading
+from typing import Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class _RetryAfter(Retry):
+    '''
+    Retries a response only if the server asks for it with a `Retry-After` header and one of the `status_forcelist`
+    codes. The request was processed (or rejected) by the server, so other failures of non-idempotent requests such as
+    the POST calls of the engines are not repeated.
+    '''
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        return bool(self.total and
+                    self.respect_retry_after_header and
+                    has_retry_after and
+                    self.status_forcelist and
+                    status_code in self.status_forcelist)
+
+
+class SessionPool:
+    '''
+    Keeps one keep-alive `requests.Session` per host, so consecutive requests of the REST-backed engines
+    reuse their TCP/TLS connections instead of opening a new one per call.
+    Every session retries failed connections with exponential backoff and responses with a `Retry-After` header and a
+    status in `status_forcelist` after the requested delay; read errors and other status codes are not retried.
+    The default `timeout` only bounds the connection, a read timeout can be passed per request or for the whole pool.
+    '''
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 status_forcelist: Tuple[int, ...] = (429, 503),
+                 timeout: Optional[Union[float, Tuple[float, Optional[float]]]] = (5, None)):
+        self.pool_connections = pool_connections
+        self.pool_maxsize     = pool_maxsize
+        self.retries          = retries
+        self.backoff_factor   = backoff_factor
+        self.status_forcelist = status_forcelist
+        self.timeout          = timeout
+        self._sessions        = {}
+        self._lock            = threading.Lock()
+
+    def _create_session(self) -> requests.Session:
+        retry = _RetryAfter(total=self.retries,
+                            connect=self.retries,
+                            read=0,
+                            other=0,
+                            backoff_factor=self.backoff_factor,
+                            status_forcelist=self.status_forcelist,
+                            allowed_methods=None, # the methods are checked by `_RetryAfter.is_retry`
+                            raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                              pool_maxsize=self.pool_maxsize,
+                              max_retries=retry)
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def session(self, url: str) -> requests.Session:
+        parsed = urlparse(url)
+        host   = f'{parsed.scheme}://{parsed.netloc}'
+        with self._lock:
+            if host not in self._sessions:
+                self._sessions[host] = self._create_session()
+            return self._sessions[host]
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        if 'timeout' not in kwargs:
+            kwargs['timeout'] = self.timeout
+        return self.session(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request('POST', url, **kwargs)
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+
+_session_pool = None
+_session_lock = threading.Lock()
+
+
+def session_pool() -> SessionPool:
+    global _session_pool
+    with _session_lock:
+        if _session_pool is None:
+            _session_pool = SessionPool()
+        return _session_pool
+
+
+def configure_session_pool(**kwargs) -> SessionPool:
+    '''
+    Replaces the shared session pool, e.g. `configure_session_pool(pool_maxsize=32, timeout=30)`.
+    Accepts the keyword arguments of `SessionPool`.
+    '''
+    global _session_pool
+    with _session_lock:
+        if _session_pool is not None:
+            _session_pool.close()
+        _session_pool = SessionPool(**kwargs)
+        return _session_pool
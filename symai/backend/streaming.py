@@ -0,0 +1,85 @@
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+
+class ResponseStream:
+    '''
+    Incremental engine response returned for queries with `stream=True`.
+    Iterating (or async iterating) the stream yields the text deltas as they arrive from the engine. The post-processors,
+    the return type cast and the constraints of the query are deferred until the stream is exhausted and are applied
+    once to the full text; `result()` / `aresult()` and `str()` consume the remaining deltas and return that final value.
+    Already received deltas are buffered, so the stream can be iterated repeatedly.
+    '''
+    def __init__(self, deltas: Any, finalize: Optional[Callable[[str], Any]] = None):
+        if isinstance(deltas, str):
+            # engines without streaming support (or cached / remedied responses) deliver the full text at once
+            deltas = [deltas]
+        self._async   = hasattr(deltas, '__anext__') or hasattr(deltas, '__aiter__')
+        self._source  = deltas.__aiter__() if self._async else iter(deltas)
+        self._chunks  = []
+        self._done    = False
+        self._value   = None
+        self.finalize = finalize
+
+    @property
+    def text(self) -> str:
+        # the text received so far
+        return ''.join(self._chunks)
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def _finish(self) -> None:
+        self._done  = True
+        self._value = self.finalize(self.text) if self.finalize is not None else self.text
+
+    def __iter__(self) -> Iterator[str]:
+        if self._async and not self._done:
+            raise TypeError('Stream was created by an async engine call, use `async for` instead.')
+        i = 0
+        while True:
+            if i < len(self._chunks):
+                yield self._chunks[i]
+                i += 1
+                continue
+            if self._done:
+                return
+            try:
+                delta = next(self._source)
+            except StopIteration:
+                self._finish()
+                return
+            self._chunks.append(delta)
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        i = 0
+        while True:
+            if i < len(self._chunks):
+                yield self._chunks[i]
+                i += 1
+                continue
+            if self._done:
+                return
+            try:
+                delta = await self._source.__anext__() if self._async else next(self._source)
+            except (StopIteration, StopAsyncIteration):
+                self._finish()
+                return
+            self._chunks.append(delta)
+
+    def result(self) -> Any:
+        for _ in self:
+            pass
+        return self._value
+
+    async def aresult(self) -> Any:
+        async for _ in self:
+            pass
+        return self._value
+
+    def __str__(self) -> str:
+        return str(self.result())
+
+    def __repr__(self) -> str:
+        state = 'done' if self._done else 'streaming'
+        return f'ResponseStream({state}, {self.text!r})'
@@ -0,0 +1,159 @@
+import contextvars
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class UsageAccumulator:
+    '''
+    Thread-safe accumulator of the engine calls, keyed by model.
+    Every engine call records the prompt / completion tokens reported by the API (if any), its latency and
+    whether it was served from the response cache. The costs are derived from the pricing of the engine.
+    '''
+    def __init__(self, history: int = 1_000):
+        self._lock    = threading.Lock()
+        self._models  = {}
+        self._records = deque(maxlen=history)
+
+    def record(self,
+               engine: str,
+               model: Optional[str],
+               prompt_tokens: int = 0,
+               completion_tokens: int = 0,
+               total_tokens: int = 0,
+               latency: float = 0.,
+               cost: float = 0.,
+               cached: bool = False) -> None:
+        entry = {
+            'engine':            engine,
+            'model':             model,
+            'prompt_tokens':     prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'total_tokens':      total_tokens,
+            'latency':           latency,
+            'cost':              cost,
+            'cached':            cached,
+            'time':              time.time()
+        }
+        with self._lock:
+            self._records.append(entry)
+            stats = self._models.setdefault(str(model), {
+                'engine':            engine,
+                'calls':             0,
+                'cached':            0,
+                'prompt_tokens':     0,
+                'completion_tokens': 0,
+                'total_tokens':      0,
+                'latency':           0.,
+                'max_latency':       0.,
+                'cost':              0.
+            })
+            stats['calls']             += 1
+            stats['cached']            += int(cached)
+            stats['prompt_tokens']     += prompt_tokens
+            stats['completion_tokens'] += completion_tokens
+            stats['total_tokens']      += total_tokens
+            stats['latency']           += latency
+            stats['max_latency']        = max(stats['max_latency'], latency)
+            stats['cost']              += cost
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {model: dict(stats) for model, stats in self._models.items()}
+
+    def records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._records)
+
+    def total_cost(self) -> float:
+        with self._lock:
+            return sum([stats['cost'] for stats in self._models.values()])
+
+    def reset(self) -> None:
+        with self._lock:
+            self._models.clear()
+            self._records.clear()
+
+    def prometheus(self, prefix: str = 'symai') -> str:
+        '''
+        Export the accumulated usage in the Prometheus text exposition format, e.g. to serve it from a `/metrics` endpoint.
+        '''
+        metrics = [
+            ('calls_total',             'calls',             'Number of engine calls.'),
+            ('cached_calls_total',      'cached',            'Number of engine calls served from the response cache.'),
+            ('prompt_tokens_total',     'prompt_tokens',     'Prompt tokens reported by the engine API.'),
+            ('completion_tokens_total', 'completion_tokens', 'Completion tokens reported by the engine API.'),
+            ('tokens_total',            'total_tokens',      'Total tokens reported by the engine API.'),
+            ('latency_seconds_total',   'latency',           'Accumulated engine call latency.'),
+            ('cost_dollars_total',      'cost',              'Accumulated engine call costs.')
+        ]
+        summary = self.summary()
+        lines   = []
+        for name, key, help_ in metrics:
+            lines.append(f'# HELP {prefix}_{name} {help_}')
+            lines.append(f'# TYPE {prefix}_{name} counter')
+            for model, stats in summary.items():
+                lines.append(f'{prefix}_{name}{{engine="{stats["engine"]}",model="{model}"}} {stats[key]}')
+        return '\n'.join(lines) + '\n'
+
+
+class UsageMonitor:
+    '''
+    Process-wide entry point of the usage accounting. `Engine.__call__` reports every call here, which updates the
+    global accumulator and all accumulators attached via `attach` (e.g. by an active `OpenAICostTracker`).
+    The attached accumulators are kept in a context variable, so a tracker only sees the calls of its own thread or
+    task (and of the workers started from it with a copy of the context).
+    '''
+    def __init__(self):
+        self.accumulator = UsageAccumulator()
+        self._attached   = contextvars.ContextVar('attached_accumulators', default=())
+
+    def attached(self) -> Tuple[UsageAccumulator, ...]:
+        return self._attached.get()
+
+    def attach(self, accumulator: UsageAccumulator) -> None:
+        self._attached.set(self._attached.get() + (accumulator,))
+
+    def detach(self, accumulator: UsageAccumulator) -> None:
+        self._attached.set(tuple([acc for acc in self._attached.get() if acc is not accumulator]))
+
+    def record(self,
+               engine,
+               kwds: Dict[str, Any],
+               metadata: Dict[str, Any],
+               latency: float,
+               cached: bool = False,
+               accumulators: Optional[Tuple[UsageAccumulator, ...]] = None) -> None:
+        '''
+        Records an engine call in the global accumulator and in `accumulators`, which default to the accumulators
+        attached in the current context.
+        '''
+        usage   = metadata['usage'] if 'usage' in metadata and metadata['usage'] is not None else {}
+        model   = kwds['model'] if 'model' in kwds else getattr(engine, 'model', None)
+        prompt_tokens     = usage.get('prompt_tokens', 0)
+        completion_tokens = usage.get('completion_tokens', 0)
+        total_tokens      = usage.get('total_tokens', prompt_tokens + completion_tokens)
+        cost    = 0. if cached else self._cost(getattr(engine, 'pricing', None), prompt_tokens, completion_tokens, total_tokens)
+        entry   = dict(engine=type(engine).__name__,
+                       model=model,
+                       prompt_tokens=prompt_tokens,
+                       completion_tokens=completion_tokens,
+                       total_tokens=total_tokens,
+                       latency=latency,
+                       cost=cost,
+                       cached=cached)
+        self.accumulator.record(**entry)
+        for accumulator in (accumulators if accumulators is not None else self._attached.get()):
+            accumulator.record(**entry)
+
+    @staticmethod
+    def _cost(pricing: Optional[Dict[str, float]], prompt_tokens: int, completion_tokens: int, total_tokens: int) -> float:
+        if not pricing:
+            return 0.
+        if 'usage' in pricing:
+            return total_tokens * pricing['usage']
+        return prompt_tokens * pricing['input'] + completion_tokens * pricing['output']
+
+
+usage_monitor = UsageMonitor()
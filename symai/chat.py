@@ -3,6 +3,7 @@ import re
 from typing import Any, Optional
 
 from .backend import settings as settings
+from .backend.streaming import ResponseStream
 from .components import (IncludeFilter, InContextClassification,
                          OpenAICostTracker, Outline, Output, Sequence)
 from .core import *
@@ -18,10 +19,11 @@ logging.getLogger('charset_normalizer').setLevel(logging.ERROR)
 class ChatBot(Expression):
     _symai_chat: str = '''This is a conversation between a chatbot (Symbia:) and a human (User:). The chatbot follows a narrative structure, primarily relying on the provided instructions. It uses the user's input as a conditioning factor to generate its responses. Whenever Symbia retrieves any long-term memories, it checks the user's query and incorporates information from the long-term memory buffer into its response. If the long-term memories cannot provide a suitable answer, Symbia then checks its short-term memory to be aware of the topics discussed in the recent conversation rounds. Your primary task is to reply to the user's question or statement by generating a relevant and contextually appropriate response. Do not focus on filling the scratchpad with narration, long-term memory recall, short-term memory recall, or reflections. Always consider any follow-up questions or relevant information from the user to generate a response that is contextually relevant. Endeavor to reply to the greatest possible effort.'''
 
-    def __init__(self, value = None, name: str = 'Symbia', output: Optional[Output] = None, verbose: bool = False):
+    def __init__(self, value = None, name: str = 'Symbia', output: Optional[Output] = None, verbose: bool = False, stream: bool = False):
         super().__init__(value)
         self.sym_return_type = ChatBot
         self.verbose: bool   = verbose
+        self.stream: bool    = stream
         self.name            = name
         self.last_user_input: str = ''
 
@@ -79,7 +81,7 @@ class ChatBot(Expression):
 
         reply = f'{self.name}: {self._narration(message, self.last_user_input, reflection, ltmem_recall, stmem_recall, **kwargs)}'
 
-        if end: print('\n\n', reply)
+        if end and not self.stream: print('\n\n', reply)
 
         return Symbol(reply)
 
@@ -106,7 +108,8 @@ class ChatBot(Expression):
                 super().override_reserved_signature_keys(wrp_params, *args, **kwargs)
 
                 msg     = re.sub(f'{name}:\s*', '', str(args[0]))
-                console = f'\n{name}: {msg}\n$> '
+                # a streamed message was already rendered by narrate
+                console = '\n$> ' if that.stream else f'\n{name}: {msg}\n$> '
 
                 if len(msg) > 0:
                     that.short_term_memory.store(f'{name}: ' + msg)
@@ -126,8 +129,8 @@ class ChatBot(Expression):
         return CustomInputPostProcessor
 
 class SymbiaChat(ChatBot):
-    def __init__(self, name: str = 'Symbia', verbose: bool = False):
-        super().__init__(name=name, verbose=verbose)
+    def __init__(self, name: str = 'Symbia', verbose: bool = False, stream: bool = False):
+        super().__init__(name=name, verbose=verbose, stream=stream)
         self.message = self.narrate(f'{self.name} introduces herself, writes a greeting message and asks how to help.', context=None)
 
     def forward(self, usr: Optional[str] = None) -> Symbol:
@@ -288,17 +291,35 @@ Reflection: {self._extract_reflection(context)}
 The chatbot always reply in the following format
 {self.name}: <reply>
 '''
-        @zero_shot(prompt=prompt, **kwargs)
+        @zero_shot(prompt=prompt, stream=self.stream, **kwargs)
         def _func(_) -> str:
             pass
         if self.verbose: logging.debug(f'Narration:\n{prompt}\n')
         res = _func(self)
+        if isinstance(res, ResponseStream):
+            res = self._render_stream(res)
         res = res.replace(f'{self.name}: ', '').strip()
         return res
 
+    def _render_stream(self, res: ResponseStream) -> str:
+        # print the reply while it is generated and hold back the leading `<name>: ` the model is asked to write
+        prefix = f'{self.name}: '
+        print(f'\n{prefix}', end='', flush=True)
+        held   = ''
+        for delta in res:
+            if held is not None:
+                held += delta
+                if prefix.startswith(held):
+                    continue
+                delta = held[len(prefix):] if held.startswith(prefix) else held
+                held  = None
+            print(delta, end='', flush=True)
+        print(flush=True)
+        return str(res)
+
 def run() -> None:
     with OpenAICostTracker() as tracker:
-        chat = SymbiaChat()
+        chat = SymbiaChat(stream=True)
         chat()
     print(tracker)
 
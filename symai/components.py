@@ -1,43 +1,68 @@
+import contextvars
+import hashlib
 import inspect
-import sys
+import json
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
 from random import sample
 from string import ascii_lowercase, ascii_uppercase
 from typing import Callable, Iterator, List, Optional, Type
 
+import numpy as np
 from tqdm import tqdm
 
-from .backend.engine_embedding import EmbeddingEngine
-from .backend.engine_gptX_chat import GPTXChatEngine
-from .backend.engine_pinecone import IndexEngine
+from .backend.lexical import BM25Index, reciprocal_rank_fusion, tokenize
 from .backend.mixin.openai import SUPPORTED_MODELS
+from .backend.usage import UsageAccumulator, usage_monitor
 from .constraints import DictFormatConstraint
 from .core import *
 from .formatter import ParagraphFormatter
-from .symbol import Expression, Symbol
-from .utils import CustomUserWarning
+from .functional import check_or_init_embedding_func, init_index_engine
+from .symbol import Expression, Symbol, SymbolArray
+from .utils import (CustomUserWarning, normalize, similarity_matrix,
+                    thread_map, top_k_indices)
 
 
 class TrackerTraceable(Expression):
     pass
 
 
+def _short_circuit(exprs: List[Expression], stop: bool, workers: int, args: tuple, kwargs: dict) -> bool:
+    # evaluates the expressions concurrently and returns `stop` as soon as one result has this truth value;
+    # the queued evaluations are cancelled, the running ones finish in the background
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        pending = {executor.submit(contextvars.copy_context().run, e, *args, **kwargs) for e in exprs}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if bool(future.result()) == stop:
+                    return stop
+        return not stop
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
 class Any(Expression):
-    def __init__(self, *expr: List[Expression]):
+    def __init__(self, *expr: List[Expression], workers: int = 8):
         super().__init__()
         self.expr: List[Expression] = expr
+        self.workers:           int = workers
 
     def forward(self, *args, **kwargs) -> Symbol:
-        return self.sym_return_type(any([e() for e in self.expr(*args, **kwargs)]))
+        return self._to_symbol(_short_circuit(self.expr, True, self.workers, args, kwargs))
 
 
 class All(Expression):
-    def __init__(self, *expr: List[Expression]):
+    def __init__(self, *expr: List[Expression], workers: int = 8):
         super().__init__()
         self.expr: List[Expression] = expr
+        self.workers:           int = workers
 
     def forward(self, *args, **kwargs) -> Symbol:
-        return self.sym_return_type(all([e() for e in self.expr(*args, **kwargs)]))
+        return self._to_symbol(_short_circuit(self.expr, False, self.workers, args, kwargs))
 
 
 class Try(Expression):
@@ -102,13 +127,27 @@ class Sequence(TrackerTraceable):
         return sym
 
 
-#@TODO: BinPacker(format="...") -> ensure that data packages form a "bin" that's consistent (e.g. never break a sentence in the middle)
+class Parallel(Expression):
+    def __init__(self, expr: Expression, workers: int = 8, ordered: bool = True):
+        super().__init__()
+        self.expr: Expression = expr
+        self.workers:     int = workers
+        self.ordered:    bool = ordered
+
+    def forward(self, inputs: List[Symbol], **kwargs) -> Symbol:
+        # e.g. Parallel(Sequence(Clean(), Outline()), workers=4)(documents)
+        inputs = inputs.value if isinstance(inputs, Symbol) else inputs
+        res    = thread_map(lambda x: self.expr(x, **kwargs), inputs, workers=self.workers, ordered=self.ordered)
+        return self._to_symbol(list(res))
+
+
 class Stream(Expression):
-    def __init__(self, expr: Optional[Expression] = None, retrieval: Optional[str] = None):
+    def __init__(self, expr: Optional[Expression] = None, retrieval: Optional[str] = None, workers: int = 1):
         super().__init__()
         self.char_token_ratio:    float = 0.6
         self.expr: Optional[Expression] = expr
         self.retrieval:   Optional[str] = retrieval
+        self.workers:               int = workers
         self._trace:               bool = False
         self._previous_frame            = None
 
@@ -127,8 +166,11 @@ class Stream(Expression):
             else:
                 raise ValueError(f"This component does either not inherit from TrackerTraceable or has an invalid number of component declarations: {len(vals)}! Only one component that inherits from TrackerTraceable is allowed in the with stream clause.")
 
+        # the chunk order only matters if the results are returned as they are
         res = sym.stream(expr=self.expr,
-                         char_token_ratio=self.char_token_ratio,
+                         token_ratio=self.char_token_ratio,
+                         workers=self.workers,
+                         ordered=self.retrieval not in ['longest', 'contains'],
                          **kwargs)
 
         if self.retrieval is not None:
@@ -426,29 +468,78 @@ class JsonParser(Expression):
 
 
 class SimilarityClassification(Expression):
-    def __init__(self, classes: List[str], metric: str = 'cosine', in_memory: bool = False):
+    def __init__(self, classes: List[str], metric: str = 'cosine', in_memory: bool = False, top_k: int = 1):
         super().__init__()
         self.classes   = classes
         self.metric    = metric
         self.in_memory = in_memory
+        self.top_k     = top_k
+        self._matrix   = None
+        self._vocab    = None
 
         if self.in_memory:
             CustomUserWarning(f'Caching mode is enabled! It is your responsability to empty the .cache folder if you did changes to the classes. The cache is located at {Path.home()}/.symai/cache')
 
-    def forward(self, x: Symbol) -> Symbol:
-        x            = self._to_symbol(x)
-        usr_embed    = x.embed()
-        embeddings   = self._dynamic_cache()
-        similarities = [usr_embed.similarity(emb, metric=self.metric) for emb in embeddings]
-        similarities = sorted(zip(self.classes, similarities), key=lambda x: x[1], reverse=True)
+    def forward(self, x: Symbol, top_k: Optional[int] = None) -> Symbol:
+        return self.forward_batch([x], top_k=top_k)[0]
+
+    def forward_batch(self, xs: List[Symbol], top_k: Optional[int] = None) -> List[Symbol]:
+        '''
+        Classifies all inputs at once: the inputs are embedded in one request and scored against the class matrix
+        with a single matrix product. Returns the best class per input, or the list of the `top_k` best classes.
+        '''
+        top_k  = top_k if top_k is not None else self.top_k
+        if len(xs) == 0:
+            return []
+        scores = self.scores(xs)
+        res    = []
+        for row in top_k_indices(scores, top_k):
+            labels = [self.classes[i] for i in row]
+            res.append(Symbol(labels[0]) if top_k == 1 else Symbol(labels))
+        return res
 
-        return Symbol(similarities[0][0])
+    def scores(self, xs: List[Symbol]) -> np.ndarray:
+        '''
+        The (len(xs), len(classes)) matrix of similarities between the inputs and the classes.
+        '''
+        classes = self._class_matrix()
+        if self.metric == 'jaccard':
+            return similarity_matrix(self._indicators([str(x) for x in xs]), classes, metric='jaccard')
+        inputs = SymbolArray([str(x) for x in xs]).embed().embeddings
+        if self.metric == 'cosine':
+            # the class matrix is normalized once
+            return normalize(inputs) @ classes.T
+        return similarity_matrix(inputs, classes, metric=self.metric)
+
+    def _indicators(self, texts: List[str]) -> np.ndarray:
+        # set indicators over the class vocabulary; the last column counts the tokens outside of it, so they enlarge the union
+        matrix = np.zeros((len(texts), len(self._vocab) + 1), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in set(tokenize(text)):
+                if token in self._vocab:
+                    matrix[row, self._vocab[token]] = 1.
+                else:
+                    matrix[row, -1] += 1.
+        return matrix
+
+    def _class_matrix(self) -> np.ndarray:
+        if self._matrix is None:
+            if self.metric == 'jaccard':
+                tokens      = sorted(set([t for c in self.classes for t in tokenize(c)]))
+                self._vocab = {t: i for i, t in enumerate(tokens)}
+                matrix      = self._indicators(self.classes)
+            else:
+                matrix = np.asarray([emb.value for emb in self._dynamic_cache()], dtype=np.float32)
+                matrix = normalize(matrix) if self.metric == 'cosine' else matrix
+            self._matrix = matrix
+        return self._matrix
 
     def _dynamic_cache(self):
         @cache(in_memory=self.in_memory)
         def embed_classes(self):
-            opts = map(Symbol, self.classes)
-            embeddings = [opt.embed() for opt in opts]
+            # embed all classes in one request; cached labels are served by the embedding cache
+            embeddings = Symbol(self.classes).embed().value
+            embeddings = [Symbol(emb) for emb in embeddings]
 
             return embeddings
 
@@ -476,119 +567,47 @@ class OpenAICostTracker:
     _supported_models = SUPPORTED_MODELS
 
     def __init__(self):
-        self._inputs     = []
-        self._outputs    = []
-        self._embeddings = []
-        self._zero_shots = 0
-        self._few_shots  = 0
+        # filled by the engines with the token usage reported by the API while the tracker is active
+        self.usage = UsageAccumulator()
 
     def __enter__(self):
         if self._neurosymbolic_model() not in self._supported_models:
             CustomUserWarning(f'We are currently supporting only the following models for the {self.__class__.__name__} feature: {self._supported_models}. Any other model will simply be ignored.')
-        sys.settrace(self._trace_call)
+        usage_monitor.attach(self.usage)
 
         return self
 
     def __exit__(self, *args):
-        sys.settrace(None)
+        usage_monitor.detach(self.usage)
 
     def __repr__(self):
+        summary = self.usage.summary()
+        models  = ''
+        for model, stats in summary.items():
+            if model not in self._supported_models: continue
+            if stats['completion_tokens'] > 0 or stats['prompt_tokens'] != stats['total_tokens']:
+                tokens = f"{stats['prompt_tokens']} input tokens and {stats['completion_tokens']} output tokens"
+            else:
+                tokens = f"{stats['total_tokens']} tokens"
+            models += f'''
+{model} usage:
+    ${stats['cost']:.3f} for {tokens}
+    {stats['calls']} calls ({stats['cached']} cached), {stats['latency']:.2f} sec total latency
+'''
+
         return f'''
 [BREAKDOWN]
 {'-=-' * 13}
-
-{self._neurosymbolic_model()} usage:
-    ${self._compute_io_costs():.3f} for {sum(self._inputs)} input tokens and {sum(self._outputs)} output tokens
-
-{self._embedding_model()} usage:
-    ${self._compute_embedding_costs():.3f} for {sum(self._embeddings)} tokens
-
+{models}
 Total:
-    ${self._compute_io_costs() + self._compute_embedding_costs():.3f}
-
-{'-=-' * 13}
-
-Zero-shot calls: {self._zero_shots}
-
-{'-=-' * 13}
-
-Few-shot calls: {self._few_shots}
+    ${self.usage.total_cost():.3f}
 
 {'-=-' * 13}
 '''
 
-    def _trace_call(self, frame, event, arg):
-        if event != 'call': return
-
-        code      = frame.f_code
-        func_name = code.co_name
-
-        if func_name != '_execute_query':
-            if    func_name == 'zero_shot': self._zero_shots += 1
-            elif  func_name == 'few_shot': self._few_shots += 1
-            else: return
-
-        engine = frame.f_locals.get('engine')
-
-        if isinstance(engine, GPTXChatEngine):
-            if self._neurosymbolic_model() not in self._supported_models: return
-
-            inp      = ''
-            prompt   = frame.f_locals['wrp_params'].get('prompt')
-            examples = frame.f_locals['wrp_params'].get('examples')
-
-            if prompt is not None:
-                if isinstance(prompt, str): inp += prompt + '\n'
-
-            if examples is not None:
-                if    isinstance(examples, str): inp += examples
-                elif  isinstance(examples, list): inp += '\n'.join(examples)
-                elif  isinstance(examples, Prompt): inp += examples.__repr__()
-
-            self._inputs.append(len(Symbol(inp).tokens))
-
-        elif isinstance(engine, EmbeddingEngine):
-            if self._embedding_model() not in self._supported_models: return
-
-            text = frame.f_locals.get('wrp_self')
-
-            if text is not None:
-                if   isinstance(text, str): self._embeddings.append(len(Symbol(text).tokens))
-                elif isinstance(text, list): self._embeddings.append(len(Symbol(text[0]).tokens))
-                elif isinstance(text, Symbol): self._embeddings.append(len(text.tokens))
-
-        return self._trace_return
-
-    def _trace_return(self, frame, event, arg):
-        if event != 'return': return
-
-        engine = frame.f_locals.get('engine')
-
-        if isinstance(engine, GPTXChatEngine):
-            self._outputs.append(len(Symbol(arg).tokens))
-
-    def _compute_io_costs(self):
-        if self._neurosymbolic_model() not in self._supported_models: return 0
-
-        return (sum(self._inputs) * self._neurosymbolic_pricing()['input']) + (sum(self._outputs) * self._neurosymbolic_pricing()['output'])
-
-    def _compute_embedding_costs(self):
-        if self._embedding_model() not in self._supported_models: return 0
-
-        return sum(self._embeddings) * self._embedding_pricing()['usage']
-
     @bind(engine='neurosymbolic', property='model')
     def _neurosymbolic_model(self): pass
 
-    @bind(engine='neurosymbolic', property='pricing')
-    def _neurosymbolic_pricing(self): pass
-
-    @bind(engine='embedding', property='model')
-    def _embedding_model(self): pass
-
-    @bind(engine='embedding', property='pricing')
-    def _embedding_pricing(self): pass
-
 
 class TokenTracker(Expression):
     def __init__(self):
@@ -620,18 +639,28 @@ class TokenTracker(Expression):
 class Indexer(Expression):
     DEFAULT = 'data-index'
 
-    def __init__(self, index_name: str = DEFAULT, top_k: int = 8, batch_size: int = 20, formatter: Callable = ParagraphFormatter(), auto_add=True):
+    def __init__(self, index_name: str = DEFAULT, top_k: int = 8, batch_size: int = 256, formatter: Callable = ParagraphFormatter(), auto_add=True, hybrid: bool = True, workers: int = 4):
         super().__init__()
         self.index_name = index_name
         self.elements   = []
+        # upper bound of chunks per embedding request, the batches are further limited by the token limit of the engine
         self.batch_size = batch_size
+        self.workers    = workers
         self.top_k      = top_k
         self.retrieval  = None
         self.formatter  = formatter
         self.sym_return_type = Expression
+        # content hashes of the indexed chunks per document
+        self.ledger_path = Path.home() / '.symai' / 'indices' / 'hashes' / f'{index_name}.json'
+        self._ledger     = None
+        # within a `with indexer:` block the ledger and the BM25 index are persisted once when the block exits
+        self._deferred   = 0
+        self._dirty      = False
+        # BM25 index of the same chunks, fused with the vector search results
+        self.lexical     = BM25Index(Path.home() / '.symai' / 'indices' / 'lexical' / f'{index_name}.db') if hybrid else None
 
         if index_name != Indexer.DEFAULT:
-            Expression.setup({'index': IndexEngine(index_name=index_name)})
+            Expression.setup({'index': init_index_engine(index_name=index_name)})
             # append index name to indices.txt in home directory .symai folder (default)
             self.path = Path.home() / '.symai' / 'indices.txt'
             if not self.path.exists():
@@ -664,22 +693,146 @@ class Indexer(Expression):
             if self.index_name in indices:
                 return True
 
-    def forward(self, data: Optional[Symbol] = None, raw_result: bool = False) -> Symbol:
+    def _load_ledger(self) -> dict:
+        # the ledger is read once per indexer and kept in memory, it is only written back when it changed
+        if self._ledger is None:
+            if self.ledger_path.exists():
+                with open(self.ledger_path, 'r', encoding='utf-8') as f:
+                    self._ledger = json.load(f)
+            else:
+                self._ledger = {}
+        return self._ledger
+
+    def _save_ledger(self, ledger: dict):
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.ledger_path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(ledger, f)
+        os.replace(tmp, self.ledger_path)
+
+    def __enter__(self) -> 'Indexer':
+        self._deferred += 1
+        return self
+
+    def __exit__(self, type, value, traceback) -> None:
+        self._deferred -= 1
+        if self._deferred == 0:
+            self.flush()
+
+    def flush(self):
+        '''
+        Persists the pending changes of the hash ledger and the BM25 index.
+        '''
+        if not self._dirty:
+            return
+        self._save_ledger(self._load_ledger())
+        if self.lexical is not None:
+            self.lexical.save()
+        self._dirty = False
+
+    @staticmethod
+    def chunk_id(text: str, document: Optional[str] = None) -> str:
+        return hashlib.sha256(f'{document or ""}\0{text}'.encode('utf-8')).hexdigest()
+
+    def _batches(self, chunks: List[tuple]) -> Iterator[List[tuple]]:
+        engine     = check_or_init_embedding_func()
+        max_tokens = getattr(engine, 'max_tokens', None) or 8_191
+        batch      = []
+        tokens     = 0
+        for id_, text in chunks:
+            required = engine.compute_required_tokens([text]) if hasattr(engine, 'compute_required_tokens') else len(text) // 4 + 1
+            if len(batch) > 0 and (tokens + required > max_tokens or len(batch) >= self.batch_size):
+                yield batch
+                batch  = []
+                tokens = 0
+            batch.append((id_, text))
+            tokens += required
+        if len(batch) > 0:
+            yield batch
+
+    def _embed(self, batch: List[tuple]) -> tuple:
+        return batch, Symbol([text for _, text in batch]).embed().value
+
+    def _ingest(self, chunks: List[tuple], progress: bool = True):
+        # embedding requests run concurrently in a bounded window, each upsert overlaps with the following requests
+        if len(chunks) == 0:
+            return
+        upserter = ThreadPoolExecutor(max_workers=1)
+        upserts  = deque()
+        try:
+            with tqdm(total=len(chunks), disable=not progress) as bar:
+                for batch, embeds in thread_map(self._embed, self._batches(chunks), workers=self.workers):
+                    vectors = [(id_, emb, {'text': text}) for (id_, text), emb in zip(batch, embeds)]
+                    upserts.append(upserter.submit(contextvars.copy_context().run, self.add, vectors))
+                    while len(upserts) > 1:
+                        upserts.popleft().result()
+                    bar.update(len(batch))
+            while len(upserts) > 0:
+                upserts.popleft().result()
+        finally:
+            upserter.shutdown(wait=True)
+
+    def update(self, elements: List[str], document: Optional[str] = None, progress: bool = True) -> dict:
+        '''
+        Incrementally indexes the chunks of a document. Chunks are identified by their content hash, so only new or
+        modified chunks are embedded and upserted. If a `document` key is given, the chunks which were indexed for it
+        before but are no longer part of it are deleted from the index. Without a key the chunks are only added.
+        Inside a `with indexer:` block the ledger and the BM25 index are only persisted when the block exits.
+
+        Returns:
+            dict: The number of `added`, `deleted` and `unchanged` chunks.
+        '''
+        key    = document if document is not None else ''
+        ledger = self._load_ledger()
+        known  = set(ledger.get(key, []))
+        chunks = {}
+        for text in elements:
+            chunks.setdefault(self.chunk_id(str(text), document), str(text))
+        missing = [(id_, text) for id_, text in chunks.items() if id_ not in known]
+        stale   = [id_ for id_ in known if id_ not in chunks] if document is not None else []
+
+        self._ingest(missing, progress=progress)
+        if len(stale) > 0:
+            self.delete(stale)
+        if self.lexical is not None and (len(missing) > 0 or len(stale) > 0):
+            for id_, text in missing:
+                self.lexical.add(id_, text)
+            for id_ in stale:
+                self.lexical.remove(id_)
+
+        if len(missing) > 0 or len(stale) > 0:
+            ledger[key] = list(chunks.keys()) if document is not None else list(known | set(chunks.keys()))
+            self._dirty = True
+        if self._deferred == 0:
+            self.flush()
+        return {'added': len(missing), 'deleted': len(stale), 'unchanged': len(chunks) - len(missing)}
+
+    def _fuse(self, query: str, matches: List[dict]) -> List[str]:
+        texts = {v['id']: v['metadata']['text'] for v in matches}
+        if self.lexical is None or len(self.lexical) == 0:
+            return list(texts.values())
+        # reciprocal rank fusion of the vector and the BM25 ranking
+        lexical = [id_ for id_, _ in self.lexical.search(query, top_k=self.top_k)]
+        fused   = reciprocal_rank_fusion([list(texts.keys()), lexical])[:self.top_k]
+        # the texts of the chunks which were only found by BM25 are looked up in the vector index
+        missing = [id_ for id_, _ in fused if id_ not in texts]
+        if len(missing) > 0:
+            texts.update({v['id']: v['metadata']['text'] for v in self.lookup(missing).ast()['matches']})
+        return [texts[id_] for id_, _ in fused if id_ in texts]
+
+    def forward(self, data: Optional[Symbol] = None, raw_result: bool = False, document: Optional[str] = None) -> Symbol:
         that = self
         if data is not None:
             data = self._to_symbol(data)
             # split text paragraph-wise and index each paragraph separately
             self.elements = self.formatter(data).value
-            # run over the elments in batches
-            for i in tqdm(range(0, len(self.elements), self.batch_size)):
-                val = Symbol(self.elements[i:i+self.batch_size]).zip()
-                that.add(val)
+            self.update(self.elements, document=document)
 
         def _func(query, *args, **kwargs):
             query_emb = Symbol(query).embed().value
-            res = that.get(query_emb, index_top_k=that.top_k)
+            res = that.get(query_emb, index_top_k=that.top_k, index_values=False)
             res = res.ast()
-            res = [v['metadata']['text'] for v in res['matches']]
+            res = that._fuse(str(query), res['matches'])
             that.retrieval = res
             sym = that._to_symbol(res)
             if raw_result:
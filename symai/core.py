@@ -1,9 +1,16 @@
 import functools
+import inspect
 from typing import Callable, Dict, List, Optional
 
 from . import __root_dir__
-from .functional import (bind_registry_func, cache_registry_func, command_func,
-                         crawler_func, embed_func, execute_func, few_shot_func,
+from .functional import (acrawler_func, aembed_func, aexecute_func,
+                         afew_shot_func, afinetuning_func,
+                         aimagecaptioning_func, aimagerendering_func,
+                         aindex_func, aocr_func, aopen_func, aoutput_func,
+                         asearch_func, aspeech_func, asymbolic_func,
+                         auserinput_func, avision_func, bind_registry_func,
+                         cache_registry_func, command_func, crawler_func,
+                         embed_func, execute_func, few_shot_func,
                          finetuning_func, imagecaptioning_func,
                          imagerendering_func, index_func, ocr_func, open_func,
                          output_func, retry_func, search_func, setup_func,
@@ -42,6 +49,22 @@ def few_shot(prompt: str = '',
         object: The prediction of the model based on the return type of the decorated function. Defaults to object, if not specified or to str if cast was not possible.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await afew_shot_func(wrp_self,
+                                            func=func,
+                                            prompt=prompt,
+                                            examples=examples,
+                                            constraints=constraints,
+                                            default=default,
+                                            limit=limit,
+                                            pre_processors=pre_processors,
+                                            post_processors=post_processors,
+                                            wrp_kwargs=wrp_kwargs,
+                                            args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return few_shot_func(wrp_self,
@@ -971,6 +994,21 @@ def expression(prompt: str = "Evaluate the symbolic expressions:\n",
         or _symbolic_expression_engine is not None and 'wolframalpha' in _symbolic_expression_engine:
         # send the expression to wolframalpha
         def decorator(func):
+            if inspect.iscoroutinefunction(func):
+                @functools.wraps(func)
+                async def wrapper(wrp_self, *args, **kwargs):
+                    return await asymbolic_func(wrp_self,
+                                                func=func,
+                                                prompt=prompt,
+                                                default=default,
+                                                limit=1,
+                                                examples=examples,
+                                                pre_processors=[WolframAlphaPreProcessor()], # no need for pre-processing since the expression is sent to wolframalpha
+                                                post_processors=[WolframAlphaPostProcessor()],
+                                                wrp_kwargs=wrp_kwargs,
+                                                args=args, kwargs=kwargs)
+                return wrapper
+
             @functools.wraps(func)
             def wrapper(wrp_self, *args, **kwargs):
                 return symbolic_func(wrp_self,
@@ -1445,6 +1483,22 @@ def search(query: str,
         object: The search results based on the query.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await asearch_func(wrp_self,
+                                          func=func,
+                                          query=query,
+                                          constraints=constraints,
+                                          default=default,
+                                          limit=limit,
+                                          pre_processors=pre_processors,
+                                          post_processors=post_processors,
+                                          wrp_args=wrp_args,
+                                          wrp_kwargs=wrp_kwargs,
+                                          args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return search_func(wrp_self,
@@ -1486,6 +1540,22 @@ def opening(path: str,
         object: The result of applying the given function to the opened file.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aopen_func(wrp_self,
+                                        func=func,
+                                        path=path,
+                                        constraints=constraints,
+                                        default=default,
+                                        limit=limit,
+                                        pre_processors=pre_processors,
+                                        post_processors=post_processors,
+                                        wrp_args=wrp_args,
+                                        wrp_kwargs=wrp_kwargs,
+                                        args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return open_func(wrp_self,
@@ -1521,6 +1591,19 @@ def embed(entries: List[str],
         function: A function with the entries embedded.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aembed_func(wrp_self,
+                                         entries=entries,
+                                         func=func,
+                                         pre_processors=pre_processors,
+                                         post_processors=post_processors,
+                                         wrp_args=wrp_args,
+                                         wrp_kwargs=wrp_kwargs,
+                                         args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return embed_func(wrp_self,
@@ -1576,6 +1659,20 @@ def draw(operation: str = 'create',
         function: A function with the entries embedded.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aimagerendering_func(wrp_self,
+                                                  operation=operation,
+                                                  prompt=prompt,
+                                                  func=func,
+                                                  pre_processors=pre_processors,
+                                                  post_processors=post_processors,
+                                                  wrp_args=wrp_args,
+                                                  wrp_kwargs=wrp_kwargs,
+                                                  args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return imagerendering_func(wrp_self,
@@ -1611,6 +1708,20 @@ def vision(image: Optional[str] = None,
         object: The result of the performed task.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await avision_func(wrp_self,
+                                          image=image,
+                                          prompt=text,
+                                          func=func,
+                                          pre_processors=pre_processors,
+                                          post_processors=post_processors,
+                                          wrp_args=wrp_args,
+                                          wrp_kwargs=wrp_kwargs,
+                                          args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return vision_func(wrp_self,
@@ -1644,6 +1755,19 @@ def ocr(image: str,
         str: The text recognized by the OCR.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aocr_func(wrp_self,
+                                       image=image,
+                                       func=func,
+                                       pre_processors=pre_processors,
+                                       post_processors=post_processors,
+                                       wrp_args=wrp_args,
+                                       wrp_kwargs=wrp_kwargs,
+                                       args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return ocr_func(wrp_self,
@@ -1676,6 +1800,19 @@ def speech(prompt: str = 'decode',
         Callable: The decorated function.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aspeech_func(wrp_self,
+                                          prompt=prompt,
+                                          func=func,
+                                          pre_processors=pre_processors,
+                                          post_processors=post_processors,
+                                          wrp_args=wrp_args,
+                                          wrp_kwargs=wrp_kwargs,
+                                          args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return speech_func(wrp_self,
@@ -1710,6 +1847,20 @@ def output(constraints: List[Callable] = [],
         function: The decorated function.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aoutput_func(wrp_self,
+                                          func=func,
+                                          constraints=constraints,
+                                          default=default,
+                                          pre_processors=pre_processors,
+                                          post_processors=post_processors,
+                                          wrp_args=wrp_args,
+                                          wrp_kwargs=wrp_kwargs,
+                                          args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return output_func(wrp_self,
@@ -1751,6 +1902,23 @@ def fetch(url: str,
         object: The matched data.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await acrawler_func(wrp_self,
+                                           func=func,
+                                           url=url,
+                                           pattern=pattern,
+                                           constraints=constraints,
+                                           default=default,
+                                           limit=limit,
+                                           pre_processors=pre_processors,
+                                           post_processors=post_processors,
+                                           wrp_args=wrp_args,
+                                           wrp_kwargs=wrp_kwargs,
+                                           args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return crawler_func(wrp_self,
@@ -1790,6 +1958,20 @@ def userinput(constraints: List[Callable] = [],
         callable: The decorator function that can be used to prompt for user input.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await auserinput_func(wrp_self,
+                                             func=func,
+                                             constraints=constraints,
+                                             default=default,
+                                             pre_processors=pre_processors,
+                                             post_processors=post_processors,
+                                             wrp_args=wrp_args,
+                                             wrp_kwargs=wrp_kwargs,
+                                             args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return userinput_func(wrp_self,
@@ -1825,6 +2007,21 @@ def execute(default: Optional[str] = None,
         Callable: The decorated function that executes the given function after applying constraints, pre-processing and post-processing.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aexecute_func(wrp_self,
+                                           func=func,
+                                           code=str(wrp_self),
+                                           constraints=constraints,
+                                           default=default,
+                                           pre_processors=pre_processors,
+                                           post_processors=post_processors,
+                                           wrp_args=wrp_args,
+                                           wrp_kwargs=wrp_kwargs,
+                                           args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return execute_func(wrp_self,
@@ -1843,7 +2040,7 @@ def execute(default: Optional[str] = None,
 
 
 def index(prompt: Any,
-          operation: str = 'search', # | add | config
+          operation: str = 'search', # | add | delete | lookup | config
           default: Optional[str] = None,
           constraints: List[Callable] = [],
           pre_processors: Optional[List[PreProcessor]] = [],
@@ -1853,7 +2050,7 @@ def index(prompt: Any,
     """Query for a given index and returns the result through a decorator.
 
     Args:
-        prompt (Any): The query to be used by the search, add or config of the index.
+        prompt (Any): The query to be used by the search, add, delete or config of the index.
         operation (str, optional): The operation to be performed on the index. Defaults to 'search'.
         default (str, optional): The default value to be returned if the task cannot be solved. Defaults to None.
         constraints (List[Callable], optional): A list of constrains applied to the model output to verify the output. Defaults to [].
@@ -1866,6 +2063,22 @@ def index(prompt: Any,
         Callable: The decorated function that returns the indexed object after applying constraints, pre-processing and post-processing.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aindex_func(wrp_self,
+                                         func=func,
+                                         prompt=prompt,
+                                         operation=operation,
+                                         constraints=constraints,
+                                         default=default,
+                                         pre_processors=pre_processors,
+                                         post_processors=post_processors,
+                                         wrp_args=wrp_args,
+                                         wrp_kwargs=wrp_kwargs,
+                                         args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return index_func(wrp_self,
@@ -1884,11 +2097,13 @@ def index(prompt: Any,
 
 
 def command(engines: List[str] = ['all'],
+            scoped: bool = False,
             **wrp_kwargs):
     """Decorates a function to forward commands to the engine backends.
 
     Args:
         engines (List[str], optional): A list of engines to forward the command to. Defaults to ['all'].
+        scoped (bool, optional): If True, the command is applied to copies of the engines which are only active within the returned `with` scope. Defaults to False.
         wrp_kwargs (dict): A dictionary of keyword arguments to the command function.
 
     Returns:
@@ -1903,6 +2118,7 @@ def command(engines: List[str] = ['all'],
             return command_func(wrp_self,
                                 func=func,
                                 engines=engines,
+                                scoped=scoped,
                                 wrp_kwargs=wrp_kwargs,
                                 kwargs=kwargs)
         return wrapper
@@ -1910,11 +2126,13 @@ def command(engines: List[str] = ['all'],
 
 
 def setup(engines: Dict[str, Any],
+          scoped: bool = False,
           **wrp_kwargs):
     """Decorates a function to initialize custom engines as backends.
 
     Args:
         engines (Dict[str], optional): A dictionary of engines to initialize a custom setup.
+        scoped (bool, optional): If True, the engines are only active within the returned `with` scope. Defaults to False.
         wrp_kwargs (dict): A dictionary of keyword arguments to the command function.
 
     Returns:
@@ -1926,6 +2144,7 @@ def setup(engines: Dict[str, Any],
             return setup_func(wrp_self,
                               func=func,
                               engines=engines,
+                              scoped=scoped,
                               wrp_kwargs=wrp_kwargs,
                               kwargs=kwargs)
         return wrapper
@@ -2023,6 +2242,19 @@ def tune(operation: str = 'create',
         function: A function with the entries embedded.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                kwargs['__cmd__'] = operation
+                return await afinetuning_func(wrp_self,
+                                              func=func,
+                                              pre_processors=pre_processors,
+                                              post_processors=post_processors,
+                                              wrp_args=wrp_args,
+                                              wrp_kwargs=wrp_kwargs,
+                                              args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             kwargs['__cmd__'] = operation
@@ -2057,6 +2289,20 @@ def caption(image: str,
         function: A function with the entries embedded.
     """
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(wrp_self, *args, **kwargs):
+                return await aimagecaptioning_func(wrp_self,
+                                                   prompt=prompt,
+                                                   image=image,
+                                                   func=func,
+                                                   pre_processors=pre_processors,
+                                                   post_processors=post_processors,
+                                                   wrp_args=wrp_args,
+                                                   wrp_kwargs=wrp_kwargs,
+                                                   args=args, kwargs=kwargs)
+            return wrapper
+
         @functools.wraps(func)
         def wrapper(wrp_self, *args, **kwargs):
             return imagecaptioning_func(wrp_self,
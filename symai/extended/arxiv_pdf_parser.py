@@ -3,9 +3,8 @@ import re
 import shutil
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-import requests
-
 from .. import Expression, Symbol
+from ..backend.sessions import session_pool
 from .file_merger import FileMerger
 
 
@@ -54,7 +53,7 @@ class ArxivPdfParser(Expression):
 
     def download_pdf(self, url, output_path):
         # Download pdfs
-        response = requests.get(url)
+        response = session_pool().get(url)
         file = os.path.join(output_path, f'{url.split("/")[-1]}')
         with open(file, 'wb') as f:
             f.write(response.content)
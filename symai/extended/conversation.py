@@ -40,7 +40,7 @@ class Conversation(SlidingWindowStringConcatMemory):
             self.index   = self.indexer(raw_result=True)
 
     def __getstate__(self):
-        state = self.__dict__.copy()
+        state = super().__getstate__()
         # Remove the unpickleable entries such as the `indexer` attribute because it is not serializable
         del state['indexer']
         del state['index']
@@ -48,7 +48,7 @@ class Conversation(SlidingWindowStringConcatMemory):
 
     def __setstate__(self, state):
         # Restore instance attributes
-        self.__dict__.update(state)
+        super().__setstate__(state)
         # Add back the attribute that were removed in __getstate__
         if self.index_name is not None:
             self.indexer = Indexer(index_name=self.index_name)
@@ -5,13 +5,13 @@ from ..symbol import Expression, Symbol
 
 
 class Crawler(Expression):
-    def __init__(self, filters: List[Expression] = []):
+    def __init__(self, filters: List[Expression] = [], workers: int = 4):
         super().__init__()
         filters = filters if isinstance(filters, List) or isinstance(filters, tuple) else [filters]
         self.data_stream = Stream(Sequence(
             Clean(),
             *filters
-        ))
+        ), workers=workers)
 
     def forward(self, url: str, pattern='www', **kwargs) -> Symbol:
         res = self.fetch(url=url, pattern=pattern, **kwargs)
@@ -13,13 +13,16 @@ class DocumentRetriever(Expression):
         text = None
         if not indexer.exists() or overwrite:
             indexer.register()
+            document = None
             if type(file) is str:
                 file_path = file
+                document  = os.path.abspath(file_path)
                 reader = FileReader()
                 text = reader(file_path, **kwargs)
             else:
                 text = str(file)
-            self.index = indexer(text, **kwargs)
+            # only the changed chunks of a previously indexed file are embedded again
+            self.index = indexer(text, document=document, **kwargs)
         else:
             self.index = indexer(**kwargs)
 
@@ -1,7 +1,11 @@
+import hashlib
+import json
 import os
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
-from .. import Expression, FileReader, Indexer, Symbol
+from .. import Expression, FileReader, Symbol
+from ..backend.cache import FileTextCache
+from ..utils import thread_map
 
 
 class FileMerger(Expression):
@@ -10,42 +14,72 @@ class FileMerger(Expression):
     Files specified in the exclude list will not be included.
     """
     def __init__(self, file_endings: List[str] = ['.py', '.md', '.txt', '.sh', '.pdf', '.json', '.yaml'],
-                       file_excludes: List[str] = ['__init__.py', '__pycache__', 'LICENSE', 'requirements.txt', 'environment.yaml', '.git']):
+                       file_excludes: List[str] = ['__init__.py', '__pycache__', 'LICENSE', 'requirements.txt', 'environment.yaml', '.git'],
+                       workers: int = 8,
+                       cache: Optional[FileTextCache] = None,
+                       use_cache: bool = True):
         super().__init__()
         self.file_endings = file_endings
         self.file_excludes = file_excludes
+        self.workers = workers
         self.reader = FileReader()
+        self.cache = cache if cache is not None or not use_cache else FileTextCache()
 
-    def forward(self, root_path: str, **kwargs) -> Symbol:
+    def files(self, root_path: str) -> Iterator[str]:
         """
-        Method to find, read, merge and return contents of files in the form of a Symbol starting from the root_path.
-
-        The method recursively searches files with specified endings from the root path, excluding specific file names.
-        Then, it reads all found files using the FileReader, merges them into one file (merged_file), and returns the
-        merged file as a Symbol.
+        Lazily yields the paths of all files below root_path with one of the file endings and not matching any exclude.
         """
-        merged_file = ""
-
-        # Implement recursive file search
         for root, dirs, files in os.walk(root_path):
+            # do not descend into excluded directories
+            dirs[:] = [d for d in dirs if not any(exclude in os.path.join(root, d) for exclude in self.file_excludes)]
             for file in files:
                 file_path = os.path.join(root, file)
                 # Exclude files with the specified names in the path
                 if any(exclude in file_path for exclude in self.file_excludes):
                     continue
-
                 # Look only for files with the specified endings
                 if file.endswith(tuple(self.file_endings)):
-                    # Read in the file using the FileReader
-                    file_content = self.reader(file_path, **kwargs).value
+                    yield file_path
+
+    def read(self, file_path: str, **kwargs) -> str:
+        """
+        Reads a file using the FileReader. The extracted text is reused as long as the file's mtime and size are unchanged,
+        texts read with different reader arguments (e.g. a page `range`) are cached separately.
+        """
+        if self.cache is None:
+            return self.reader(file_path, **kwargs).value
+        variant = hashlib.sha256(json.dumps(kwargs, sort_keys=True, default=str).encode('utf-8')).hexdigest() if kwargs else ''
+        stat    = os.stat(file_path)
+        text    = self.cache.get(file_path, variant)
+        if text is None:
+            text = self.reader(file_path, **kwargs).value
+            self.cache.put(file_path, text, stat, variant)
+        return text
 
-                    # Append start and end markers for each file
-                    file_content = f"# ----[FILE_START] {file_path}\n" + \
-                                   file_content + \
-                                   f"\n# ----[FILE_END] {file_path}\n"
+    def stream(self, root_path: str, **kwargs) -> Iterator[Tuple[str, str]]:
+        """
+        Lazily yields (path, content) records of the files below root_path. Files are read on a pool of worker threads
+        with a bounded number of files in flight, so the memory usage does not grow with the size of the tree.
+        """
+        def _read(file_path):
+            return file_path, self.read(file_path, **kwargs)
+        yield from thread_map(_read, self.files(root_path), workers=self.workers)
 
-                    # Merge the file contents
-                    merged_file += file_content
+    def forward(self, root_path: str, **kwargs) -> Symbol:
+        """
+        Method to find, read, merge and return contents of files in the form of a Symbol starting from the root_path.
+
+        The method recursively searches files with specified endings from the root path, excluding specific file names.
+        Then, it reads all found files using the FileReader, merges them into one file (merged_file), and returns the
+        merged file as a Symbol.
+        """
+        merged_file = []
+        for file_path, file_content in self.stream(root_path, **kwargs):
+            # Append start and end markers for each file
+            merged_file.append(f"# ----[FILE_START] {file_path}\n" + \
+                               file_content + \
+                               f"\n# ----[FILE_END] {file_path}\n")
 
         # Return the merged file as a Symbol
-        return self._to_symbol(merged_file)
\ No newline at end of file
+        return self._to_symbol(''.join(merged_file))
+
@@ -1,11 +1,20 @@
-from typing import List
+import hashlib
+import json
+import os
+import warnings
+from typing import Any, List, Optional
 
+from .. import core
+from ..backend.cache import SQLiteCache
 from ..components import Clean, Outline, Sequence, Stream, Translate
+from ..formatter import BinPacker
+from ..functional import check_or_init_neurosymbolic_func
 from ..symbol import Expression, Symbol
+from ..utils import thread_map
 
 
 class Summarizer(Expression):
-    def __init__(self, filters: List[Expression] = []):
+    def __init__(self, filters: List[Expression] = [], workers: int = 4):
         super().__init__()
         filters = filters if isinstance(filters, List) or isinstance(filters, tuple) else [filters]
         self.data_stream = Stream(Sequence(
@@ -13,7 +22,7 @@ class Summarizer(Expression):
             Translate(),
             Outline(),
             *filters,
-        ))
+        ), workers=workers)
 
     def forward(self, sym: Symbol, **kwargs) -> Symbol:
         vals = list(self.data_stream(sym, **kwargs))
@@ -26,3 +35,140 @@ class Summarizer(Expression):
         for k, v in sym.value.items():
             summary[k] = Expression(v).compose(**kwargs)
         return self.sym_return_type(summary)
+
+
+class MapReduceSummarizer(Expression):
+    '''
+    Hierarchical summarizer for texts which exceed the context of the neuro-symbolic engine.
+    The text is packed into chunks of at most `chunk_tokens` tokens which are summarized in parallel (map). The summaries
+    are then grouped into consecutive groups of at most `token_budget` tokens and every group is summarized again, level
+    by level, until a single summary is left (reduce). Summaries longer than half of the budget are summarized again
+    before they are grouped, so that every group holds at least two summaries. Every node of the tree is cached by the hash of its input and of
+    the engine and model, so a re-run after a failure only summarizes the nodes which were not completed yet.
+    '''
+    def __init__(self, chunk_tokens: Optional[int] = None,
+                       token_budget: Optional[int] = None,
+                       token_ratio: float = 0.6,
+                       workers: int = 8,
+                       cache: Optional[SQLiteCache] = None,
+                       use_cache: bool = True,
+                       tokenizer: Optional[Any] = None):
+        super().__init__()
+        self.chunk_tokens = chunk_tokens
+        self.token_budget = token_budget
+        self.token_ratio  = token_ratio
+        self.workers      = workers
+        self._tokenizer   = tokenizer
+        self.cache        = cache if cache is not None or not use_cache else \
+                            SQLiteCache(path=os.path.join(os.path.expanduser('~'), '.symai', 'cache', 'summaries.db'))
+        self.levels       = 0
+        if token_budget is not None:
+            # without a tokenizer the separator takes at least one token, the engine tokenizer is checked in forward
+            self._check_budget(token_budget, self._separator() if tokenizer is not None else 1)
+
+    def _budget(self, tokens: Optional[int]) -> int:
+        if tokens is not None:
+            return tokens
+        return int(self._max_tokens() * self.token_ratio)
+
+    def _separator(self) -> int:
+        return len(self._encoder().encode('\n\n', disallowed_special=()))
+
+    def _check_budget(self, budget: int, separator: int):
+        # two summaries of at least one token and their separator must fit into a group, otherwise the reduction never ends
+        if budget < 2 + separator:
+            raise ValueError(f'The token budget of {budget} tokens is too small to reduce the summaries, '
+                             f'it must hold at least {2 + separator} tokens.')
+
+    def _limit(self, budget: int) -> int:
+        return (budget - self._separator()) // 2
+
+    @core.bind(engine='neurosymbolic', property='max_tokens')
+    def _max_tokens(self): pass
+
+    def _encoder(self):
+        return self._tokenizer if self._tokenizer is not None else self.tokenizer()
+
+    def key(self, text: str, context: Optional[str], **kwargs) -> str:
+        engine = check_or_init_neurosymbolic_func()
+        model  = kwargs['model'] if 'model' in kwargs else getattr(engine, 'model', None)
+        entry  = {
+            'engine':  type(engine).__name__,
+            'model':   model,
+            'text':    text,
+            'context': context,
+            'kwargs':  kwargs
+        }
+        data = json.dumps(entry, sort_keys=True, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def summarize_node(self, text: str, context: Optional[str] = None, **kwargs) -> str:
+        key = self.key(text, context, **kwargs)
+        if self.cache is not None:
+            summary = self.cache.get(key)
+            if summary is not None:
+                return summary
+        summary = str(Symbol(text).summarize(context=context, **kwargs))
+        if self.cache is not None:
+            self.cache.set(key, summary)
+        return summary
+
+    def group(self, summaries: List[str], budget: int) -> List[List[str]]:
+        '''
+        Groups consecutive summaries into groups of at most `budget` tokens, separators included. Summaries longer than
+        half of the budget are truncated with a warning, so every group except the last holds at least two summaries and
+        each level of the reduction at least halves the number of summaries. A trailing single summary is passed on to the
+        next level.
+        '''
+        tokenizer = self._encoder()
+        separator = self._separator()
+        self._check_budget(budget, separator)
+        limit     = self._limit(budget)
+        groups    = []
+        size      = 0
+        for summary in summaries:
+            tokens = tokenizer.encode(summary, disallowed_special=())
+            if len(tokens) > limit:
+                warnings.warn(f'Truncating a summary of {len(tokens)} tokens to {limit} tokens.')
+                tokens  = tokens[:limit]
+                summary = tokenizer.decode(tokens)
+            if len(groups) > 0 and size + separator + len(tokens) <= budget:
+                groups[-1].append(summary)
+                size += separator + len(tokens)
+            else:
+                groups.append([summary])
+                size = len(tokens)
+        return groups
+
+    def forward(self, sym: Symbol, context: Optional[str] = None, **kwargs) -> Symbol:
+        sym    = self._to_symbol(sym)
+        packer = BinPacker(max_tokens=self._budget(self.chunk_tokens), tokenizer=self._encoder())
+        chunks = packer.pack(str(sym))
+
+        def _summarize(text):
+            return self.summarize_node(text, context=context, **kwargs)
+
+        # the budget is checked before the map step, since the engine tokenizer is only known now
+        tokenizer = self._encoder()
+        budget    = self._budget(self.token_budget)
+        self._check_budget(budget, self._separator())
+        limit     = self._limit(budget)
+
+        def _shorten(summary):
+            # oversized summaries are summarized once more, group only truncates what is still too long
+            if len(tokenizer.encode(summary, disallowed_special=())) > limit:
+                return _summarize(summary)
+            return summary
+
+        # map
+        summaries   = list(thread_map(_summarize, chunks, workers=self.workers))
+        self.levels = 1
+        # reduce
+        while len(summaries) > 1:
+            summaries   = list(thread_map(_shorten, summaries, workers=self.workers))
+            groups      = self.group(summaries, budget)
+            # a trailing single summary is passed on without summarizing it again
+            summaries   = list(thread_map(lambda g: g[0] if len(g) == 1 else _summarize('\n\n'.join(g)),
+                                          groups, workers=self.workers))
+            self.levels += 1
+        return self._to_symbol(summaries[0])
@@ -1,6 +1,6 @@
 import re
 from itertools import takewhile
-from typing import List
+from typing import Any, List, Optional
 
 from . import core
 from .symbol import Expression, Symbol
@@ -37,19 +37,11 @@ class ParagraphFormatter(Expression):
     def _max_tokens(self): pass
 
     def split_max_tokens_exceeded(self, input_text: List[str], token_ratio=0.5):
-        paragraphs = []
         max_ctxt_tokens = int(self._max_tokens() * token_ratio)
+        packer = BinPacker(max_tokens=max_ctxt_tokens, tokenizer=self.tokenizer())
+        paragraphs = []
         for text in input_text:
-            len_ = len(self.tokenizer().encode(text, disallowed_special=()))
-            if len_ > max_ctxt_tokens:
-                # split into chunks of max_ctxt_tokens
-                splits_ = len_ // max_ctxt_tokens
-                text_len_ = len(str(text)) // splits_
-                for i in range(splits_):
-                    paragraph = text[i * text_len_:(i + 1) * text_len_]
-                    paragraphs.append(paragraph + "\n")
-            else:
-                paragraphs.append(text)
+            paragraphs += packer.pack(text)
         return paragraphs
 
     def forward(self, sym: Symbol, *args, **kwargs) -> Symbol:
@@ -61,6 +53,89 @@ class ParagraphFormatter(Expression):
         return self._to_symbol(self.elements)
 
 
+class BinPacker(Expression):
+    '''
+    Packs a text into chunks of at most `max_tokens` tokens without breaking sentences apart.
+    Every sentence is encoded exactly once; consecutive sentences are packed greedily into a chunk and a sentence which
+    alone exceeds the limit is split on token boundaries. With `overlap > 0` each chunk repeats the trailing sentences
+    (or tokens) of its predecessor, up to `overlap` tokens.
+    '''
+    SENTENCES_RE = re.compile(r'.+?(?:[.!?](?=\s)|\n|$)\s*', re.DOTALL)
+
+    def __init__(self, max_tokens: Optional[int] = None, overlap: int = 0, tokenizer: Optional[Any] = None):
+        super().__init__()
+        self.max_tokens = max_tokens
+        self.overlap    = overlap
+        self._tokenizer = tokenizer
+
+    @core.bind(engine='embedding', property='max_tokens')
+    def _max_tokens(self): pass
+
+    def _limit(self) -> int:
+        return self.max_tokens if self.max_tokens is not None else self._max_tokens()
+
+    def _encoder(self):
+        return self._tokenizer if self._tokenizer is not None else self.tokenizer()
+
+    def pack(self, text: str) -> List[str]:
+        max_tokens = self._limit()
+        tokenizer  = self._encoder()
+        sentences  = [(s, tokenizer.encode(s, disallowed_special=())) for s in self.SENTENCES_RE.findall(text)]
+        if sum([len(t) for _, t in sentences]) <= max_tokens:
+            return [text]
+        # every chunk ends with a newline, whose tokens are reserved in the budget of the chunk
+        budget     = max_tokens - len(tokenizer.encode('\n', disallowed_special=()))
+        overlap    = min(self.overlap, budget // 2)
+
+        chunks = []
+        bin_   = [] # sentences of the current chunk as (text, tokens)
+        size   = 0
+        fresh  = False # the chunk holds sentences which are not carried over from the previous one
+
+        def _flush():
+            nonlocal bin_, size, fresh
+            chunk = ''.join([s for s, _ in bin_])
+            chunks.append(chunk if chunk.endswith('\n') else chunk + '\n')
+            # carry over the trailing sentences which fit into the overlap
+            carry = []
+            for s, t in reversed(bin_):
+                if sum([len(t_) for _, t_ in carry]) + len(t) > overlap:
+                    break
+                carry.insert(0, (s, t))
+            bin_  = carry
+            size  = sum([len(t) for _, t in carry])
+            fresh = False
+
+        for sentence, tokens in sentences:
+            if len(tokens) > budget:
+                if fresh:
+                    _flush()
+                # the sentence alone exceeds the limit, split it on token boundaries
+                step = budget - overlap
+                for i in range(0, len(tokens), step):
+                    chunks.append(tokenizer.decode(tokens[i:i + budget]) + '\n')
+                    if i + budget >= len(tokens):
+                        break
+                bin_, size, fresh = [], 0, False
+                continue
+            if size + len(tokens) > budget:
+                if fresh:
+                    _flush()
+                if size + len(tokens) > budget:
+                    bin_, size = [], 0
+            bin_.append((sentence, tokens))
+            size += len(tokens)
+            fresh = True
+
+        if fresh:
+            _flush()
+        return chunks
+
+    def forward(self, sym: Symbol, *args, **kwargs) -> Symbol:
+        sym = self._to_symbol(sym)
+        return self._to_symbol(self.pack(str(sym.value)))
+
+
 class SentenceFormatter(Expression):
     def __init__(self, value=None):
         super().__init__(value)
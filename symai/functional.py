@@ -1,4 +1,5 @@
 import ast
+import copy
 import inspect
 import os
 import pickle
@@ -8,6 +9,9 @@ import traceback
 from pathlib import Path
 from typing import Callable, Dict, List, Optional
 
+from .backend.batching import current_batch_scheduler
+from .backend.registry import EngineRegistry
+from .backend.streaming import ResponseStream
 from .backend.settings import SYMAI_CONFIG
 from .post_processors import *
 from .pre_processors import *
@@ -15,23 +19,8 @@ from .prompts import Prompt
 from .utils import CustomUserWarning
 
 # global variables
-config                 = SYMAI_CONFIG
-neurosymbolic_engine   = None
-symbolic_engine        = None
-ocr_engine             = None
-vision_engine          = None
-index_engine           = None
-speech_engine          = None
-embedding_engine       = None
-userinput_engine       = None
-search_engine          = None
-crawler_engine         = None
-execute_engine         = None
-file_engine            = None
-output_engine          = None
-imagerendering_engine  = None
-imagecaptioning_engine = None
-finetuning_engine      = None
+config          = SYMAI_CONFIG
+engine_registry = EngineRegistry()
 
 
 class ConstraintViolationException(Exception):
@@ -46,7 +35,32 @@ def _execute_query(engine, post_processors, wrp_self, wrp_params, return_constra
     if 'preview' in wrp_params and wrp_params['preview']:
         return engine.preview(wrp_params)
 
-    outputs  = engine(**wrp_params) # currently only support single query
+    stream    = 'stream' in wrp_params and wrp_params['stream']
+    scheduler = current_batch_scheduler()
+    if scheduler is not None and not stream:
+        outputs = scheduler.submit(engine, wrp_params) # packed with concurrent queries into one engine call
+    else:
+        outputs = engine(**wrp_params) # currently only support single query
+    if stream:
+        return _stream_response(outputs, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs)
+    return _process_response(outputs, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs)
+
+
+async def _aexecute_query(engine, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs) -> List[object]:
+    # build prompt and query engine
+    engine.prepare(args, kwargs, wrp_params)
+
+    # return preview of the command if preview is set
+    if 'preview' in wrp_params and wrp_params['preview']:
+        return engine.preview(wrp_params)
+
+    outputs = await engine.__acall__(**wrp_params) # currently only support single query
+    if 'stream' in wrp_params and wrp_params['stream']:
+        return _stream_response(outputs, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs)
+    return _process_response(outputs, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs)
+
+
+def _process_response(outputs, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs) -> List[object]:
     rsp      = outputs[0][0]
     metadata = outputs[1]
 
@@ -87,15 +101,24 @@ def _execute_query(engine, post_processors, wrp_self, wrp_params, return_constra
     return rsp, metadata
 
 
-def _process_query(engine,
-                   wrp_self,
+def _stream_response(outputs, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs) -> List[object]:
+    metadata = outputs[1]
+
+    # post-processing, type casting and constraints are applied once the full text has been received
+    def _finalize(text):
+        rsp, _ = _process_response(([text], metadata), post_processors, wrp_self, wrp_params, return_constraint, args, kwargs)
+        return _limit_response(rsp, wrp_params, return_constraint)
+
+    return ResponseStream(outputs[0][0], finalize=_finalize), metadata
+
+
+def _prepare_query(wrp_self,
                    func: Callable,
                    prompt: str,
                    examples: Prompt,
                    constraints: List[Callable] = [],
                    default: Optional[object] = None,
                    limit: int = 1,
-                   trials: int = 1,
                    pre_processors: Optional[List[PreProcessor]] = None,
                    post_processors: Optional[List[PostProcessor]] = None,
                    wrp_args = [], wrp_kwargs = {},
@@ -144,39 +167,20 @@ def _process_query(engine,
             suffix += '\n'
     wrp_params['processed_input'] = suffix
 
-    # try run the function
-    try_cnt  = 0
-    while try_cnt < trials:
-        try_cnt += 1
-        try:
-            rsp, metadata = _execute_query(engine, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs)
-            # return preview of the command if preview is set
-            if 'preview' in wrp_params and wrp_params['preview']:
-                return rsp
-        except Exception as e:
-            print(f'ERROR: {str(e)}')
-            traceback.print_exc()
-            if try_cnt < trials:
-                continue # repeat if query unsuccessful
-            # if max retries reached, return default or raise exception
-            # execute default function implementation as fallback
-            f_kwargs = {}
-            f_sig_params = list(sig.parameters)
-            # handle self and kwargs to match function signature
-            if  f_sig_params[0] == 'self':
-                f_sig_params = f_sig_params[1:]
-            # allow for args to be passed in as kwargs
-            if len(kwargs) == 0 and len(args) > 0:
-                for i, arg in enumerate(args):
-                    f_kwargs[f_sig_params[i]] = arg
-            # execute function or method based on self presence
-            rsp = func(wrp_self, *args, **kwargs)
-            # if there is also no default implementation, raise exception
-            if rsp is None and wrp_params['default'] is None:
-                raise e # raise exception if no default and no function implementation
-            elif rsp is None: # return default if there is one
-                rsp = wrp_params['default']
+    return wrp_params, post_processors, sig, return_constraint
 
+
+def _default_response(e, rsp, wrp_params):
+    # if max retries reached, return default or raise exception
+    # if there is also no default implementation, raise exception
+    if rsp is None and wrp_params['default'] is None:
+        raise e # raise exception if no default and no function implementation
+    elif rsp is None: # return default if there is one
+        rsp = wrp_params['default']
+    return rsp
+
+
+def _limit_response(rsp, wrp_params, return_constraint):
     # return based on return type
     try:
         limit_ = wrp_params['limit'] if wrp_params['limit'] is not None else len(rsp)
@@ -199,11 +203,118 @@ def _process_query(engine,
     return rsp
 
 
-def check_or_init_neurosymbolic_func(engine=None):
-    global neurosymbolic_engine
+def _process_query(engine,
+                   wrp_self,
+                   func: Callable,
+                   prompt: str,
+                   examples: Prompt,
+                   constraints: List[Callable] = [],
+                   default: Optional[object] = None,
+                   limit: int = 1,
+                   trials: int = 1,
+                   pre_processors: Optional[List[PreProcessor]] = None,
+                   post_processors: Optional[List[PostProcessor]] = None,
+                   wrp_args = [], wrp_kwargs = {},
+                   args = [], kwargs = {}):
+
+    wrp_params, post_processors, sig, return_constraint = _prepare_query(wrp_self=wrp_self,
+                                                                          func=func,
+                                                                          prompt=prompt,
+                                                                          examples=examples,
+                                                                          constraints=constraints,
+                                                                          default=default,
+                                                                          limit=limit,
+                                                                          pre_processors=pre_processors,
+                                                                          post_processors=post_processors,
+                                                                          wrp_args=wrp_args,
+                                                                          wrp_kwargs=wrp_kwargs,
+                                                                          args=args,
+                                                                          kwargs=kwargs)
+
+    # try run the function
+    try_cnt  = 0
+    while try_cnt < trials:
+        try_cnt += 1
+        try:
+            rsp, metadata = _execute_query(engine, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs)
+            # return preview of the command if preview is set
+            if 'preview' in wrp_params and wrp_params['preview']:
+                return rsp
+            # errors of a streamed response surface while it is consumed and are not retried
+            if isinstance(rsp, ResponseStream):
+                return rsp
+        except Exception as e:
+            print(f'ERROR: {str(e)}')
+            traceback.print_exc()
+            if try_cnt < trials:
+                continue # repeat if query unsuccessful
+            # execute default function implementation as fallback
+            rsp = func(wrp_self, *args, **kwargs)
+            rsp = _default_response(e, rsp, wrp_params)
+
+    return _limit_response(rsp, wrp_params, return_constraint)
+
+
+async def _aprocess_query(engine,
+                          wrp_self,
+                          func: Callable,
+                          prompt: str,
+                          examples: Prompt,
+                          constraints: List[Callable] = [],
+                          default: Optional[object] = None,
+                          limit: int = 1,
+                          trials: int = 1,
+                          pre_processors: Optional[List[PreProcessor]] = None,
+                          post_processors: Optional[List[PostProcessor]] = None,
+                          wrp_args = [], wrp_kwargs = {},
+                          args = [], kwargs = {}):
+
+    wrp_params, post_processors, sig, return_constraint = _prepare_query(wrp_self=wrp_self,
+                                                                          func=func,
+                                                                          prompt=prompt,
+                                                                          examples=examples,
+                                                                          constraints=constraints,
+                                                                          default=default,
+                                                                          limit=limit,
+                                                                          pre_processors=pre_processors,
+                                                                          post_processors=post_processors,
+                                                                          wrp_args=wrp_args,
+                                                                          wrp_kwargs=wrp_kwargs,
+                                                                          args=args,
+                                                                          kwargs=kwargs)
+
+    # try run the function
+    try_cnt  = 0
+    while try_cnt < trials:
+        try_cnt += 1
+        try:
+            rsp, metadata = await _aexecute_query(engine, post_processors, wrp_self, wrp_params, return_constraint, args, kwargs)
+            # return preview of the command if preview is set
+            if 'preview' in wrp_params and wrp_params['preview']:
+                return rsp
+            # errors of a streamed response surface while it is consumed and are not retried
+            if isinstance(rsp, ResponseStream):
+                return rsp
+        except Exception as e:
+            print(f'ERROR: {str(e)}')
+            traceback.print_exc()
+            if try_cnt < trials:
+                continue # repeat if query unsuccessful
+            # execute default function or coroutine implementation as fallback
+            rsp = func(wrp_self, *args, **kwargs)
+            if inspect.isawaitable(rsp):
+                rsp = await rsp
+            rsp = _default_response(e, rsp, wrp_params)
+
+    return _limit_response(rsp, wrp_params, return_constraint)
+
+
+def check_or_init_neurosymbolic_func(engine = None):
     if engine is not None:
-        neurosymbolic_engine = engine
-    elif neurosymbolic_engine is None:
+        engine_registry.register('neurosymbolic', engine)
+        return engine
+
+    def _init():
         config['NEUROSYMBOLIC_ENGINE_MODEL'] = config['NEUROSYMBOLIC_ENGINE_MODEL'].strip()
         if config['NEUROSYMBOLIC_ENGINE_MODEL'].startswith('text-') or \
             config['NEUROSYMBOLIC_ENGINE_MODEL'].startswith('davinci') or \
@@ -211,13 +322,15 @@ def check_or_init_neurosymbolic_func(engine=None):
                     config['NEUROSYMBOLIC_ENGINE_MODEL'].startswith('babbage') or \
                         config['NEUROSYMBOLIC_ENGINE_MODEL'].startswith('ada'):
             from .backend.engine_gptX_completion import GPTXCompletionEngine
-            neurosymbolic_engine = GPTXCompletionEngine()
+            return GPTXCompletionEngine()
         elif config['NEUROSYMBOLIC_ENGINE_MODEL'].startswith('gpt-'):
             from .backend.engine_gptX_chat import GPTXChatEngine
-            neurosymbolic_engine = GPTXChatEngine()
+            return GPTXChatEngine()
         else:
             raise Exception(f'Unknown neurosymbolic engine model: {config["NEUROSYMBOLIC_ENGINE_MODEL"]}')
 
+    return engine_registry.get('neurosymbolic', _init)
+
 
 def few_shot_func(wrp_self,
                   func: Callable,
@@ -231,8 +344,8 @@ def few_shot_func(wrp_self,
                   post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
                   wrp_args = [], wrp_kwargs = [],
                   args = [], kwargs = []):
-    check_or_init_neurosymbolic_func()
-    return _process_query(engine=neurosymbolic_engine,
+    engine = check_or_init_neurosymbolic_func()
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -249,13 +362,46 @@ def few_shot_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def afew_shot_func(wrp_self,
+                         func: Callable,
+                         prompt: str,
+                         examples: Prompt,
+                         constraints: List[Callable] = [],
+                         default: Optional[object] = None,
+                         limit: int = 1,
+                         trials: int = 1,
+                         pre_processors: Optional[List[PreProcessor]] = None,
+                         post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
+                         wrp_args = [], wrp_kwargs = [],
+                         args = [], kwargs = []):
+    engine = check_or_init_neurosymbolic_func()
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=examples,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=limit,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_symbolic_func(engine = None):
-    global symbolic_engine
     if engine is not None:
-        symbolic_engine = engine
-    elif symbolic_engine is None:
+        engine_registry.register('symbolic', engine)
+        return engine
+
+    def _init():
         from .backend.engine_wolframalpha import WolframAlphaEngine
-        symbolic_engine = WolframAlphaEngine()
+        return WolframAlphaEngine()
+
+    return engine_registry.get('symbolic', _init)
 
 
 def symbolic_func(wrp_self,
@@ -270,8 +416,8 @@ def symbolic_func(wrp_self,
                   post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
                   wrp_args = [], wrp_kwargs = [],
                   args = [], kwargs = []):
-    check_or_init_symbolic_func()
-    return _process_query(engine=symbolic_engine,
+    engine = check_or_init_symbolic_func()
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -288,13 +434,46 @@ def symbolic_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def asymbolic_func(wrp_self,
+                         func: Callable,
+                         prompt: str,
+                         examples: Prompt,
+                         constraints: List[Callable] = [],
+                         default: Optional[object] = None,
+                         limit: int = 1,
+                         trials: int = 1,
+                         pre_processors: Optional[List[PreProcessor]] = None,
+                         post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
+                         wrp_args = [], wrp_kwargs = [],
+                         args = [], kwargs = []):
+    engine = check_or_init_symbolic_func()
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=examples,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=limit,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_search_func(engine = None):
-    global search_engine
     if engine is not None:
-        search_engine = engine
-    elif search_engine is None:
+        engine_registry.register('search', engine)
+        return engine
+
+    def _init():
         from .backend.engine_google import GoogleEngine
-        search_engine = GoogleEngine()
+        return GoogleEngine()
+
+    return engine_registry.get('search', _init)
 
 
 def search_func(wrp_self,
@@ -308,9 +487,9 @@ def search_func(wrp_self,
                 post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
                 wrp_args = [], wrp_kwargs = [],
                 args = [], kwargs = []):
-    check_or_init_search_func()
+    engine = check_or_init_search_func()
     wrp_kwargs['query'] = query
-    return _process_query(engine=search_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=query,
@@ -327,13 +506,46 @@ def search_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def asearch_func(wrp_self,
+                       func: Callable,
+                       query: str,
+                       constraints: List[Callable] = [],
+                       default: Optional[object] = None,
+                       limit: int = 1,
+                       trials: int = 1,
+                       pre_processors: Optional[List[PreProcessor]] = None,
+                       post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
+                       wrp_args = [], wrp_kwargs = [],
+                       args = [], kwargs = []):
+    engine = check_or_init_search_func()
+    wrp_kwargs['query'] = query
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=query,
+                                 examples=None,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=limit,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_open_func(engine = None):
-    global file_engine
     if engine is not None:
-        file_engine = engine
-    elif file_engine is None:
+        engine_registry.register('open', engine)
+        return engine
+
+    def _init():
         from .backend.engine_file import FileEngine
-        file_engine = FileEngine()
+        return FileEngine()
+
+    return engine_registry.get('open', _init)
 
 
 def open_func(wrp_self,
@@ -347,9 +559,9 @@ def open_func(wrp_self,
               post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
               wrp_args = [], wrp_kwargs = [],
               args = [], kwargs = []):
-    check_or_init_open_func()
+    engine = check_or_init_open_func()
     wrp_kwargs['path'] = path
-    return _process_query(engine=file_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=path,
@@ -366,13 +578,46 @@ def open_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aopen_func(wrp_self,
+                     func: Callable,
+                     path: str,
+                     constraints: List[Callable] = [],
+                     default: Optional[object] = None,
+                     limit: Optional[int] = None,
+                     trials: int = 1,
+                     pre_processors: Optional[List[PreProcessor]] = None,
+                     post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
+                     wrp_args = [], wrp_kwargs = [],
+                     args = [], kwargs = []):
+    engine = check_or_init_open_func()
+    wrp_kwargs['path'] = path
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=path,
+                                 examples=None,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=limit,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_output_func(engine = None):
-    global output_engine
     if engine is not None:
-        output_engine = engine
-    elif output_engine is None:
+        engine_registry.register('output', engine)
+        return engine
+
+    def _init():
         from .backend.engine_output import OutputEngine
-        output_engine = OutputEngine()
+        return OutputEngine()
+
+    return engine_registry.get('output', _init)
 
 
 def output_func(wrp_self,
@@ -384,8 +629,8 @@ def output_func(wrp_self,
                 post_processors: Optional[List[PostProcessor]] = [ConsolePostProcessor()],
                 wrp_args = [], wrp_kwargs = [],
                 args = [], kwargs = []):
-    check_or_init_output_func()
-    return _process_query(engine=output_engine,
+    engine = check_or_init_output_func()
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=None,
@@ -402,13 +647,43 @@ def output_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aoutput_func(wrp_self,
+                       func: Callable,
+                       constraints: List[Callable] = [],
+                       default: Optional[object] = None,
+                       trials: int = 1,
+                       pre_processors: List[PreProcessor] = [ConsolePreProcessor()],
+                       post_processors: Optional[List[PostProcessor]] = [ConsolePostProcessor()],
+                       wrp_args = [], wrp_kwargs = [],
+                       args = [], kwargs = []):
+    engine = check_or_init_output_func()
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=None,
+                                 examples=None,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_crawler_func(engine = None):
-    global crawler_engine
     if engine is not None:
-        crawler_engine = engine
-    elif crawler_engine is None:
+        engine_registry.register('crawler', engine)
+        return engine
+
+    def _init():
         from .backend.engine_crawler import CrawlerEngine
-        crawler_engine = CrawlerEngine()
+        return CrawlerEngine()
+
+    return engine_registry.get('crawler', _init)
 
 
 def crawler_func(wrp_self,
@@ -423,10 +698,10 @@ def crawler_func(wrp_self,
                  post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
                  wrp_args = [], wrp_kwargs = [],
                  args = [], kwargs = []):
-    check_or_init_crawler_func()
+    engine = check_or_init_crawler_func()
     wrp_kwargs['url'] = url
     wrp_kwargs['pattern'] = pattern
-    return _process_query(engine=crawler_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=None,
@@ -443,13 +718,48 @@ def crawler_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def acrawler_func(wrp_self,
+                        func: Callable,
+                        url: str,
+                        pattern: str,
+                        constraints: List[Callable] = [],
+                        default: Optional[object] = None,
+                        limit: int = 1,
+                        trials: int = 1,
+                        pre_processors: Optional[List[PreProcessor]] = None,
+                        post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
+                        wrp_args = [], wrp_kwargs = [],
+                        args = [], kwargs = []):
+    engine = check_or_init_crawler_func()
+    wrp_kwargs['url'] = url
+    wrp_kwargs['pattern'] = pattern
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=None,
+                                 examples=None,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=limit,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_userinput_func(engine = None):
-    global userinput_engine
     if engine is not None:
-        userinput_engine = engine
-    elif userinput_engine is None:
+        engine_registry.register('userinput', engine)
+        return engine
+
+    def _init():
         from .backend.engine_userinput import UserInputEngine
-        userinput_engine = UserInputEngine()
+        return UserInputEngine()
+
+    return engine_registry.get('userinput', _init)
 
 
 def userinput_func(wrp_self,
@@ -462,8 +772,8 @@ def userinput_func(wrp_self,
                    post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
                    wrp_args = [], wrp_kwargs = [],
                    args = [], kwargs = []):
-    check_or_init_userinput_func()
-    return _process_query(engine=userinput_engine,
+    engine = check_or_init_userinput_func()
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -480,13 +790,44 @@ def userinput_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def auserinput_func(wrp_self,
+                          func: Callable,
+                          prompt: Optional[str] = None,
+                          constraints: List[Callable] = [],
+                          default: Optional[object] = None,
+                          trials: int = 1,
+                          pre_processors: Optional[List[PreProcessor]] = None,
+                          post_processors: Optional[List[PostProcessor]] = [StripPostProcessor()],
+                          wrp_args = [], wrp_kwargs = [],
+                          args = [], kwargs = []):
+    engine = check_or_init_userinput_func()
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=None,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_execute_func(engine = None):
-    global execute_engine
     if engine is not None:
-        execute_engine = engine
-    elif execute_engine is None:
+        engine_registry.register('execute', engine)
+        return engine
+
+    def _init():
         from .backend.engine_python import PythonEngine
-        execute_engine = PythonEngine()
+        return PythonEngine()
+
+    return engine_registry.get('execute', _init)
 
 
 def execute_func(wrp_self,
@@ -499,8 +840,8 @@ def execute_func(wrp_self,
                  post_processors: Optional[List[PostProcessor]] = [],
                  wrp_args = [], wrp_kwargs = [],
                  args = [], kwargs = []):
-    check_or_init_execute_func()
-    return _process_query(engine=execute_engine,
+    engine = check_or_init_execute_func()
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=code,
@@ -517,13 +858,44 @@ def execute_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aexecute_func(wrp_self,
+                        code: str,
+                        func: Callable,
+                        constraints: List[Callable] = [],
+                        default: Optional[object] = None,
+                        trials: int = 1,
+                        pre_processors: List[PreProcessor] = [],
+                        post_processors: Optional[List[PostProcessor]] = [],
+                        wrp_args = [], wrp_kwargs = [],
+                        args = [], kwargs = []):
+    engine = check_or_init_execute_func()
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=code,
+                                 examples=None,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_embedding_func(engine = None):
-    global embedding_engine
     if engine is not None:
-        embedding_engine = engine
-    elif embedding_engine is None:
+        engine_registry.register('embedding', engine)
+        return engine
+
+    def _init():
         from .backend.engine_embedding import EmbeddingEngine
-        embedding_engine = EmbeddingEngine()
+        return EmbeddingEngine()
+
+    return engine_registry.get('embedding', _init)
 
 
 def embed_func(wrp_self,
@@ -534,9 +906,9 @@ def embed_func(wrp_self,
                post_processors: Optional[List[PostProcessor]] = None,
                wrp_args = [], wrp_kwargs = [],
                args = [], kwargs = []):
-    check_or_init_embedding_func()
+    engine = check_or_init_embedding_func()
     wrp_kwargs['entries'] = entries
-    return _process_query(engine=embedding_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=None,
@@ -553,13 +925,43 @@ def embed_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aembed_func(wrp_self,
+                      entries: List[str],
+                      func: Callable,
+                      trials: int = 1,
+                      pre_processors: Optional[List[PreProcessor]] = None,
+                      post_processors: Optional[List[PostProcessor]] = None,
+                      wrp_args = [], wrp_kwargs = [],
+                      args = [], kwargs = []):
+    engine = check_or_init_embedding_func()
+    wrp_kwargs['entries'] = entries
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=None,
+                                 examples=None,
+                                 constraints=[],
+                                 default=None,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_imagerendering_func(engine = None):
-    global imagerendering_engine
     if engine is not None:
-        imagerendering_engine = engine
-    elif imagerendering_engine is None:
+        engine_registry.register('imagerendering', engine)
+        return engine
+
+    def _init():
         from .backend.engine_imagerendering import ImageRenderingEngine
-        imagerendering_engine = ImageRenderingEngine()
+        return ImageRenderingEngine()
+
+    return engine_registry.get('imagerendering', _init)
 
 
 def imagerendering_func(wrp_self,
@@ -571,9 +973,9 @@ def imagerendering_func(wrp_self,
                         post_processors: Optional[List[PostProcessor]] = None,
                         wrp_args = [], wrp_kwargs = [],
                         args = [], kwargs = []):
-    check_or_init_imagerendering_func()
+    engine = check_or_init_imagerendering_func()
     wrp_kwargs['operation'] = operation
-    return _process_query(engine=imagerendering_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -590,13 +992,44 @@ def imagerendering_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aimagerendering_func(wrp_self,
+                               func: Callable,
+                               operation: str = 'create',
+                               prompt: str = '',
+                               trials: int = 1,
+                               pre_processors: Optional[List[PreProcessor]] = None,
+                               post_processors: Optional[List[PostProcessor]] = None,
+                               wrp_args = [], wrp_kwargs = [],
+                               args = [], kwargs = []):
+    engine = check_or_init_imagerendering_func()
+    wrp_kwargs['operation'] = operation
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=None,
+                                 constraints=[],
+                                 default=None,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_imagecaptioning_func(engine = None):
-    global imagecaptioning_engine
     if engine is not None:
-        imagecaptioning_engine = engine
-    elif imagecaptioning_engine is None:
+        engine_registry.register('imagecaptioning', engine)
+        return engine
+
+    def _init():
         from .backend.engine_blip2 import Blip2Engine
-        imagecaptioning_engine = Blip2Engine()
+        return Blip2Engine()
+
+    return engine_registry.get('imagecaptioning', _init)
 
 
 def imagecaptioning_func(wrp_self,
@@ -608,9 +1041,9 @@ def imagecaptioning_func(wrp_self,
                          post_processors: Optional[List[PostProcessor]] = None,
                          wrp_args = [], wrp_kwargs = [],
                          args = [], kwargs = []):
-    check_or_init_imagecaptioning_func()
+    engine = check_or_init_imagecaptioning_func()
     wrp_kwargs['image'] = image
-    return _process_query(engine=imagecaptioning_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -627,13 +1060,44 @@ def imagecaptioning_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aimagecaptioning_func(wrp_self,
+                                func: Callable,
+                                prompt: str,
+                                image: str,
+                                trials: int = 1,
+                                pre_processors: Optional[List[PreProcessor]] = None,
+                                post_processors: Optional[List[PostProcessor]] = None,
+                                wrp_args = [], wrp_kwargs = [],
+                                args = [], kwargs = []):
+    engine = check_or_init_imagecaptioning_func()
+    wrp_kwargs['image'] = image
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=None,
+                                 constraints=[],
+                                 default=None,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_finetuning_func(engine = None):
-    global finetuning_engine
     if engine is not None:
-        finetuning_engine = engine
-    elif finetuning_engine is None:
+        engine_registry.register('finetuning', engine)
+        return engine
+
+    def _init():
         from .backend.engine_gptfinetuner import GPTFineTuner
-        finetuning_engine = GPTFineTuner()
+        return GPTFineTuner()
+
+    return engine_registry.get('finetuning', _init)
 
 
 def finetuning_func(wrp_self,
@@ -644,8 +1108,8 @@ def finetuning_func(wrp_self,
                     post_processors: Optional[List[PostProcessor]] = None,
                     wrp_args = [], wrp_kwargs = [],
                     args = [], kwargs = []):
-    check_or_init_finetuning_func()
-    return _process_query(engine=finetuning_engine,
+    engine = check_or_init_finetuning_func()
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -662,13 +1126,42 @@ def finetuning_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def afinetuning_func(wrp_self,
+                           func: Callable,
+                           prompt: str = '',
+                           trials: int = 1,
+                           pre_processors: Optional[List[PreProcessor]] = None,
+                           post_processors: Optional[List[PostProcessor]] = None,
+                           wrp_args = [], wrp_kwargs = [],
+                           args = [], kwargs = []):
+    engine = check_or_init_finetuning_func()
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=None,
+                                 constraints=[],
+                                 default=None,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_ocr_func(engine = None):
-    global ocr_engine
     if engine is not None:
-        ocr_engine = engine
-    elif ocr_engine is None:
+        engine_registry.register('ocr', engine)
+        return engine
+
+    def _init():
         from .backend.engine_ocr import OCREngine
-        ocr_engine = OCREngine()
+        return OCREngine()
+
+    return engine_registry.get('ocr', _init)
 
 
 def ocr_func(wrp_self,
@@ -679,9 +1172,9 @@ def ocr_func(wrp_self,
              post_processors: Optional[List[PostProcessor]] = None,
              wrp_args = [], wrp_kwargs = [],
              args = [], kwargs = []):
-    check_or_init_ocr_func()
+    engine = check_or_init_ocr_func()
     wrp_kwargs['image'] = image
-    return _process_query(engine=ocr_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=None,
@@ -698,13 +1191,43 @@ def ocr_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aocr_func(wrp_self,
+                    image: str,
+                    func: Callable,
+                    trials: int = 1,
+                    pre_processors: Optional[List[PreProcessor]] = None,
+                    post_processors: Optional[List[PostProcessor]] = None,
+                    wrp_args = [], wrp_kwargs = [],
+                    args = [], kwargs = []):
+    engine = check_or_init_ocr_func()
+    wrp_kwargs['image'] = image
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=None,
+                                 examples=None,
+                                 constraints=[],
+                                 default=None,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_vision_func(engine = None):
-    global vision_engine
     if engine is not None:
-        vision_engine = engine
-    elif vision_engine is None:
+        engine_registry.register('vision', engine)
+        return engine
+
+    def _init():
         from .backend.engine_clip import CLIPEngine
-        vision_engine = CLIPEngine()
+        return CLIPEngine()
+
+    return engine_registry.get('vision', _init)
 
 
 def vision_func(wrp_self,
@@ -716,9 +1239,9 @@ def vision_func(wrp_self,
                 post_processors: Optional[List[PostProcessor]] = None,
                 wrp_args = [], wrp_kwargs = [],
                 args = [], kwargs = []):
-    check_or_init_vision_func()
+    engine = check_or_init_vision_func()
     wrp_kwargs['image'] = image
-    return _process_query(engine=vision_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -735,13 +1258,61 @@ def vision_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def avision_func(wrp_self,
+                       func: Callable,
+                       image: Optional[str] = None,
+                       prompt: Optional[str] = None,
+                       trials: int = 1,
+                       pre_processors: Optional[List[PreProcessor]] = None,
+                       post_processors: Optional[List[PostProcessor]] = None,
+                       wrp_args = [], wrp_kwargs = [],
+                       args = [], kwargs = []):
+    engine = check_or_init_vision_func()
+    wrp_kwargs['image'] = image
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=None,
+                                 constraints=[],
+                                 default=None,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_index_func(engine = None):
-    global index_engine
     if engine is not None:
-        index_engine = engine
-    elif index_engine is None:
-        from .backend.engine_pinecone import IndexEngine
-        index_engine = IndexEngine()
+        engine_registry.register('index', engine)
+        return engine
+
+    return engine_registry.get('index', init_index_engine)
+
+
+def init_index_engine(**kwargs):
+    '''
+    Creates the configured vector index engine. `INDEXING_ENGINE` selects between `pinecone` and the in-process `local`
+    engine; if it is not set, Pinecone is used when an API key is configured and the local engine otherwise.
+    '''
+    from .backend.settings import SYMAI_CONFIG
+    from .backend import engine_pinecone
+
+    engine = SYMAI_CONFIG.get('INDEXING_ENGINE', None)
+    if engine is None:
+        has_key = bool(SYMAI_CONFIG.get('INDEXING_ENGINE_API_KEY', None))
+        engine  = 'pinecone' if has_key and engine_pinecone.pinecone is not None else 'local'
+
+    if engine == 'local':
+        from .backend.engine_local_index import LocalIndexEngine
+        return LocalIndexEngine(**kwargs)
+    if engine == 'pinecone':
+        return engine_pinecone.IndexEngine(**kwargs)
+    raise ValueError(f'Unknown indexing engine: {engine}')
 
 
 def index_func(wrp_self,
@@ -755,9 +1326,9 @@ def index_func(wrp_self,
                post_processors: Optional[List[PostProcessor]] = None,
                wrp_args = [], wrp_kwargs = [],
                args = [], kwargs = []):
-    check_or_init_index_func()
+    engine = check_or_init_index_func()
     wrp_kwargs['operation'] = operation
-    return _process_query(engine=index_engine,
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -774,13 +1345,46 @@ def index_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aindex_func(wrp_self,
+                      func: Callable,
+                      prompt: str,
+                      operation: str,
+                      default: Optional[str] = None,
+                      constraints: List[Callable] = [],
+                      trials: int = 1,
+                      pre_processors: Optional[List[PreProcessor]] = None,
+                      post_processors: Optional[List[PostProcessor]] = None,
+                      wrp_args = [], wrp_kwargs = [],
+                      args = [], kwargs = []):
+    engine = check_or_init_index_func()
+    wrp_kwargs['operation'] = operation
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=None,
+                                 constraints=constraints,
+                                 default=default,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
 def check_or_init_speech_func(engine = None):
-    global speech_engine
     if engine is not None:
-        speech_engine = engine
-    elif speech_engine is None:
+        engine_registry.register('speech', engine)
+        return engine
+
+    def _init():
         from .backend.engine_speech import WhisperEngine
-        speech_engine = WhisperEngine()
+        return WhisperEngine()
+
+    return engine_registry.get('speech', _init)
 
 
 def speech_func(wrp_self,
@@ -791,8 +1395,8 @@ def speech_func(wrp_self,
                 post_processors: Optional[List[PostProcessor]] = None,
                 wrp_args = [], wrp_kwargs = [],
                 args = [], kwargs = []):
-    check_or_init_speech_func()
-    return _process_query(engine=speech_engine,
+    engine = check_or_init_speech_func()
+    return _process_query(engine=engine,
                           wrp_self=wrp_self,
                           func=func,
                           prompt=prompt,
@@ -809,9 +1413,59 @@ def speech_func(wrp_self,
                           kwargs=kwargs)
 
 
+async def aspeech_func(wrp_self,
+                       func: Callable,
+                       trials: int = 1,
+                       prompt='decode',
+                       pre_processors: Optional[List[PreProcessor]] = None,
+                       post_processors: Optional[List[PostProcessor]] = None,
+                       wrp_args = [], wrp_kwargs = [],
+                       args = [], kwargs = []):
+    engine = check_or_init_speech_func()
+    return await _aprocess_query(engine=engine,
+                                 wrp_self=wrp_self,
+                                 func=func,
+                                 prompt=prompt,
+                                 examples=None,
+                                 constraints=[],
+                                 default=None,
+                                 limit=None,
+                                 trials=trials,
+                                 pre_processors=pre_processors,
+                                 post_processors=post_processors,
+                                 wrp_args=wrp_args,
+                                 wrp_kwargs=wrp_kwargs,
+                                 args=args,
+                                 kwargs=kwargs)
+
+
+_engine_initializers = {
+    'neurosymbolic':   check_or_init_neurosymbolic_func,
+    'symbolic':        check_or_init_symbolic_func,
+    'ocr':             check_or_init_ocr_func,
+    'vision':          check_or_init_vision_func,
+    'speech':          check_or_init_speech_func,
+    'embedding':       check_or_init_embedding_func,
+    'userinput':       check_or_init_userinput_func,
+    'search':          check_or_init_search_func,
+    'crawler':         check_or_init_crawler_func,
+    'execute':         check_or_init_execute_func,
+    'index':           check_or_init_index_func,
+    'open':            check_or_init_open_func,
+    'output':          check_or_init_output_func,
+    'imagerendering':  check_or_init_imagerendering_func,
+    'imagecaptioning': check_or_init_imagecaptioning_func,
+    'finetuning':      check_or_init_finetuning_func
+}
+# engines which are configured by `command(engines=['all'])`
+_command_all_engines = ['neurosymbolic', 'symbolic', 'ocr', 'vision', 'speech', 'embedding', 'userinput',
+                        'search', 'crawler', 'execute', 'index', 'open', 'output', 'imagerendering']
+
+
 def command_func(wrp_self,
                  func: Callable,
                  engines: List[str] = ['all'],
+                 scoped: bool = False,
                  wrp_kwargs = [],
                  kwargs = []):
     # prepare wrapper parameters
@@ -822,85 +1476,31 @@ def command_func(wrp_self,
         **wrp_kwargs
     }
 
-    if 'all' in engines or 'neurosymbolic' in engines:
-        check_or_init_neurosymbolic_func()
-        neurosymbolic_engine.command(wrp_params)
-    if 'all' in engines or 'symbolic' in engines:
-        check_or_init_symbolic_func()
-        symbolic_engine.command(wrp_params)
-    if 'all' in engines or 'ocr' in engines:
-        check_or_init_ocr_func()
-        ocr_engine.command(wrp_params)
-    if 'all' in engines or 'vision' in engines:
-        check_or_init_vision_func()
-        vision_engine.command(wrp_params)
-    if 'all' in engines or 'speech' in engines:
-        check_or_init_speech_func()
-        speech_engine.command(wrp_params)
-    if 'all' in engines or 'embedding' in engines:
-        check_or_init_embedding_func()
-        embedding_engine.command(wrp_params)
-    if 'all' in engines or 'userinput' in engines:
-        check_or_init_userinput_func()
-        userinput_engine.command(wrp_params)
-    if 'all' in engines or 'search' in engines:
-        check_or_init_search_func()
-        search_engine.command(wrp_params)
-    if 'all' in engines or 'crawler' in engines:
-        check_or_init_crawler_func()
-        crawler_engine.command(wrp_params)
-    if 'all' in engines or 'execute' in engines:
-        check_or_init_execute_func()
-        execute_engine.command(wrp_params)
-    if 'all' in engines or 'index' in engines:
-        check_or_init_index_func()
-        execute_engine.command(wrp_params)
-    if 'all' in engines or 'open' in engines:
-        check_or_init_open_func()
-        file_engine.command(wrp_params)
-    if 'all' in engines or 'output' in engines:
-        check_or_init_output_func()
-        output_engine.command(wrp_params)
-    if 'all' in engines or 'imagerendering' in engines:
-        check_or_init_imagerendering_func()
-        imagerendering_engine.command(wrp_params)
+    names  = _command_all_engines if 'all' in engines else [name for name in _engine_initializers if name in engines]
+    scope  = {}
+    for name in names:
+        engine = _engine_initializers[name]()
+        if scoped:
+            # configure a copy which is only visible within the returned scope
+            engine = copy.copy(engine)
+            scope[name] = engine
+        engine.command(wrp_params)
+
+    return engine_registry.scope(scope) if scoped else None
 
 
 def setup_func(wrp_self,
                func: Callable,
                engines: Dict[str, Any],
+               scoped: bool = False,
                wrp_kwargs = [],
                kwargs = []):
-    if 'neurosymbolic' in engines:
-        check_or_init_neurosymbolic_func(engine=engines['neurosymbolic'])
-    if 'symbolic' in engines:
-        check_or_init_symbolic_func(engine=engines['symbolic'])
-    if 'ocr' in engines:
-        check_or_init_ocr_func(engine=engines['ocr'])
-    if 'vision' in engines:
-        check_or_init_vision_func(engine=engines['vision'])
-    if 'speech' in engines:
-        check_or_init_speech_func(engine=engines['speech'])
-    if 'embedding' in engines:
-        check_or_init_embedding_func(engine=engines['embedding'])
-    if 'userinput' in engines:
-        check_or_init_userinput_func(engine=engines['userinput'])
-    if 'search' in engines:
-        check_or_init_search_func(engine=engines['search'])
-    if 'crawler' in engines:
-        check_or_init_crawler_func(engine=engines['crawler'])
-    if 'execute' in engines:
-        check_or_init_execute_func(engine=engines['execute'])
-    if 'index' in engines:
-        check_or_init_index_func(engine=engines['index'])
-    if 'open' in engines:
-        check_or_init_open_func(engine=engines['open'])
-    if 'output' in engines:
-        check_or_init_output_func(engine=engines['output'])
-    if 'imagerendering' in engines:
-        check_or_init_imagerendering_func(engine=engines['imagerendering'])
-    if 'imagecaptioning' in engines:
-        check_or_init_imagecaptioning_func(engine=engines['imagecaptioning'])
+    if scoped:
+        return engine_registry.scope({name: engine for name, engine in engines.items() if name in _engine_initializers})
+
+    for name, engine in engines.items():
+        if name in _engine_initializers:
+            _engine_initializers[name](engine=engine)
 
 
 def cache_registry_func(
@@ -929,117 +1529,14 @@ def bind_registry_func(
         engine: str,
         property: str
     ):
-    if engine == 'neurosymbolic':
-        check_or_init_neurosymbolic_func()
-        if property not in neurosymbolic_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in neurosymbolic engine, returning "None"')
-
-        return neurosymbolic_engine.__dict__.get(property)
-
-    if engine == 'symbolic':
-        check_or_init_symbolic_func()
-        if property not in symbolic_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in symbolic engine, returning "None"')
-
-        return symbolic_engine.__dict__.get(property)
-
-    if engine == 'ocr':
-        check_or_init_ocr_func()
-        if property not in ocr_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in ocr engine, returning "None"')
-
-        return ocr_engine.__dict__.get(property)
-
-    if engine == 'vision':
-        check_or_init_vision_func()
-        if property not in vision_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in vision engine, returning "None"')
-
-        return vision_engine.__dict__.get(property)
-
-    if engine == 'speech':
-        check_or_init_speech_func()
-        if property not in speech_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in speech engine, returning "None"')
-
-        return speech_engine.__dict__.get(property)
-
-    if engine == 'embedding':
-        check_or_init_embedding_func()
-        if property not in embedding_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in embedding engine, returning "None"')
-
-        return embedding_engine.__dict__.get(property)
-
-    if engine == 'userinput':
-        check_or_init_userinput_func()
-        if property not in userinput_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in userinput engine, returning "None"')
-
-        return userinput_engine.__dict__.get(property)
-
-    if engine == 'search':
-        check_or_init_search_func()
-        if property not in search_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in search engine, returning "None"')
-
-        return search_engine.__dict__.get(property)
-
-    if engine == 'crawler':
-        check_or_init_crawler_func()
-        if property not in crawler_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in crawler engine, returning "None"')
-
-        return crawler_engine.__dict__.get(property)
-
-    if engine == 'execute':
-        check_or_init_execute_func()
-        if property not in execute_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in execute engine, returning "None"')
-
-        return execute_engine.__dict__.get(property)
-
-    if engine == 'index':
-        check_or_init_index_func()
-        if property not in index_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in index engine, returning "None"')
-
-        return index_engine.__dict__.get(property)
-
-    if engine == 'open':
-        check_or_init_open_func()
-        if property not in file_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in open engine, returning "None"')
-
-        return file_engine.__dict__.get(property)
-
-    if engine == 'output':
-        check_or_init_output_func()
-        if property not in output_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in output engine, returning "None"')
-
-        return output_engine.__dict__.get(property)
-
-    if engine == 'imagerendering':
-        check_or_init_imagerendering_func()
-        if property not in imagerendering_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in imagerendering engine, returning "None"')
-
-        return imagerendering_engine.__dict__.get(property)
-
-    if engine == 'imagecaptioning':
-        check_or_init_imagecaptioning_func()
-        if property not in imagecaptioning_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in imagecaptioning engine, returning "None"')
-
-        return imagecaptioning_engine.__dict__.get(property)
+    if engine not in _engine_initializers:
+        return None
 
-    if engine == 'finetuning':
-        check_or_init_finetuning_func()
-        if property not in finetuning_engine.__dict__:
-            CustomUserWarning(f'Property "{property}" not found in finetuning engine, returning "None"')
+    engine_ = _engine_initializers[engine]()
+    if property not in engine_.__dict__:
+        CustomUserWarning(f'Property "{property}" not found in {engine} engine, returning "None"')
 
-        return finetuning_engine.__dict__.get(property)
+    return engine_.__dict__.get(property)
 
 
 def retry_func(
@@ -0,0 +1,191 @@
+import contextvars
+import hashlib
+import json
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .symbol import Expression, Symbol
+
+
+class LazySymbol:
+    '''
+    A pending operation in a LazyGraph. Calling a Symbol primitive or operator on a LazySymbol does not query an engine
+    but returns a new LazySymbol which depends on it; the values are only computed by `evaluate`.
+    Since operators such as `==` return LazySymbols, a LazySymbol has no truth value and is hashed by identity.
+    '''
+    def __init__(self, graph: 'LazyGraph', key: str, op: Optional[str], args: tuple, kwargs: Dict[str, Any]):
+        self.graph  = graph
+        self.key    = key
+        self.op     = op
+        self.args   = args
+        self.kwargs = kwargs
+        self.done   = op is None
+        self.result = args[0] if op is None else None
+
+    @property
+    def dependencies(self) -> List['LazySymbol']:
+        deps = [a for a in list(self.args) + list(self.kwargs.values()) if isinstance(a, LazySymbol)]
+        return list({d.key: d for d in deps}.values())
+
+    @property
+    def value(self) -> Any:
+        res = self.evaluate()
+        return res.value if isinstance(res, Symbol) else res
+
+    def evaluate(self) -> Any:
+        '''
+        Computes the value of this node and of all pending nodes it depends on.
+        '''
+        return self.graph.evaluate(self)[0]
+
+    def apply(self, expr: Callable, *args, **kwargs) -> 'LazySymbol':
+        '''
+        Defers `expr(symbol, *args, **kwargs)`, e.g. for an Expression or a Function. Calls of the same expression
+        object on the same inputs are computed only once.
+        '''
+        return self.graph.node('__apply__', (self, expr) + args, kwargs)
+
+    def __getattr__(self, name: str) -> Callable:
+        if name.startswith('_'):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        def _op(*args, **kwargs):
+            return self.graph.node(name, (self,) + args, kwargs)
+        return _op
+
+    def __bool__(self):
+        raise TypeError('A LazySymbol has no truth value before it is evaluated, call `evaluate()` first.')
+
+    def __hash__(self) -> int:
+        return id(self)
+
+    def __repr__(self) -> str:
+        state = 'done' if self.done else 'pending'
+        return f'LazySymbol({self.op or "value"}, {state}, {self.key[:8]})'
+
+
+def _deferred(name: str) -> Callable:
+    def _op(self, *args, **kwargs):
+        return self.graph.node(name, (self,) + args, kwargs)
+    _op.__name__ = name
+    return _op
+
+
+for _name in ['__eq__', '__ne__', '__gt__', '__lt__', '__le__', '__ge__', '__neg__', '__invert__',
+              '__add__', '__radd__', '__sub__', '__rsub__', '__and__', '__or__', '__xor__', '__truediv__',
+              '__matmul__', '__rmatmul__', '__lshift__', '__rshift__', '__rrshift__', '__getitem__']:
+    setattr(LazySymbol, _name, _deferred(_name))
+
+
+class LazyGraph:
+    '''
+    DAG of deferred Symbol operations.
+    Nodes are interned by their operation and inputs, so identical sub-queries (same primitive, same arguments, same
+    input) share one node and are computed once. `evaluate` runs all pending nodes a result depends on, executing
+    independent branches concurrently on up to `workers` threads, and memoizes every result in the graph.
+    '''
+    def __init__(self, workers: int = 8):
+        self.workers = workers
+        self.nodes   = {}
+        self._lock   = threading.Lock()
+
+    def symbol(self, value: Any) -> LazySymbol:
+        '''
+        Adds a value as a leaf of the graph.
+        '''
+        value = value if isinstance(value, Symbol) else Symbol(value)
+        return self._intern(self._key(None, (value,), {}), None, (value,), {})
+
+    def node(self, op: str, args: tuple, kwargs: Dict[str, Any]) -> LazySymbol:
+        return self._intern(self._key(op, args, kwargs), op, args, kwargs)
+
+    def _intern(self, key: str, op: Optional[str], args: tuple, kwargs: Dict[str, Any]) -> LazySymbol:
+        with self._lock:
+            if key not in self.nodes:
+                self.nodes[key] = LazySymbol(self, key, op, args, kwargs)
+            return self.nodes[key]
+
+    @staticmethod
+    def _key(op: Optional[str], args: tuple, kwargs: Dict[str, Any]) -> str:
+        def _arg(x):
+            if isinstance(x, LazySymbol):
+                return ['node', x.key]
+            # expressions and functions are identified by the object, since their behaviour is not part of their value
+            if isinstance(x, Expression) or (callable(x) and not isinstance(x, Symbol)):
+                return ['object', id(x)]
+            if isinstance(x, Symbol):
+                return ['symbol', type(x).__name__, _value(x.value)]
+            return ['value', type(x).__name__, _value(x)]
+        def _value(v):
+            # the repr of large arrays is abbreviated
+            if isinstance(v, np.ndarray):
+                return [str(v.dtype), v.shape, hashlib.sha256(v.tobytes()).hexdigest()]
+            return repr(v)
+        entry = [op, [_arg(a) for a in args], {k: _arg(v) for k, v in sorted(kwargs.items())}]
+        data  = json.dumps(entry, default=str)
+        return hashlib.sha256(data.encode('utf-8')).hexdigest()
+
+    def _pending(self, roots: List[LazySymbol]) -> List[LazySymbol]:
+        pending = []
+        seen    = set()
+        stack   = list(roots)
+        while stack:
+            node = stack.pop()
+            if node.done or node.key in seen:
+                continue
+            seen.add(node.key)
+            pending.append(node)
+            stack.extend(node.dependencies)
+        return pending
+
+    @staticmethod
+    def _run(node: LazySymbol) -> Any:
+        def _resolve(x):
+            return x.result if isinstance(x, LazySymbol) else x
+        args   = [_resolve(a) for a in node.args]
+        kwargs = {k: _resolve(v) for k, v in node.kwargs.items()}
+        sym    = args[0] if isinstance(args[0], Symbol) else Symbol(args[0])
+        if node.op == '__apply__':
+            return args[1](sym, *args[2:], **kwargs)
+        return getattr(sym, node.op)(*args[1:], **kwargs)
+
+    def evaluate(self, *roots: LazySymbol) -> List[Any]:
+        '''
+        Computes the given nodes and returns their results in the same order.
+
+        Raises:
+            Exception: The first exception raised by a node; the nodes computed so far stay memoized.
+        '''
+        pending    = self._pending(list(roots))
+        waiting    = {node.key: len([d for d in node.dependencies if not d.done]) for node in pending}
+        dependents = {}
+        for node in pending:
+            for dep in node.dependencies:
+                if not dep.done:
+                    dependents.setdefault(dep.key, []).append(node)
+
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        running  = {}
+        def _submit(node):
+            running[executor.submit(contextvars.copy_context().run, self._run, node)] = node
+
+        try:
+            for node in pending:
+                if waiting[node.key] == 0:
+                    _submit(node)
+            while running:
+                finished, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in finished:
+                    node        = running.pop(future)
+                    node.result = future.result()
+                    node.done   = True
+                    for dependent in dependents.get(node.key, []):
+                        waiting[dependent.key] -= 1
+                        if waiting[dependent.key] == 0:
+                            _submit(dependent)
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return [node.result for node in roots]
@@ -58,15 +58,17 @@ class SlidingWindowStringConcatMemory(Memory):
     def store(self, query: str, *args, **kwargs):
         # append to string to memory
         self._memory += f'{str(query)}{self.marker}'
-        sym = Symbol(self._memory)
-        tokens = len(sym)
-        # while memory larger than max_tokens * data_ratio remove a character from the front
-        while tokens > self.max_tokens() * self.token_ratio:
-            val = sym.value.strip()
-            val = val.split(' ')[1:]
+        sym    = Symbol(self._memory)
+        tokens = sym.tokens
+        budget = int(self.max_tokens() * self.token_ratio)
+        # while memory larger than max_tokens * data_ratio cut the overflowing tokens from the front at once
+        # and drop the first (possibly split) word, instead of re-tokenizing after every removed word
+        while len(tokens) > budget:
+            val = sym.tokenizer().decode(tokens[len(tokens) - budget:])
+            val = val.strip().split(' ')[1:]
             self._memory = ' '.join(val)
-            sym = Symbol(self._memory)
-            tokens = len(sym)
+            sym    = Symbol(self._memory)
+            tokens = sym.tokens
 
     def forget(self, query: Symbol, *args, **kwargs):
         # remove substring from memory
@@ -15,5 +15,6 @@ SYMBOL_PRIMITIVES = [
     PersistencePrimitives,
     OutputHandlingPrimitives,
     FineTuningPrimitives,
+    AsyncPrimitives,
 ]
 
@@ -8,7 +8,9 @@ from typing import (TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple,
 import numpy as np
 
 from .. import core
+from ..backend.batching import BatchScheduler
 from ..prompts import Prompt
+from ..utils import similarity_matrix, thread_map
 
 if TYPE_CHECKING:
     from ..symbol import Expression, Symbol
@@ -19,6 +21,8 @@ class ContextualPrimitives:
     This mixin contains functions that deal with the context of the symbol. The functions in this mixin manage dynamic context of symbols (like adding, clearing), or deal with type checking and related functionalities.
     New functionalities might include operations that further interact with or manipulate the context associated with symbols.
     '''
+    __slots__ = ()
+
     def update(self, feedback: str) -> None:
         '''
         Update the dynamic context with a given runtime feedback.
@@ -50,6 +54,8 @@ class ValueHandlingPrimitives:
     This mixin includes functions responsible for handling symbol values - tokenization, type retrieval, value casting, indexing, etc.
     Future functions might include different methods of processing or manipulating the values of symbols, working with metadata of values, etc.
     '''
+    __slots__ = ()
+
     @property
     def size(self) -> int:
         '''
@@ -65,11 +71,17 @@ class ValueHandlingPrimitives:
         '''
         Tokenize the Symbol's value using the tokenizer method.
         The tokenizer method is bound to the 'neurosymbolic' engine using the @core.bind() decorator.
+        The tokens are cached together with the string value they were computed from and recomputed once the value changes.
 
         Returns:
             int: The tokenized value of the Symbol.
         '''
-        return self.tokenizer().encode(str(self))
+        value  = str(self)
+        cached = self._tokens_cache
+        if cached is None or cached[0] != value:
+            cached = (value, self.tokenizer().encode(value))
+            self._tokens_cache = cached
+        return cached[1]
 
     @core.bind(engine='neurosymbolic', property='tokenizer')
     def tokenizer(self) -> Callable:
@@ -134,6 +146,8 @@ class ComparisonPrimitives:
     This mixin is dedicated to functions that perform more complex comparison operations between symbols or symbol values.
     This usually involves additional context, which the builtin overrode (e.g. __eq__) functions lack.
     '''
+    __slots__ = ()
+
     def equals(self, string: str, context: str = 'contextually', **kwargs) -> 'Symbol':
         '''
         Checks if the symbol value is equal to another string.
@@ -175,6 +189,8 @@ class ExpressionHandlingPrimitives:
     This mixin consists of functions that handle symbolic expressions - evaluations, parsing, computation and more.
     Future functionalities in this mixin might include operations to manipulate expressions, more complex evaluation techniques, etc.
     '''
+    __slots__ = ()
+
     def expression(self, expr: Optional[str] = None, expression_engine: str = None, **kwargs) -> 'Symbol':
         '''
         Evaluates a symbolic expression using the provided engine.
@@ -202,6 +218,8 @@ class DataHandlingPrimitives:
     This mixin houses functions that clean, summarize and outline symbols or their values.
     Future implementations in this mixin may include various other cleaning and summarization techniques, error detection/correction in symbols, complex filtering, bulk modifications, or other types of condition-based manipulations on symbols, etc.
     '''
+    __slots__ = ()
+
     def clean(self, **kwargs) -> 'Symbol':
         '''
         Cleans the symbol value.
@@ -357,6 +375,8 @@ class UniquenessPrimitives:
     This mixin includes functions that work with unique aspects of symbol values, like extracting unique information or composing new unique symbols.
     Future functionalities might include finding duplicate information, defining levels of uniqueness, etc.
     '''
+    __slots__ = ()
+
     def unique(self, keys: Optional[List[str]] = [], **kwargs) -> 'Symbol':
         '''
         Extracts unique information from the symbol value, using provided keys.
@@ -394,6 +414,8 @@ class PatternMatchingPrimitives:
     This mixin houses functions that deal with ranking symbols, extracting details based on patterns, and correcting symbols.
     It will house future functionalities that involve sorting, complex pattern detections, advanced correction techniques etc.
     '''
+    __slots__ = ()
+
     def rank(self, measure: Optional[str] = 'alphanumeric', order: Optional[str] = 'desc', **kwargs) -> 'Symbol':
         '''
         Ranks the symbol value based on a measure and a sort order.
@@ -491,6 +513,8 @@ class QueryHandlingPrimitives:
     This mixin helps in transforming, preparing, and executing queries, and it is designed to be extendable as new ways of handling queries are developed.
     Future methods could potentially include query optimization, enhanced query formatting, multi-level query execution, query error handling, etc.
     '''
+    __slots__ = ()
+
     def query(self, context: str, prompt: Optional[str] = None, examples: Optional[List[Prompt]] = None, **kwargs) -> 'Symbol':
         '''
         Queries the symbol value based on a specified context.
@@ -553,6 +577,24 @@ class ExecutionControlPrimitives:
     This mixin represents the core methods for dealing with symbol execution.
     Possible future methods could potentially include async execution, pipeline chaining, execution profiling, improved error handling, version management, embedding more complex execution control structures etc.
     '''
+    __slots__ = ()
+
+    def lazy(self, graph: Optional['LazyGraph'] = None) -> 'LazySymbol':
+        '''
+        Turns the Symbol into the leaf of a lazy expression graph. Primitives and operators called on the returned
+        LazySymbol are not executed but recorded; `evaluate()` computes them, runs independent branches concurrently and
+        computes identical sub-queries only once.
+
+        Args:
+            graph (Optional[LazyGraph]): The graph to add the Symbol to, e.g. to share results between several symbols. Defaults to a new graph.
+
+        Returns:
+            LazySymbol: The lazy node of the Symbol.
+        '''
+        from ..lazy import LazyGraph
+        graph = graph if graph is not None else LazyGraph()
+        return graph.symbol(self)
+
     def analyze(self, exception: Exception, query: Optional[str] = '', **kwargs) -> 'Symbol':
         '''Uses the @core.analyze decorator, analyzes an exception and returns a symbol.
 
@@ -669,7 +711,35 @@ class ExecutionControlPrimitives:
 
         return self._to_symbol(_func(self))
 
-    def stream(self, expr: 'Expression', token_ratio: Optional[float] = 0.6, **kwargs) -> 'Symbol':
+    def batch(self, expr: Union[str, Callable], *args, batch_size: Optional[int] = 32, **kwargs) -> 'Symbol':
+        '''
+        Applies a primitive or an Expression to every element of the Symbol's value in batched engine calls.
+        The elements are evaluated concurrently and their engine requests are packed together, e.g. into one prompt array
+        for completion engines or concurrent requests for chat engines. Post-processing and type casting happen per element.
+
+        Args:
+            expr (Union[str, Callable]): The name of a Symbol primitive (e.g. 'query', 'equals') or a callable such as an Expression, which receives the element as a Symbol.
+            *args: Additional positional arguments for the primitive or Expression.
+            batch_size (Optional[int]): The maximum number of requests packed into one engine call. Defaults to 32.
+            **kwargs: Additional keyword arguments for the primitive or Expression.
+
+        Returns:
+            Symbol: A Symbol object containing the list of results in the order of the elements.
+        '''
+        values = self.value if isinstance(self.value, (list, tuple)) else [self.value]
+
+        def _apply(value):
+            sym = self._to_symbol(value)
+            if isinstance(expr, str):
+                return getattr(sym, expr)(*args, **kwargs)
+            return expr(sym, *args, **kwargs)
+
+        with BatchScheduler(max_batch_size=batch_size):
+            res = list(thread_map(_apply, values, workers=batch_size))
+
+        return self._to_symbol(res)
+
+    def stream(self, expr: 'Expression', token_ratio: Optional[float] = 0.6, workers: int = 1, ordered: bool = True, **kwargs) -> 'Symbol':
         '''
         Streams the Symbol's value through an Expression object.
         This method divides the Symbol's value into chunks and processes each chunk through the given Expression object.
@@ -678,6 +748,8 @@ class ExecutionControlPrimitives:
         Args:
             expr (Expression): The Expression object to evaluate the Symbol's chunks.
             token_ratio (Optional[float]): The ratio between input-output tokens for calculating max_chars. Defaults to 0.6.
+            workers (int): The number of chunks evaluated concurrently. Defaults to 1.
+            ordered (bool): If False, the results of concurrently evaluated chunks are yielded as soon as they complete instead of in input order. Defaults to True.
             **kwargs: Additional keyword arguments for the given Expression.
 
         Returns:
@@ -692,14 +764,17 @@ class ExecutionControlPrimitives:
         max_ctxt_tokens = int(_max_tokens(self) * token_ratio)
         prev = expr(self, preview=True, **kwargs)
 
-        if len(prev) > _max_tokens(self):
-            n_splits = (len(prev) // max_ctxt_tokens) + 1
-
-            for i in range(n_splits):
-                tokens_sliced = self.tokens[i * max_ctxt_tokens: (i + 1) * max_ctxt_tokens]
-                r = self._to_symbol(self.tokenizer().decode(tokens_sliced))
+        prev_tokens = len(prev)
+        if prev_tokens > _max_tokens(self):
+            tokens    = self.tokens
+            tokenizer = self.tokenizer()
+            chunks    = (self._to_symbol(tokenizer.decode(tokens[i:i + max_ctxt_tokens])) for i in range(0, len(tokens), max_ctxt_tokens))
 
-                yield expr(r, **kwargs)
+            if workers > 1:
+                yield from thread_map(lambda r: expr(r, **kwargs), chunks, workers=workers, ordered=ordered)
+            else:
+                for r in chunks:
+                    yield expr(r, **kwargs)
 
         else:
             yield expr(self, **kwargs)
@@ -780,6 +855,8 @@ class DictHandlingPrimitives:
     This mixin hosts functions that deal with dictionary operations on symbol values.
     It can be extended in the future with more advanced dictionary methods and operations.
     '''
+    __slots__ = ()
+
     def dict(self, context: str, **kwargs) -> 'Symbol':
         '''
         Maps related content together under a common abstract topic as a dictionary of the Symbol value.
@@ -831,6 +908,8 @@ class TemplateStylingPrimitives:
     This mixin includes functionalities for stylizing symbols and applying templates.
     Future functionalities might include a variety of new stylizing methods, application of more complex templates, etc.
     '''
+    __slots__ = ()
+
     def template(self, template: str, placeholder: Optional[str] = '{{placeholder}}', **kwargs) -> 'Symbol':
         '''
         Applies a template to the Symbol.
@@ -877,6 +956,8 @@ class DataClusteringPrimitives:
     This mixin contains functionalities that deal with clustering symbol values or generating embeddings.
     New functionalities in this mixin might include different types of clustering and embedding methods, dimensionality reduction techniques, etc.
     '''
+    __slots__ = ()
+
     def cluster(self, **kwargs) -> 'Symbol':
         '''
         Creates a cluster from the Symbol's value.
@@ -920,7 +1001,8 @@ class DataClusteringPrimitives:
         '''
         Calculates the similarity between two Symbol objects using a specified metric.
         This method compares the values of two Symbol objects and calculates their similarity according to the specified metric.
-        It supports the 'cosine' metric, and raises a NotImplementedError for other metrics.
+        It supports the 'cosine', 'dot', 'euclidean' (negated distance) and 'jaccard' metrics, and raises a NotImplementedError for other metrics.
+        With the 'jaccard' metric, set values are compared as sets.
 
         Args:
             other (Symbol): The other Symbol object to calculate the similarity with.
@@ -938,15 +1020,13 @@ class DataClusteringPrimitives:
                 if not isinstance(x, type(self._to_symbol(None))): #@NOTE: enforce Symbol to avoid circular import
                     raise TypeError(f'Cannot compute similarity with type {type(x)}')
                 x = np.array(x.value)
-            return x.squeeze()[:, None]
+            return x.reshape(1, -1)
 
-        v = _ensure_format(self)
-        o = _ensure_format(other)
+        if metric == 'jaccard' and isinstance(self.value, set) and isinstance(getattr(other, 'value', None), set):
+            a, b = self.value, other.value
+            return len(a & b) / len(a | b) if len(a | b) > 0 else 0.
 
-        if metric == 'cosine':
-            return (v.T@o / (v.T@v)**.5 * (o.T@o)**.5).item()
-        else:
-            raise NotImplementedError(f"Similarity metric {metric} not implemented. Available metrics: 'cosine'")
+        return similarity_matrix(_ensure_format(self), _ensure_format(other), metric=metric).item()
 
     def zip(self, **kwargs) -> List[Tuple[str, List, Dict]]:
         '''
@@ -981,6 +1061,8 @@ class PersistencePrimitives:
     This mixin contains functionalities related to expanding symbols and saving/loading symbols to/from disk.
     Future functionalities in this mixin might include different ways of serialization and deserialization, or more complex expansion techniques etc.
     '''
+    __slots__ = ()
+
     def expand(self, *args, **kwargs) -> str:
         '''
         Expand the current Symbol and create a new sub-component.
@@ -1059,6 +1141,8 @@ class OutputHandlingPrimitives:
     '''
     This mixin include functionalities related to outputting symbols. It can be expanded in the future to include different types of output methods or complex output formatting, etc.
     '''
+    __slots__ = ()
+
     def output(self, *args, **kwargs) -> 'Symbol':
         '''
         Output the current Symbol to an output handler.
@@ -1083,6 +1167,8 @@ class FineTuningPrimitives:
     '''
     This mixin contains functionalities related to fine tuning models.
     '''
+    __slots__ = ()
+
     def tune(self, operation: str = 'create', **kwargs) -> 'Symbol':
         '''
         Fine tune a base model.
@@ -1097,4 +1183,122 @@ class FineTuningPrimitives:
         @core.tune(operation=operation, **kwargs)
         def _func(_, *args, **kwargs) -> str:
             pass
-        return self.sym_return_type(_func(self))
\ No newline at end of file
+        return self.sym_return_type(_func(self))
+
+class AsyncPrimitives:
+    '''
+    This mixin contains awaitable counterparts of the most frequently used primitives. They dispatch through the asynchronous engine path, so many of them can run concurrently on a single event loop.
+    Future functionalities might include awaitable variants of further primitives, async streaming, etc.
+    '''
+    __slots__ = ()
+
+    async def aequals(self, string: str, context: str = 'contextually', **kwargs) -> 'Symbol':
+        '''
+        Asynchronously checks if the symbol value is equal to another string.
+
+        Args:
+            string (str): The string to compare with the symbol value.
+            context (str, optional): The context in which to compare the strings. Defaults to 'contextually'.
+
+        Returns:
+            Symbol: A new symbol indicating whether the two strings are equal or not.
+        '''
+        @core.equals(context=context, **kwargs)
+        async def _func(_, string: str) -> bool:
+            pass
+
+        return self._to_symbol(await _func(self, string))
+
+    async def aquery(self, context: str, prompt: Optional[str] = None, examples: Optional[List[Prompt]] = None, **kwargs) -> 'Symbol':
+        '''
+        Asynchronously queries the symbol value based on a specified context.
+
+        Args:
+            context (str): The context used for the query.
+            prompt (Optional[str]): The prompt for the query. Defaults to None.
+            examples (Optional[List[Prompt]]): The examples for the query. Defaults to None.
+            **kwargs: Additional keyword arguments to pass to the core.query decorator.
+
+        Returns:
+            Symbol: The result of the query as a Symbol.
+        '''
+        @core.query(context=context, prompt=prompt, examples=examples, **kwargs)
+        async def _func(_) -> str:
+            pass
+
+        return self._to_symbol(await _func(self))
+
+    async def aclean(self, **kwargs) -> 'Symbol':
+        '''
+        Asynchronously cleans the symbol value.
+
+        Returns:
+            Symbol: A new symbol with the cleaned value.
+        '''
+        @core.clean(**kwargs)
+        async def _func(_) -> str:
+            pass
+
+        return self._to_symbol(await _func(self))
+
+    async def asummarize(self, context: Optional[str] = None, **kwargs) -> 'Symbol':
+        '''
+        Asynchronously summarizes the symbol value.
+
+        Args:
+            context (Optional[str]): The context to be used for summarization. Defaults to None.
+
+        Returns:
+            Symbol: A new symbol with the summarized value.
+        '''
+        @core.summarize(context=context, **kwargs)
+        async def _func(_) -> str:
+            pass
+
+        return self._to_symbol(await _func(self))
+
+    async def aoutline(self, **kwargs) -> 'Symbol':
+        '''
+        Asynchronously creates an outline of the symbol value.
+
+        Returns:
+            Symbol: A new symbol with the outline of the value.
+        '''
+        @core.outline(**kwargs)
+        async def _func(_) -> str:
+            pass
+
+        return self._to_symbol(await _func(self))
+
+    async def atranslate(self, language: Optional[str] = 'English', **kwargs) -> 'Symbol':
+        '''
+        Asynchronously translates the symbol value to the specified language.
+
+        Args:
+            language (Optional[str]): The language to translate the value to. Defaults to 'English'.
+
+        Returns:
+            Symbol: The translated value as a Symbol.
+        '''
+        @core.translate(language=language, **kwargs)
+        async def _func(_) -> str:
+            pass
+
+        return self._to_symbol(await _func(self))
+
+    async def aembed(self, **kwargs) -> 'Symbol':
+        '''
+        Asynchronously generates embeddings for the Symbol's value.
+        If the value is not a list, it is converted to a list.
+
+        Returns:
+            Symbol: A Symbol object with its value embedded.
+        '''
+        if not isinstance(self.value, list):
+            self.value = [self.value]
+
+        @core.embed(entries=self.value, **kwargs)
+        async def _func(_) -> list:
+            pass
+
+        return self._to_symbol(await _func(self))
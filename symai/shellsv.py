@@ -16,14 +16,16 @@ from prompt_toolkit.patch_stdout import patch_stdout
 from prompt_toolkit.shortcuts import CompleteStyle, ProgressBar
 from prompt_toolkit.styles import Style
 from pygments.lexers.shell import BashLexer
+from tqdm import tqdm
 
 from .backend.settings import SYMSH_CONFIG
-from .components import Function
+from .backend.streaming import ResponseStream
+from .components import Function, Indexer
 from .extended import Conversation
 from .misc.console import ConsoleStyle
 from .misc.loader import Loader
 from .symbol import Symbol
-from .extended import DocumentRetriever, RepositoryCloner, FileMerger, ArxivPdfParser
+from .extended import RepositoryCloner, FileMerger, ArxivPdfParser
 
 
 logging.getLogger("prompt_toolkit").setLevel(logging.ERROR)
@@ -291,13 +293,19 @@ def query_language_model(query: str, from_shell=True, res=None, *args, **kwargs)
             query.startswith('!"') or query.startswith("!'") or query.startswith('!`'):
             func = stateful_conversation
         else:
-            func = Function(SHELL_CONTEXT)
+            func = Function(SHELL_CONTEXT, stream=True)
 
     with Loader(desc="Inference ...", end=""):
         if res is not None:
             query = f'{str(res)}\n' @ Symbol(query)
         msg = func(query, *args, **kwargs)
 
+    # render the tokens of a streamed response as they arrive
+    if isinstance(msg.value, ResponseStream):
+        for delta in msg.value:
+            print(delta, end='', flush=True)
+        print()
+
     return msg
 
 
@@ -317,17 +325,20 @@ def retrieval_augmented_indexing(query: str, *args, **kwargs):
             url = url[:-4]
         path = cloner(url)
 
-    merger = FileMerger()
-    file = merger(path)
-    arxiv = ArxivPdfParser()
-    pdf_file = arxiv(file)
-    if pdf_file is not None:
-        file = file @'\n'@ pdf_file
-
     index_name = path.split(sep)[-1]
     print(f'Indexing {index_name} ...')
-    # creates index if not exists
-    DocumentRetriever(file=file, index_name=index_name, overwrite=False)
+    # stream the files into the index one by one, unchanged files are not embedded again
+    indexer = Indexer(index_name=index_name)
+    merger = FileMerger()
+    arxiv = ArxivPdfParser()
+    # the hash ledger and the lexical index are persisted once after all files
+    with indexer:
+        for file_path, content in tqdm(merger.stream(path), unit=' files'):
+            document = os.path.abspath(file_path)
+            indexer.update(indexer.formatter(Symbol(content)).value, document=document, progress=False)
+            pdf_file = arxiv(content)
+            if pdf_file is not None:
+                indexer.update(indexer.formatter(pdf_file).value, document=f'{document}#arxiv', progress=False)
 
     home_path = os.path.expanduser('~')
     symai_path = os.path.join(home_path, '.symai', '.conversation_state')
@@ -506,7 +517,8 @@ def listen(session: PromptSession, word_comp: WordCompleter, auto_query_on_error
                     os._exit(0)
                 else:
                     msg = process_command(cmd, auto_query_on_error=auto_query_on_error)
-                    if msg is not None:
+                    # streamed responses are already printed while they arrive
+                    if msg is not None and not isinstance(getattr(msg, 'value', None), ResponseStream):
                         with ConsoleStyle('code') as console:
                             console.print(msg)
 
@@ -1,12 +1,14 @@
+import asyncio
 from abc import ABC
 from json import JSONEncoder
-from typing import Any, Dict, Iterator, List, Optional, Type, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, Union
 
 import numpy as np
 
 from . import core
 from .ops import SYMBOL_PRIMITIVES
-from .utils import deprecated
+from .post_processors import ClusterPostProcessor
+from .utils import deprecated, similarity_matrix
 
 
 class SymbolEncoder(JSONEncoder):
@@ -20,15 +22,64 @@ class SymbolEncoder(JSONEncoder):
         Returns:
             dict: The dictionary representation of the Symbol instance.
         '''
-        return sym.__dict__
+        return sym.__getstate__()
+
+
+def _unwrap(value: Any) -> Any:
+    # shallow copy of a container value which unwraps nested symbols; the per-element walk only happens if there are any,
+    # which is checked on the distinct element types since `isinstance` on the ABC is slow
+    if isinstance(value, dict):
+        if any([issubclass(t, Symbol) for t in set(map(type, value.values()))]):
+            return {k: v.value if isinstance(v, Symbol) else v for k, v in value.items()}
+        return dict(value)
+    if not any([issubclass(t, Symbol) for t in set(map(type, value))]):
+        return list(value) if isinstance(value, list) else set(value) if isinstance(value, set) else tuple(value)
+    if isinstance(value, list):
+        return [v.value if isinstance(v, Symbol) else v for v in value]
+    if isinstance(value, set):
+        return {v.value if isinstance(v, Symbol) else v for v in value}
+    return tuple([v.value if isinstance(v, Symbol) else v for v in value])
+
+
+class _LazyField:
+    '''
+    Symbol attribute which is stored in the `_extra` dict of the symbol. The dict is only allocated once an attribute
+    is set to a value other than its default, so most symbols do not carry metadata or graph fields at all.
+    '''
+    def __init__(self, default: Any = None):
+        self.default = default
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, sym, owner = None) -> Any:
+        if sym is None:
+            return self
+        extra = sym._extra
+        return self.default if extra is None else extra.get(self.name, self.default)
+
+    def __set__(self, sym, value: Any) -> None:
+        if sym._extra is None:
+            if type(value) is type(self.default) and value == self.default:
+                return
+            sym._extra = {}
+        sym._extra[self.name] = value
 
 
 class Symbol(ABC, *SYMBOL_PRIMITIVES):
+    # `__dict__` is only allocated once a subclass or user sets further attributes
+    __slots__ = ('_value', '_extra', '__dict__', '__weakref__')
+    metadata        = _LazyField()
+    parent          = _LazyField() #@TODO: to enable graph construction
+    children        = _LazyField() #@TODO: to enable graph construction
+    _static_context = _LazyField('')
+    _tokens_cache   = _LazyField()
     _dynamic_context: Dict[str, List[str]] = {}
 
     def __init__(self, *value, static_context: Optional[str] = '') -> None:
         '''
         Initialize a Symbol instance with a specified value. Unwraps nested symbols.
+        Lists, dicts and sets are copied shallowly, so later changes of the passed container do not affect the symbol.
 
         Args:
             value (Optional[Any]): The value of the symbol. Can be a single value or multiple values.
@@ -39,10 +90,8 @@ class Symbol(ABC, *SYMBOL_PRIMITIVES):
             metadata (Optional[Dict[str, Any]]): The metadata associated with the symbol.
         '''
         super().__init__()
-        self.value    = None
-        self.metadata = None
-        self.parent   = None #@TODO: to enable graph construction
-        self.children = None #@TODO: to enable graph construction
+        self._value = None
+        self._extra = None
         self._static_context = static_context
 
         if len(value) == 1:
@@ -50,35 +99,40 @@ class Symbol(ABC, *SYMBOL_PRIMITIVES):
             value = value[0]
 
             if isinstance(value, Symbol):
-                self.value    = value.value
-                self.parent   = value.parent
-                self.children = value.children
-                self.metadata = value.metadata
-
-            elif isinstance(value, list) or isinstance(value, dict) or \
-                    isinstance(value, set) or isinstance(value, tuple) or \
-                        isinstance(value, str) or isinstance(value, int) or \
-                            isinstance(value, float) or isinstance(value, bool):
+                self._value = value.value
+                if value._extra is not None:
+                    self.parent   = value.parent
+                    self.children = value.children
+                    self.metadata = value.metadata
 
-                if isinstance(value, list):
-                    value = [v.value if isinstance(v, Symbol) else v for v in value]
+            elif isinstance(value, (list, dict, set, tuple)):
+                self._value = _unwrap(value)
 
-                elif isinstance(value, dict):
-                    value = {k: v.value if isinstance(v, Symbol) else v for k, v in value.items()}
+            else:
+                self._value = value
 
-                elif isinstance(value, set):
-                    value = {v.value if isinstance(v, Symbol) else v for v in value}
+        elif len(value) > 1:
+            self._value = [v.value if isinstance(v, Symbol) else v for v in value]
 
-                elif isinstance(value, tuple):
-                    value = tuple([v.value if isinstance(v, Symbol) else v for v in value])
+    @property
+    def value(self) -> Any:
+        '''
+        Get the value of the symbol.
 
-                self.value = value
+        Returns:
+            Any: The value of the symbol.
+        '''
+        return self._value
 
-            else:
-                self.value = value
+    @value.setter
+    def value(self, value: Any) -> None:
+        '''
+        Set the value of the symbol.
 
-        elif len(value) > 1:
-            self.value = [v.value if isinstance(v, Symbol) else v for v in value]
+        Args:
+            value (Any): The new value of the symbol.
+        '''
+        self._value = value
 
     @property
     def global_context(self) -> str:
@@ -155,7 +209,16 @@ class Symbol(ABC, *SYMBOL_PRIMITIVES):
         Returns:
             dict: The state of the symbol.
         '''
-        return vars(self)
+        # the token cache is not part of the state and is recomputed on demand
+        state = {
+            'value':           self.value,
+            'metadata':        self.metadata,
+            'parent':          self.parent,
+            'children':        self.children,
+            '_static_context': self._static_context
+        }
+        state.update(vars(self))
+        return state
 
     def __setstate__(self, state) -> None:
         '''
@@ -164,12 +227,14 @@ class Symbol(ABC, *SYMBOL_PRIMITIVES):
         Args:
             state (dict): The state to set the symbol to.
         '''
-        vars(self).update(state)
+        self._extra = None
+        for k, v in state.items():
+            setattr(self, k, v)
 
     def __getattr__(self, key) -> Any:
         '''
-        Get an attribute from the symbol if it exists. Otherwise, attempt to get the attribute from the symbol's value.
-        If the attribute does not exist in the symbol or its value, raise an AttributeError with a cascading error message.
+        Get an attribute from the symbol's value, since the attribute does not exist in the symbol itself.
+        If the attribute does not exist in the symbol's value either, raise an AttributeError with a cascading error message.
 
         Args:
             key (str): The name of the attribute.
@@ -180,14 +245,14 @@ class Symbol(ABC, *SYMBOL_PRIMITIVES):
         Raises:
             AttributeError: If the attribute does not exist.
         '''
-        if not self.__dict__.__contains__(key):
-            try:
-                att = getattr(self.value, key)
-            except AttributeError as e:
-                raise AttributeError(f"Cascading call failed, since object has no attribute '{key}'. Original error message: {e}")
-            return att
-
-        return self.__dict__[key]
+        # an unset slot, e.g. if a subclass did not call `Symbol.__init__`, must not cascade into the value
+        if key == 'value' or key in Symbol.__slots__:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{key}'")
+        try:
+            att = getattr(self.value, key)
+        except AttributeError as e:
+            raise AttributeError(f"Cascading call failed, since object has no attribute '{key}'. Original error message: {e}")
+        return att
 
     def __contains__(self, other: Any) -> bool:
         '''
@@ -833,6 +898,19 @@ class Expression(Symbol):
         '''
         return self.forward(*args, **kwargs)
 
+    async def __acall__(self, *args, **kwargs) -> Any:
+        '''
+        Evaluate the expression asynchronously using the aforward method.
+
+        Args:
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Any: The result of the aforward method.
+        '''
+        return await self.aforward(*args, **kwargs)
+
     @property
     def sym_return_type(self) -> Type:
         '''
@@ -883,6 +961,20 @@ class Expression(Symbol):
         '''
         raise NotImplementedError()
 
+    async def aforward(self, *args, **kwargs) -> Symbol:
+        '''
+        Asynchronous counterpart of the forward method. Subclasses can override it to await the async primitives
+        (e.g. `aquery`, `aequals`) directly. By default the blocking forward method is run in a worker thread.
+
+        Args:
+            *args: Variable length argument list.
+            **kwargs: Arbitrary keyword arguments.
+
+        Returns:
+            Symbol: The evaluated result of the forward method.
+        '''
+        return await asyncio.to_thread(self.forward, *args, **kwargs)
+
     @deprecated("Use Interface('dall-e') instead. Will be removed future versions.")
     def draw(self, query: Optional[str] = None, operation: str = 'create', **kwargs) -> 'Symbol':
         '''
@@ -1079,6 +1171,40 @@ class Expression(Symbol):
             pass
         return self.sym_return_type(_func(self))
 
+    # TODO: consider if this should be deprecated and moved only as an Interface
+    def delete(self, ids: List[str], **kwargs) -> 'Symbol':
+        '''
+        Delete entries from the existing index.
+
+        Args:
+            ids (List[str]): The ids of the entries to delete.
+            **kwargs: Arbitrary keyword arguments to be used by the core.index decorator.
+
+        Returns:
+            Symbol: An Expression object containing the deletion result.
+        '''
+        @core.index(prompt=ids, operation='delete', **kwargs)
+        def _func(_):
+            pass
+        return self.sym_return_type(_func(self))
+
+    # TODO: consider if this should be deprecated and moved only as an Interface
+    def lookup(self, ids: List[str], **kwargs) -> 'Symbol':
+        '''
+        Look up entries of the existing index by their ids.
+
+        Args:
+            ids (List[str]): The ids of the entries to look up.
+            **kwargs: Arbitrary keyword arguments to be used by the core.index decorator.
+
+        Returns:
+            Symbol: An Expression object containing the matching entries and their metadata.
+        '''
+        @core.index(prompt=ids, operation='lookup', **kwargs)
+        def _func(_):
+            pass
+        return self.sym_return_type(_func(self))
+
     # TODO: consider if this should be deprecated and moved only as an Interface
     def get(self, query: List[int], **kwargs) -> 'Symbol':
         '''
@@ -1097,35 +1223,271 @@ class Expression(Symbol):
         return self.sym_return_type(_func(self))
 
     @staticmethod
-    def command(engines: List[str] = ['all'], **kwargs) -> 'Symbol':
+    def command(engines: List[str] = ['all'], scoped: bool = False, **kwargs) -> 'Symbol':
         '''
         Execute command(s) on engines.
 
         Args:
             engines (List[str], optional): The list of engines on which to execute the command(s). Defaults to ['all'].
+            scoped (bool, optional): If True, the command only applies within a `with` block of the returned scope,
+                                     e.g. `with Expression.command(verbose=True, scoped=True): ...`. Defaults to False.
             **kwargs: Arbitrary keyword arguments to be used by the core.command decorator.
 
         Returns:
-            Symbol: An Expression object representing the command execution result.
+            Symbol: An Expression object representing the command execution result, or the engine scope if scoped is True.
         '''
-        @core.command(engines=engines, **kwargs)
+        @core.command(engines=engines, scoped=scoped, **kwargs)
         def _func(_):
             pass
-        return Expression(_func(Expression()))
+        res = _func(Expression())
+        return res if scoped else Expression(res)
 
     @staticmethod
-    def setup(engines: Dict[str, Any], **kwargs) -> 'Symbol':
+    def setup(engines: Dict[str, Any], scoped: bool = False, **kwargs) -> 'Symbol':
         '''
         Configure multiple engines.
 
         Args:
             engines (Dict[str, Any]): A dictionary containing engine names as keys and their configurations as values.
+            scoped (bool, optional): If True, the engines are only used within a `with` block of the returned scope,
+                                     e.g. `with Expression.setup({'neurosymbolic': engine}, scoped=True): ...`. Defaults to False.
             **kwargs: Arbitrary keyword arguments to be used by the core.setup decorator.
 
         Returns:
-            Symbol: An Expression object representing the setup result.
+            Symbol: An Expression object representing the setup result, or the engine scope if scoped is True.
         '''
-        @core.setup(engines=engines, **kwargs)
+        @core.setup(engines=engines, scoped=scoped, **kwargs)
         def _func(_):
             pass
-        return Expression(_func(Expression()))
+        res = _func(Expression())
+        return res if scoped else Expression(res)
+
+
+class SymbolArray(Symbol):
+    '''
+    A Symbol holding a list of values together with an optional (N, d) matrix of their embeddings.
+    Numeric operations such as `similarity` or `dedup` run as matrix operations over all values at once, while
+    neuro-symbolic operations such as `equals` or `choice` are dispatched through the batched engine path.
+    '''
+    __slots__ = ('_embeddings',)
+
+    def __init__(self, values: Optional[Any] = None, embeddings: Optional[np.ndarray] = None, static_context: Optional[str] = '') -> None:
+        '''
+        Initialize a SymbolArray with a list of values and optionally their embeddings.
+
+        Args:
+            values (Optional[Any]): The values of the array, e.g. a list, a Symbol of a list or another SymbolArray. Defaults to an empty array.
+            embeddings (Optional[np.ndarray]): The (N, d) embedding matrix of the values. Defaults to None.
+            static_context (Optional[str]): The static context of the symbol. Defaults to an empty string.
+
+        Raises:
+            ValueError: If the number of embeddings does not match the number of values.
+        '''
+        if isinstance(values, SymbolArray) and embeddings is None:
+            embeddings = values.embeddings
+        if isinstance(values, Symbol):
+            values = values.value
+        values = [] if values is None else list(values) if isinstance(values, (list, tuple, set, np.ndarray)) else [values]
+        super().__init__(values, static_context=static_context)
+        if embeddings is not None:
+            embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+            if len(embeddings) != len(values):
+                raise ValueError(f'Expected {len(values)} embeddings, got {len(embeddings)}')
+        self._embeddings = embeddings
+
+    @property
+    def value(self) -> Any:
+        return Symbol.value.fget(self)
+
+    @value.setter
+    def value(self, value: Any) -> None:
+        # the embeddings no longer belong to the new values
+        Symbol.value.fset(self, value)
+        self._embeddings = None
+
+    @property
+    def embeddings(self) -> Optional[np.ndarray]:
+        '''
+        The (N, d) embedding matrix of the values, or None if the array has not been embedded yet.
+        '''
+        return self._embeddings
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state['_embeddings'] = self._embeddings
+        return state
+
+    def __getitem__(self, key: Union[int, slice, List[int], np.ndarray]) -> Any:
+        '''
+        Get a value of the array by its index, or a SymbolArray of the selected values and their embeddings
+        for a slice, a list of indices or a boolean mask.
+
+        Args:
+            key (Union[int, slice, List[int], np.ndarray]): The index, slice, indices or boolean mask.
+
+        Returns:
+            Any: The value at the index or a SymbolArray of the selected values.
+        '''
+        if isinstance(key, (int, np.integer)):
+            return self.value[key]
+        if isinstance(key, slice):
+            values = self.value[key]
+        else:
+            key    = np.asarray(key)
+            key    = np.flatnonzero(key) if key.dtype == bool else key
+            values = [self.value[i] for i in key]
+        embeddings = self._embeddings[key] if self._embeddings is not None else None
+        return SymbolArray(values, embeddings=embeddings)
+
+    def __setitem__(self, key: Union[int, slice], value: Any) -> None:
+        self.value[key]  = value
+        self._embeddings = None
+
+    def __delitem__(self, key: Union[int, slice]) -> None:
+        del self.value[key]
+        self._embeddings = None
+
+    def embed(self, batch_size: int = 1024, **kwargs) -> 'SymbolArray':
+        '''
+        Embeds all values with one engine call per `batch_size` values.
+        The embeddings are stored with the returned array, so they are only computed once.
+
+        Args:
+            batch_size (int): The maximum number of values sent in one embedding request. Defaults to 1024.
+            **kwargs: Additional keyword arguments for the @core.embed decorator.
+
+        Returns:
+            SymbolArray: The array with its embedding matrix.
+        '''
+        if self._embeddings is None and len(self.value) == 0:
+            # the dimension is unknown without an embedding request
+            self._embeddings = np.zeros((0, 0), dtype=np.float32)
+        elif self._embeddings is None:
+            values = [str(v) for v in self.value]
+            chunks = [Symbol(values[i:i + batch_size]).embed(**kwargs).value for i in range(0, len(values), batch_size)]
+            self._embeddings = np.asarray([e for chunk in chunks for e in chunk], dtype=np.float32)
+        return self
+
+    def _matrix(self, other: Any, **kwargs) -> Tuple[np.ndarray, bool]:
+        # returns the embedding matrix of `other` and whether it is a single value
+        if isinstance(other, SymbolArray):
+            return other.embed(**kwargs).embeddings, False
+        if isinstance(other, Symbol):
+            other = other.value
+        if isinstance(other, str):
+            return SymbolArray([other]).embed(**kwargs).embeddings, True
+        if isinstance(other, (list, tuple)) and (len(other) == 0 or isinstance(other[0], (str, Symbol))):
+            return SymbolArray([str(v.value) if isinstance(v, Symbol) else v for v in other]).embed(**kwargs).embeddings, False
+        other = np.asarray(other, dtype=np.float32)
+        return np.atleast_2d(other), other.ndim == 1
+
+    def similarity(self, other: Any, metric: Optional[str] = 'cosine', **kwargs) -> np.ndarray:
+        '''
+        Calculates the similarities of all values to one or more others as a single matrix product.
+        Texts are embedded first; vectors and embedding matrices are used as they are.
+
+        Args:
+            other (Any): A text, a vector, a list of texts, a (M, d) matrix, a Symbol or another SymbolArray.
+            metric (Optional[str]): The metric to use for calculating the similarity, 'cosine' or 'dot'. Defaults to 'cosine'.
+            **kwargs: Additional keyword arguments for the @core.embed decorator.
+
+        Returns:
+            np.ndarray: The (N,) similarities to a single other value, or the (N, M) similarities to M other values.
+        '''
+        others, single = self._matrix(other, **kwargs)
+        if len(self.value) == 0 or len(others) == 0:
+            scores = np.zeros((len(self.value), len(others)), dtype=np.float32)
+        else:
+            scores = similarity_matrix(self.embed(**kwargs).embeddings, others, metric=metric)
+        return scores[:, 0] if single else scores
+
+    def dedup(self, threshold: float = 0.95, metric: Optional[str] = 'cosine', block_size: int = 1024, **kwargs) -> 'SymbolArray':
+        '''
+        Removes near-duplicate values, keeping the first occurrence of every group of values whose similarity
+        reaches `threshold`. The similarities are computed block-wise against the values kept so far.
+
+        Args:
+            threshold (float): The similarity at which two values are considered duplicates. Defaults to 0.95.
+            metric (Optional[str]): The metric to use for calculating the similarity. Defaults to 'cosine'.
+            block_size (int): The number of values compared in one matrix product. Defaults to 1024.
+            **kwargs: Additional keyword arguments for the @core.embed decorator.
+
+        Returns:
+            SymbolArray: The array without near-duplicates.
+        '''
+        embeddings = self.embed(**kwargs).embeddings
+        kept       = []
+        if len(embeddings) == 0:
+            return SymbolArray([])
+        for start in range(0, len(embeddings), block_size):
+            block = embeddings[start:start + block_size]
+            drop  = np.zeros(len(block), dtype=bool)
+            if len(kept) > 0:
+                drop = similarity_matrix(block, embeddings[kept], metric=metric).max(axis=1) >= threshold
+            inner = similarity_matrix(block, block, metric=metric) >= threshold
+            for i in range(len(block)):
+                if drop[i]:
+                    continue
+                kept.append(start + i)
+                # later values of the block which duplicate a kept one are dropped
+                drop[i + 1:] |= inner[i, i + 1:]
+        return self[kept]
+
+    def cluster(self, **kwargs) -> 'Symbol':
+        '''
+        Clusters the values by their embeddings, which are computed only if the array has not been embedded yet.
+
+        Args:
+            **kwargs: Additional keyword arguments for the @core.embed decorator.
+
+        Returns:
+            Symbol: A Symbol object with a dictionary mapping the cluster labels to their values.
+        '''
+        if len(self.value) == 0:
+            return self._to_symbol({})
+        return self._to_symbol(ClusterPostProcessor()(self, {}, self.embed(**kwargs).embeddings))
+
+    def batch(self, expr: Union[str, Callable], *args, batch_size: Optional[int] = 32, **kwargs) -> 'SymbolArray':
+        '''
+        Applies a primitive or an Expression to every value in batched engine calls.
+
+        Args:
+            expr (Union[str, Callable]): The name of a Symbol primitive (e.g. 'query', 'equals') or a callable such as an Expression, which receives the value as a Symbol.
+            *args: Additional positional arguments for the primitive or Expression.
+            batch_size (Optional[int]): The maximum number of requests packed into one engine call. Defaults to 32.
+            **kwargs: Additional keyword arguments for the primitive or Expression.
+
+        Returns:
+            SymbolArray: The results in the order of the values.
+        '''
+        return SymbolArray(super().batch(expr, *args, batch_size=batch_size, **kwargs))
+
+    def equals(self, string: str, context: str = 'contextually', batch_size: Optional[int] = 32, **kwargs) -> 'SymbolArray':
+        '''
+        Checks for every value whether it is equal to the given string, in batched engine calls.
+
+        Args:
+            string (str): The string to compare the values with.
+            context (str): The context of the comparison. Defaults to 'contextually'.
+            batch_size (Optional[int]): The maximum number of requests packed into one engine call. Defaults to 32.
+            **kwargs: Additional keyword arguments for the @core.equals decorator.
+
+        Returns:
+            SymbolArray: The comparison results in the order of the values.
+        '''
+        return self.batch('equals', string, context=context, batch_size=batch_size, **kwargs)
+
+    def choice(self, cases: List[str], default: str, batch_size: Optional[int] = 32, **kwargs) -> 'SymbolArray':
+        '''
+        Chooses one of the cases for every value, in batched engine calls.
+
+        Args:
+            cases (List[str]): The cases to choose from.
+            default (str): The default case if none of the cases applies.
+            batch_size (Optional[int]): The maximum number of requests packed into one engine call. Defaults to 32.
+            **kwargs: Additional keyword arguments for the @core.case decorator.
+
+        Returns:
+            SymbolArray: The chosen cases in the order of the values.
+        '''
+        return self.batch('choice', cases, default, batch_size=batch_size, **kwargs)
@@ -1,8 +1,16 @@
+import contextvars
 import inspect
+import itertools
 import sys
 import warnings
 import functools
 import multiprocessing as mp
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+
 from pathos.multiprocessing import ProcessingPool as PPool
 
 
@@ -17,6 +25,75 @@ def parallel(worker=mp.cpu_count()//2):
     return dec
 
 
+def thread_map(function: Callable, iterable: Iterable, workers: int = 8, ordered: bool = True) -> Iterator:
+    """ Lazily maps a function over an iterable on a thread pool with a bounded number of calls in flight.
+    Each call runs in a copy of the caller's context, so context-scoped state carries over to the worker threads.
+    e.g.   for res in thread_map(expr, chunks, workers=4): ...
+    If `ordered` is False, results are yielded as soon as they complete instead of in input order.
+    """
+    items    = iter(iterable)
+    window   = 2 * workers if ordered else workers
+    executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _submit(item):
+        return executor.submit(contextvars.copy_context().run, function, item)
+
+    try:
+        pending = deque(_submit(item) for item in itertools.islice(items, window))
+        if ordered:
+            while pending:
+                res = pending.popleft().result()
+                pending.extend(_submit(item) for item in itertools.islice(items, 1))
+                yield res
+        else:
+            pending = set(pending)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    pending.update(_submit(item) for item in itertools.islice(items, 1))
+                    yield future.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def normalize(a: np.ndarray) -> np.ndarray:
+    """ Scales the rows of `a` to unit L2 norm, e.g. to precompute a matrix for cosine similarities with the 'dot' metric.
+    """
+    a = np.atleast_2d(np.asarray(a, dtype=np.float32))
+    return a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+
+
+def similarity_matrix(a: np.ndarray, b: np.ndarray, metric: str = 'cosine') -> np.ndarray:
+    """ Pairwise similarities between the rows of `a` (N, d) and `b` (M, d) as one (N, M) matrix product.
+    'euclidean' returns the negated L2 distance, so that for every metric a higher score means more similar.
+    'jaccard' expects the rows to be indicator vectors of sets.
+    e.g.   scores = similarity_matrix(embeddings, queries, metric='cosine')
+    """
+    a = np.atleast_2d(np.asarray(a, dtype=np.float32))
+    b = np.atleast_2d(np.asarray(b, dtype=np.float32))
+    if metric == 'dot':
+        return a @ b.T
+    if metric == 'cosine':
+        return normalize(a) @ normalize(b).T
+    if metric in ['euclidean', 'l2']:
+        dist = (a * a).sum(axis=1)[:, None] + (b * b).sum(axis=1)[None, :] - 2 * a @ b.T
+        return -np.sqrt(np.maximum(dist, 0.))
+    if metric == 'jaccard':
+        inter = a @ b.T
+        union = a.sum(axis=1)[:, None] + b.sum(axis=1)[None, :] - inter
+        return np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    raise NotImplementedError(f"Similarity metric {metric} not implemented. Available metrics: 'cosine', 'dot', 'euclidean', 'jaccard'")
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """ Indices of the `k` highest scores along the last axis, best first, without sorting all scores.
+    """
+    k   = min(k, scores.shape[-1])
+    idx = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    top = np.take_along_axis(scores, idx, axis=-1)
+    return np.take_along_axis(idx, np.argsort(-top, axis=-1, kind='stable'), axis=-1)
+
+
 def ignore_exception(exception=Exception, default=None):
     """ Decorator for ignoring exception from a function
     e.g.   @ignore_exception(DivideByZero)
@@ -65,3 +142,35 @@ class CustomUserWarning:
         filename = filename[filename.find('symbolicai'):]
         print(f"{filename}:{lineno}: {UserWarning.__name__}: {message}", file=sys.stderr)
 
+
+
+class CachedTokenizer:
+    """ Wraps a tokenizer (e.g. a tiktoken encoding) with an LRU cache around `encode`.
+    Prompts and memories are tokenized repeatedly for length checks, so recurring strings are encoded only once.
+    Only texts of at most `max_chars` characters are memoized, so document-sized inputs do not pin their text and tokens
+    in memory. All other attributes are forwarded to the wrapped tokenizer.
+    """
+    def __init__(self, tokenizer, maxsize: int = 4096, max_chars: int = 8_192):
+        self.tokenizer = tokenizer
+        self.max_chars = max_chars
+        self._encode   = functools.lru_cache(maxsize=maxsize)(self._encode_uncached)
+
+    def _encode_uncached(self, text: str, kwargs: tuple) -> tuple:
+        return tuple(self.tokenizer.encode(text, **dict(kwargs)))
+
+    def encode(self, text: str, **kwargs) -> list:
+        if len(text) > self.max_chars:
+            return self.tokenizer.encode(text, **kwargs)
+        try:
+            return list(self._encode(text, tuple(sorted(kwargs.items()))))
+        except TypeError:
+            # unhashable arguments, e.g. a set of allowed special tokens
+            return self.tokenizer.encode(text, **kwargs)
+
+    def cache_info(self):
+        return self._encode.cache_info()
+
+    def __getattr__(self, name):
+        if name == 'tokenizer':
+            raise AttributeError(name)
+        return getattr(self.tokenizer, name)
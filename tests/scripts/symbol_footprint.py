@@ -0,0 +1,51 @@
+"""
+Benchmark of the per-object footprint and the construction time of Symbols.
+
+```
+    python tests/scripts/symbol_footprint.py --count 100000
+```
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+from symai import Symbol
+
+
+def footprint(factory, count):
+    gc.collect()
+    tracemalloc.start()
+    objs = [factory() for _ in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return size / count
+
+
+def timing(factory, count):
+    start = time.perf_counter()
+    for _ in range(count):
+        factory()
+    return (time.perf_counter() - start) / count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=256)
+    args = parser.parse_args()
+
+    batch = [f'chunk {i}' for i in range(args.batch)]
+    cases = {
+        'Symbol(str)':           lambda: Symbol('text'),
+        'Symbol(Symbol)':        lambda: Symbol(Symbol('text')),
+        f'Symbol(list[{args.batch}])': lambda: Symbol(batch),
+        f'Symbol(list[{args.batch}]).value': lambda: Symbol(batch).value,
+    }
+    print(f"{'case':<28} {'bytes/object':>14} {'us/object':>10}")
+    for name, factory in cases.items():
+        size = footprint(factory, args.count if 'list' not in name else args.count // 100)
+        secs = timing(factory, args.count if 'list' not in name else args.count // 100)
+        print(f"{name:<28} {size:>14.1f} {secs * 1e6:>10.3f}")
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from symai import Expression, Symbol, core
+from symai.backend.base import Engine
+from symai.backend.cache import InMemoryCache
+from symai.backend.ratelimit import RateLimiter
+
+
+class AsyncEchoEngine(Engine):
+    cacheable = True
+
+    def __init__(self, delay: float = 0.2):
+        super().__init__()
+        self.delay      = delay
+        self.calls      = []
+        self.running    = 0
+        self.concurrent = 0
+        self._lock      = threading.Lock()
+
+    def forward(self, prompts, *args, **kwargs):
+        raise AssertionError('the async path must not call the blocking forward')
+
+    async def aforward(self, prompts, *args, **kwargs):
+        await self._athrottle(len(prompts[0]))
+        with self._lock:
+            self.calls.append(prompts[0])
+            self.running   += 1
+            self.concurrent = max(self.concurrent, self.running)
+        await asyncio.sleep(self.delay)
+        with self._lock:
+            self.running -= 1
+        return [f'{prompts[0]}!'], {}
+
+    def prepare(self, args, kwargs, wrp_params):
+        wrp_params['prompts'] = [str(wrp_params['wrp_self'])]
+
+
+class BlockingEmbeddingEngine(Engine):
+    def __init__(self):
+        super().__init__()
+        self.threads = set()
+
+    def forward(self, prompts, *args, **kwargs):
+        self.threads.add(threading.get_ident())
+        return [[[float(len(p)), 1.] for p in prompts]], {}
+
+    def prepare(self, args, kwargs, wrp_params):
+        wrp_params['prompts'] = wrp_params['entries']
+
+
+class Greeter(Expression):
+    @core.zero_shot(prompt='Greet the user.')
+    async def agreet(self) -> str:
+        pass
+
+    @core.zero_shot(prompt='Greet the user.')
+    def greet(self) -> str:
+        pass
+
+
+class TestEngineAcall(unittest.TestCase):
+    def test_acall_honors_the_cache(self):
+        engine       = AsyncEchoEngine(delay=0.)
+        engine.cache = InMemoryCache()
+        async def _run():
+            first  = await engine.__acall__(prompts=['a'])
+            second = await engine.__acall__(prompts=['a'])
+            return first, second
+        (res1, meta1), (res2, meta2) = asyncio.run(_run())
+        self.assertEqual(res1, res2)
+        self.assertEqual(engine.calls, ['a'])
+        self.assertNotIn('cached', meta1)
+        self.assertTrue(meta2['cached'])
+
+    def test_default_aforward_runs_the_blocking_forward_in_a_thread(self):
+        engine = BlockingEmbeddingEngine()
+        res, _ = asyncio.run(engine.__acall__(prompts=['ab', 'c']))
+        self.assertEqual(res, [[[2., 1.], [1., 1.]]])
+        self.assertNotIn(threading.get_ident(), engine.threads)
+
+
+class TestAsyncDispatch(unittest.TestCase):
+    def test_concurrent_primitives_share_the_event_loop(self):
+        engine            = AsyncEchoEngine(delay=0.2)
+        engine.rate_limit = RateLimiter(rpm=10_000, tpm=1_000_000)
+        async def _run():
+            return await asyncio.gather(*[Symbol(f'text {i}').aquery('Repeat.') for i in range(5)])
+        with Expression.setup({'neurosymbolic': engine}, scoped=True):
+            start = time.time()
+            res   = asyncio.run(_run())
+        # the five queries wait for the engine at the same time instead of one after another
+        self.assertLess(time.time() - start, 0.8)
+        self.assertEqual(engine.concurrent, 5)
+        self.assertEqual(sorted([str(r) for r in res]), sorted([f'{c}!' for c in engine.calls]))
+        # every request passes the rate limiter
+        self.assertEqual(engine.rate_limit.stats()['requests'], 5)
+        self.assertEqual(engine.rate_limit.stats()['tokens'], sum([len(c) for c in engine.calls]))
+
+    def test_async_primitives_honor_the_cache(self):
+        engine       = AsyncEchoEngine(delay=0.)
+        engine.cache = InMemoryCache()
+        async def _run():
+            sym = Symbol('same text')
+            return [await sym.asummarize(), await sym.asummarize(), await sym.aequals('other')]
+        with Expression.setup({'neurosymbolic': engine}, scoped=True):
+            summary, cached, _ = asyncio.run(_run())
+        self.assertEqual(str(summary), str(cached))
+        self.assertEqual(len(engine.calls), 2)
+        self.assertEqual(engine.cache.stats()['hits'], 1)
+
+    def test_coroutine_decorators_dispatch_to_the_async_functions(self):
+        engine   = AsyncEchoEngine(delay=0.)
+        greeter  = Greeter('Ada')
+        with Expression.setup({'neurosymbolic': engine}, scoped=True):
+            coro = greeter.agreet()
+            self.assertTrue(asyncio.iscoroutine(coro))
+            self.assertEqual(asyncio.run(coro), f'{engine.calls[0]}!')
+            # the synchronous branch of the same decorator calls the blocking forward
+            with self.assertRaises(AssertionError):
+                greeter.greet()
+
+    def test_async_embedding(self):
+        engine = BlockingEmbeddingEngine()
+        with Expression.setup({'embedding': engine}, scoped=True):
+            res = asyncio.run(Symbol(['ab', 'c']).aembed())
+        self.assertEqual(res.value, [[2., 1.], [1., 1.]])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+import contextvars
+import threading
+import time
+import unittest
+from unittest import mock
+
+from symai import Expression, Symbol
+from symai.backend.base import Engine
+from symai.backend.batching import BatchScheduler
+from symai.backend.cache import InMemoryCache
+from symai.backend.engine_gptX_completion import GPTXCompletionEngine
+from symai.utils import thread_map
+
+
+class EchoEngine(Engine):
+    cacheable = True
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+        self._lock   = threading.Lock()
+
+    def forward(self, prompts, *args, **kwargs):
+        return [f'{prompts[0]}!'], {}
+
+    def batch_forward(self, wrp_params_list):
+        with self._lock:
+            self.batches.append([kwds['prompts'][0] for kwds in wrp_params_list])
+        return [self.forward(**kwds) for kwds in wrp_params_list]
+
+    def prepare(self, args, kwargs, wrp_params):
+        wrp_params['prompts'] = [str(wrp_params['wrp_self'])]
+
+
+class TestThreadMap(unittest.TestCase):
+    def test_keeps_the_input_order(self):
+        def _delayed(i):
+            time.sleep(0.01 * (5 - i))
+            return i
+        self.assertEqual(list(thread_map(_delayed, range(6), workers=3)), list(range(6)))
+        self.assertEqual(sorted(thread_map(_delayed, range(6), workers=3, ordered=False)), list(range(6)))
+
+    def test_bounded_window(self):
+        consumed = []
+        def _items():
+            for i in range(100):
+                consumed.append(i)
+                yield i
+        results = thread_map(lambda i: i, _items(), workers=2)
+        self.assertEqual(next(results), 0)
+        # at most twice the number of workers are in flight, the remaining items are not consumed yet
+        self.assertLessEqual(len(consumed), 5)
+        self.assertEqual(list(results), list(range(1, 100)))
+
+    def test_copies_the_context(self):
+        var = contextvars.ContextVar('var', default=None)
+        var.set('caller')
+        self.assertEqual(list(thread_map(lambda _: var.get(), range(4), workers=2)), ['caller'] * 4)
+
+
+class TestBatchScheduler(unittest.TestCase):
+    def _submit(self, scheduler, engine, prompts):
+        results = [None] * len(prompts)
+        def _run(i):
+            results[i] = scheduler.submit(engine, {'prompts': [prompts[i]]})
+        threads = [threading.Thread(target=contextvars.copy_context().run, args=(_run, i)) for i in range(len(prompts))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_leader_flushes_a_full_batch(self):
+        engine    = EchoEngine()
+        scheduler = BatchScheduler(max_batch_size=4, max_wait=10.)
+        start     = time.time()
+        results   = self._submit(scheduler, engine, ['a', 'b', 'c', 'd'])
+        # the batch is dispatched as soon as it is full, without waiting for max_wait
+        self.assertLess(time.time() - start, 5.)
+        self.assertEqual(len(engine.batches), 1)
+        self.assertEqual(sorted(engine.batches[0]), ['a', 'b', 'c', 'd'])
+        self.assertEqual([res[0][0] for res in results], ['a!', 'b!', 'c!', 'd!'])
+
+    def test_leader_flushes_after_max_wait(self):
+        engine    = EchoEngine()
+        scheduler = BatchScheduler(max_batch_size=8, max_wait=0.2)
+        results   = self._submit(scheduler, engine, ['a', 'b', 'c'])
+        self.assertEqual(sum([len(batch) for batch in engine.batches]), 3)
+        self.assertEqual([res[0][0] for res in results], ['a!', 'b!', 'c!'])
+
+    def test_engine_batch_dispatches_only_cache_misses(self):
+        engine       = EchoEngine()
+        engine.cache = InMemoryCache()
+        self.assertEqual([res[0] for res, _ in engine.batch([{'prompts': ['a']}, {'prompts': ['b']}])], ['a!', 'b!'])
+        res = engine.batch([{'prompts': ['b']}, {'prompts': ['c']}, {'prompts': ['a']}])
+        self.assertEqual(engine.batches, [['a', 'b'], ['c']])
+        self.assertEqual([r[0] for r, _ in res], ['b!', 'c!', 'a!'])
+        self.assertEqual([m.get('cached', False) for _, m in res], [True, False, True])
+
+
+class TestSymbolBatch(unittest.TestCase):
+    def test_requests_are_packed_into_engine_batches(self):
+        engine = EchoEngine()
+        with Expression.setup({'neurosymbolic': engine}, scoped=True):
+            res = Symbol(['x', 'y', 'z']).batch(lambda sym: sym.query('?'), batch_size=8)
+        self.assertEqual([str(r) for r in res.value], ['x!', 'y!', 'z!'])
+        self.assertEqual(sum([len(batch) for batch in engine.batches]), 3)
+        self.assertLess(len(engine.batches), 3)
+
+
+class TestCompletionBatchForward(unittest.TestCase):
+    def test_explicit_max_tokens_are_not_merged(self):
+        class Tokenizer:
+            def encode(self, text, **kwargs):
+                return text.split()
+        engine            = GPTXCompletionEngine.__new__(GPTXCompletionEngine)
+        engine.api_key    = None
+        engine.model      = 'text-davinci-003'
+        engine.max_tokens = 100
+        engine.tokenizer  = Tokenizer()
+        engine.rate_limit = None
+        calls             = []
+        def _create(**params):
+            calls.append((list(params['prompt']), params['max_tokens']))
+            return {'choices': [{'index': i, 'text': p} for i, p in enumerate(params['prompt'])], 'usage': {}}
+
+        with mock.patch('openai.Completion.create', side_effect=_create):
+            outputs = engine.batch_forward([
+                {'prompts': ['one'], 'max_tokens': 10},
+                {'prompts': ['two'], 'max_tokens': 50},
+                {'prompts': ['three words here']},
+                {'prompts': ['four']},
+            ])
+        self.assertEqual([out[0][0] for out in outputs], ['one', 'two', 'three words here', 'four'])
+        self.assertEqual(sorted(calls), sorted([
+            (['one'], 10),
+            (['two'], 50),
+            # only the remaining context of requests without max_tokens is shared
+            (['three words here', 'four'], engine.compute_remaining_tokens(['three words here']))
+        ]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import os
+import tempfile
+import unittest
+
+from symai.backend.cache import (EmbeddingCache, FileTextCache, InMemoryCache,
+                                 ResponseCache, SQLiteCache)
+from symai.utils import CachedTokenizer
+
+
+class TestResponseCache(unittest.TestCase):
+    def test_key_depends_on_prompts_and_params(self):
+        class Engine:
+            model = 'gpt-3.5-turbo'
+        engine = Engine()
+        k1 = ResponseCache.key(engine, {'prompts': ['hello'], 'temperature': 0})
+        k2 = ResponseCache.key(engine, {'prompts': ['hello'], 'temperature': 0, 'func': object()})
+        k3 = ResponseCache.key(engine, {'prompts': ['hello'], 'temperature': 1})
+        k4 = ResponseCache.key(engine, {'prompts': ['world'], 'temperature': 0})
+        self.assertEqual(k1, k2)
+        self.assertNotEqual(k1, k3)
+        self.assertNotEqual(k1, k4)
+
+    def test_in_memory_lru_eviction(self):
+        cache = InMemoryCache(max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 1)
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_ttl_expiry(self):
+        cache = InMemoryCache(ttl=-1)
+        cache.set('a', 1)
+        self.assertIsNone(cache.get('a'))
+
+    def test_sqlite_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path  = os.path.join(tmp, 'responses.db')
+            cache = SQLiteCache(path, max_size=2)
+            cache.set('a', ['hello'])
+            cache.set('b', ['world'])
+            cache.set('c', ['!'])
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(SQLiteCache(path).get('c'), ['!'])
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def test_only_misses_are_returned_empty(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(tmp)
+            cache.put('ada', ['a', 'b'], [[1., 0.], [0., 1.]])
+            res = cache.get('ada', ['b', 'c', 'a'])
+            self.assertEqual(res[0], [0., 1.])
+            self.assertIsNone(res[1])
+            self.assertEqual(res[2], [1., 0.])
+            self.assertEqual(cache.get('babbage', ['a']), [None])
+
+    def test_memmap_reopen_and_growth(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = EmbeddingCache(tmp)
+            texts = [f'text {i}' for i in range(2500)]
+            cache.put('ada', texts, [[float(i), 1.] for i in range(2500)])
+            res = EmbeddingCache(tmp).get('ada', ['text 2499', 'text 7'])
+            self.assertEqual(res, [[2499., 1.], [7., 1.]])
+
+
+class TestFileTextCache(unittest.TestCase):
+    def test_invalidated_by_modification(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path  = os.path.join(tmp, 'doc.txt')
+            cache = FileTextCache(os.path.join(tmp, 'files.db'))
+            with open(path, 'w') as f:
+                f.write('first')
+            self.assertIsNone(cache.get(path))
+            cache.put(path, 'first')
+            self.assertEqual(FileTextCache(os.path.join(tmp, 'files.db')).get(path), 'first')
+            with open(path, 'w') as f:
+                f.write('second version')
+            self.assertIsNone(cache.get(path))
+
+    def test_variants_and_eviction(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f'doc{i}.txt') for i in range(3)]
+            for path in paths:
+                with open(path, 'w') as f:
+                    f.write(path)
+            cache = FileTextCache(os.path.join(tmp, 'files.db'), max_chars=10)
+            cache.put(paths[0], 'full')
+            cache.put(paths[0], 'page', variant='range')
+            self.assertEqual((cache.get(paths[0]), cache.get(paths[0], 'range')), ('full', 'page'))
+            cache.get(paths[0])
+            # the least recently used entries are evicted once the texts exceed `max_chars`
+            cache.put(paths[1], 'second')
+            self.assertEqual(len(cache), 2)
+            self.assertEqual(cache.get(paths[0]), 'full')
+            self.assertIsNone(cache.get(paths[0], 'range'))
+            cache.put(paths[2], 'x' * 20)
+            self.assertEqual(len(cache), 0)
+
+    def test_file_merger_caches_reader_arguments_separately(self):
+        from symai import Symbol
+        from symai.extended import FileMerger
+        with tempfile.TemporaryDirectory() as tmp:
+            path   = os.path.join(tmp, 'doc.txt')
+            with open(path, 'w') as f:
+                f.write('content')
+            merger = FileMerger(cache=FileTextCache(os.path.join(tmp, 'files.db')))
+            merger.reader = lambda file_path, **kwargs: Symbol(f'{file_path}:{kwargs}')
+            self.assertEqual(merger.read(path), f'{path}:{{}}')
+            self.assertEqual(merger.read(path, range=(0, 1)), f"{path}:{{'range': (0, 1)}}")
+            self.assertEqual(merger.read(path), f'{path}:{{}}')
+            self.assertEqual(merger.cache.hits, 1)
+
+
+class TestCachedTokenizer(unittest.TestCase):
+    def test_encode_is_memoized(self):
+        class Tokenizer:
+            calls = 0
+            def encode(self, text, **kwargs):
+                Tokenizer.calls += 1
+                return [ord(c) for c in text]
+        tokenizer = CachedTokenizer(Tokenizer())
+        tokens    = tokenizer.encode('abc', disallowed_special=())
+        tokens.append(0) # callers get a copy of the cached tokens
+        self.assertEqual(tokenizer.encode('abc', disallowed_special=()), [97, 98, 99])
+        self.assertEqual(Tokenizer.calls, 1)
+        tokenizer.encode('abc', allowed_special=set())
+        self.assertEqual(Tokenizer.calls, 2)
+        # long texts are encoded without memoizing them
+        document = 'x' * 20
+        tokenizer = CachedTokenizer(Tokenizer(), max_chars=10)
+        self.assertEqual(tokenizer.encode(document), tokenizer.encode(document))
+        self.assertEqual(Tokenizer.calls, 4)
+        self.assertEqual(tokenizer.cache_info().currsize, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
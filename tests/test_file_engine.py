@@ -0,0 +1,97 @@
+import hashlib
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from symai.backend.cache import SQLiteCache
+from symai.backend.engine_file import FileEngine, _file_digest
+
+
+def make_pdf(path, n_pages):
+    # minimal PDF with one line of text per page
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None, '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids    = []
+    for i in range(n_pages):
+        stream = f'BT /F1 12 Tf 72 720 Td (Page {i}) Tj ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R /Resources << /Font << /F1 3 0 R >> >> >>')
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {n_pages} >>'
+    out, offsets = b'%PDF-1.4\n', []
+    for i, obj in enumerate(objects):
+        offsets.append(len(out))
+        out += f'{i + 1} 0 obj\n{obj}\nendobj\n'.encode()
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    out += ''.join([f'{o:010d} 00000 n \n' for o in offsets]).encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+class TestFileEngine(unittest.TestCase):
+    def test_parallel_pdf_extraction_and_cache(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'doc.pdf')
+            make_pdf(path, 40)
+            engine = FileEngine(workers=2, min_pages_per_worker=8)
+            engine.pdf_cache = SQLiteCache(os.path.join(tmp, 'pdf.db'))
+
+            self.assertEqual(engine.read_pdf(path, slice(3, 6)), 'Page 3Page 4Page 5')
+            text = engine.read_pdf(path, None)
+            self.assertEqual(text, ''.join([f'Page {i}' for i in range(40)]))
+            self.assertEqual(engine.read_pdf(path, slice(-2, None)), 'Page 38Page 39')
+            self.assertEqual(engine.pdf_cache.stats()['hits'], 2)
+            engine.close()
+
+    def test_concurrent_reads_share_one_process_pool(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, f'doc{i}.pdf') for i in range(3)]
+            for i, path in enumerate(paths):
+                make_pdf(path, 20 + i)
+            engine = FileEngine(workers=2, min_pages_per_worker=4)
+            engine.pdf_cache = SQLiteCache(os.path.join(tmp, 'pdf.db'))
+            try:
+                with ThreadPoolExecutor(max_workers=3) as executor:
+                    texts = list(executor.map(lambda path: engine.read_pdf(path, None), paths))
+                pool = engine._pool
+                self.assertEqual(texts, [''.join([f'Page {j}' for j in range(20 + i)]) for i in range(3)])
+                # all calls share the lazily created pool, which never holds more than `workers` processes
+                self.assertIsNotNone(pool)
+                self.assertLessEqual(len(pool._processes), 2)
+                self.assertEqual(pool._mp_context.get_start_method(), 'spawn')
+            finally:
+                engine.close()
+            self.assertIsNone(engine._pool)
+            with open(paths[0], 'rb') as f:
+                self.assertEqual(_file_digest(paths[0], block_size=64), hashlib.sha256(f.read()).hexdigest())
+
+    def test_in_process_extraction_by_default_and_on_pool_failure(self):
+        class BrokenPool:
+            def map(self, *args):
+                raise BrokenProcessPool('worker failed to start')
+            def shutdown(self, *args, **kwargs):
+                pass
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'doc.pdf')
+            make_pdf(path, 40)
+            expected = ''.join([f'Page {i}' for i in range(40)])
+            engine = FileEngine(min_pages_per_worker=4)
+            engine.pdf_cache = SQLiteCache(os.path.join(tmp, 'pdf.db'))
+            self.assertEqual(engine.read_pdf(path, None), expected)
+            self.assertIsNone(engine._pool)
+
+            engine = FileEngine(workers=4, min_pages_per_worker=4)
+            engine.pdf_cache = SQLiteCache(os.path.join(tmp, 'pdf2.db'))
+            engine._pool     = BrokenPool()
+            with self.assertWarns(UserWarning):
+                self.assertEqual(engine.read_pdf(path, None), expected)
+            self.assertEqual(engine.workers, 0)
+            self.assertIsNone(engine._pool)
+
+
+if __name__ == '__main__':
+    unittest.main()
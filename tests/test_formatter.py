@@ -0,0 +1,43 @@
+import random
+import unittest
+
+from symai.formatter import BinPacker
+
+
+class CharTokenizer:
+    def encode(self, text, **kwargs):
+        return [ord(c) for c in text]
+
+    def decode(self, tokens):
+        return ''.join(map(chr, tokens))
+
+
+class TestBinPacker(unittest.TestCase):
+    def test_packs_sentences_within_limit(self):
+        packer = BinPacker(max_tokens=30, tokenizer=CharTokenizer())
+        text   = 'First sentence here. Second one is here. Third! ' + 'x' * 70 + '. Last one.'
+        chunks = packer.pack(text)
+        self.assertEqual(chunks[:2], ['First sentence here. \n', 'Second one is here. Third! \n'])
+        self.assertTrue(all([len(c.rstrip('\n')) <= 30 for c in chunks]))
+        self.assertEqual(''.join([c[:-1] for c in chunks]).replace(' ', ''), text.replace(' ', ''))
+        self.assertEqual(packer.pack('Short text.'), ['Short text.'])
+
+    def test_overlap_repeats_trailing_sentences(self):
+        packer = BinPacker(max_tokens=20, overlap=8, tokenizer=CharTokenizer())
+        chunks = packer.pack('Aaaa. Bbbb. Cccc. Dddd. Eeee.')
+        self.assertEqual(chunks, ['Aaaa. Bbbb. Cccc. \n', 'Cccc. Dddd. Eeee.\n'])
+
+    def test_chunks_with_separator_stay_within_limit(self):
+        rng       = random.Random(0)
+        tokenizer = CharTokenizer()
+        for _ in range(300):
+            words  = [''.join(rng.choice('abc') for _ in range(rng.randint(1, 40))) + rng.choice(['', '.', '!', '\n'])
+                      for _ in range(rng.randint(1, 60))]
+            text   = ' '.join(words)
+            limit  = rng.randint(4, 60)
+            chunks = BinPacker(max_tokens=limit, overlap=rng.randint(0, 10), tokenizer=tokenizer).pack(text)
+            self.assertTrue(all([len(tokenizer.encode(c)) <= limit for c in chunks]), (limit, chunks))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import threading
+import unittest
+
+from symai import Expression, LazyGraph, Symbol
+from symai.backend.base import Engine
+
+
+class EchoEngine(Engine):
+    def __init__(self):
+        super().__init__()
+        self.calls   = []
+        self.active  = 0
+        self.peak    = 0
+        # calls which must run at the same time wait for each other at the barrier
+        self.barrier = None
+        self._lock   = threading.Lock()
+
+    def forward(self, prompts, *args, **kwargs):
+        with self._lock:
+            self.calls.append(prompts[0])
+            self.active += 1
+            self.peak    = max(self.peak, self.active)
+        if self.barrier is not None:
+            self.barrier.wait()
+        with self._lock:
+            self.active -= 1
+        return [prompts[0].upper()], {}
+
+    def prepare(self, args, kwargs, wrp_params):
+        wrp_params['prompts'] = [str(wrp_params['wrp_self'])]
+
+
+class TestLazyGraph(unittest.TestCase):
+    def test_deduplicates_and_parallelizes(self):
+        engine         = EchoEngine()
+        engine.barrier = threading.Barrier(2, timeout=10)
+        graph          = LazyGraph(workers=4)
+        with Expression.setup({'neurosymbolic': engine}, scoped=True):
+            a = Symbol('alpha').lazy(graph).summarize()
+            b = Symbol('beta').lazy(graph).summarize()
+            c = Symbol('alpha').lazy(graph).summarize()
+            self.assertIs(a, c)
+            self.assertEqual(engine.calls, [])
+
+            joined = a.apply(lambda x, y: Symbol(f'{x} {y}'), b)
+            self.assertEqual(joined.value, 'ALPHA BETA')
+            self.assertEqual(sorted(engine.calls), ['alpha', 'beta'])
+            self.assertEqual(engine.peak, 2)
+            engine.barrier = None
+
+            # memoized results are not computed again
+            self.assertEqual(str(c.evaluate()), 'ALPHA')
+            self.assertEqual(graph.evaluate(a.summarize(), b)[1].value, 'BETA')
+            self.assertEqual(sorted(engine.calls), ['ALPHA', 'alpha', 'beta'])
+
+    def test_errors_propagate_and_bool_is_undefined(self):
+        graph = LazyGraph()
+        node  = Symbol('x').lazy(graph).apply(lambda x: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            node.evaluate()
+        with self.assertRaises(TypeError):
+            bool(node == 'x')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from symai.backend.lexical import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+class TestBM25Index(unittest.TestCase):
+    def test_ranks_exact_identifiers_first(self):
+        self.assertEqual(tokenize('def index_top_k():'), ['def', 'index_top_k', 'index', 'top', 'k'])
+        with tempfile.TemporaryDirectory() as tmp:
+            index = BM25Index(Path(tmp) / 'lexical.db')
+            index.add('a', 'The index returns the top results.')
+            index.add('b', 'kwargs["index_top_k"] limits the number of matches.')
+            index.add('c', 'Unrelated paragraph about tokenizers.')
+            self.assertEqual(index.search('index_top_k')[0][0], 'b')
+            index.remove('b')
+            index.save()
+            index.add('d', 'Uncommitted index_top_k chunk.')
+
+            reloaded = BM25Index(Path(tmp) / 'lexical.db')
+            self.assertEqual(len(reloaded), 2)
+            self.assertEqual([id_ for id_, _ in reloaded.search('index_top_k')], ['a'])
+
+    def test_reciprocal_rank_fusion(self):
+        fused = reciprocal_rank_fusion([['a', 'b', 'c'], ['b', 'd']])
+        self.assertEqual([id_ for id_, _ in fused][:2], ['b', 'a'])
+        self.assertEqual(len(fused), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
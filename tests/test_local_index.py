@@ -0,0 +1,154 @@
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from symai import Expression, Indexer
+from symai.backend.base import Engine
+from symai.backend.engine_local_index import LocalIndexEngine
+from symai.backend.lexical import BM25Index
+from symai.backend.index_store import SegmentStore
+
+
+class TestLocalIndexEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng      = np.random.default_rng(42)
+        self.vectors = rng.normal(size=(300, 16)).astype(np.float32)
+        self.data    = [(f'vec-{i}', v.tolist(), {'text': f'text {i}'}) for i, v in enumerate(self.vectors)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _engine(self, **kwargs):
+        return LocalIndexEngine(index_name='test', index_dims=16, path=self.tmp.name, **kwargs)
+
+    def test_search_matches_bruteforce(self):
+        engine = self._engine(index_top_k=3)
+        engine.forward(operation='add', prompt=self.data)
+        query  = self.vectors[7] + 0.01
+        (rsp,), _ = engine.forward(operation='search', prompt=query.tolist())
+        expected  = self.vectors @ query / (np.linalg.norm(self.vectors, axis=1) * np.linalg.norm(query))
+        self.assertEqual([m['id'] for m in rsp['matches']], [f'vec-{i}' for i in np.argsort(-expected)[:3]])
+        self.assertEqual(rsp['matches'][0]['metadata']['text'], 'text 7')
+        self.assertIsInstance(rsp['matches'][0]['score'], float)
+
+    def test_upsert_delete_and_persistence(self):
+        engine = self._engine(index_metric='euclidean')
+        engine.forward(operation='add', prompt=self.data)
+        engine.forward(operation='add', prompt=[('vec-0', self.vectors[1].tolist(), {'text': 'updated'})])
+        engine._delete(['vec-1'])
+
+        reloaded  = self._engine(index_metric='euclidean')
+        (rsp,), _ = reloaded.forward(operation='search', prompt=self.vectors[1].tolist(), index_top_k=1)
+        self.assertEqual(rsp['matches'][0]['id'], 'vec-0')
+        self.assertEqual(rsp['matches'][0]['metadata']['text'], 'updated')
+        self.assertAlmostEqual(rsp['matches'][0]['score'], 0., places=4)
+        self.assertEqual(reloaded.size, 299)
+
+        reloaded.forward(operation='config', prompt=None, index_del=True)
+        self.assertEqual(self._engine().forward(operation='search', prompt=self.vectors[0].tolist())[0][0]['matches'], [])
+
+    def test_ivf_finds_exact_neighbour(self):
+        engine = self._engine(index_nlist=8, index_nprobe=2, index_top_k=1)
+        engine.forward(operation='add', prompt=self.data)
+        self.assertIsNotNone(engine._centroids)
+        for i in [0, 50, 150]:
+            (rsp,), _ = engine.forward(operation='search', prompt=self.vectors[i].tolist())
+            self.assertEqual(rsp['matches'][0]['id'], f'vec-{i}')
+
+
+class TestSegmentStore(unittest.TestCase):
+    def test_compaction_keeps_live_rows(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store   = SegmentStore(tmp, dims=4, max_segments=100, background=False)
+            vectors = np.arange(40, dtype=np.float32).reshape(10, 4)
+            for i in range(10):
+                store.append([f'id-{i}'], vectors[i:i+1], [{'text': f'ünïcode {i}'}])
+            store.append(['id-3'], vectors[:1], [{'text': 'updated'}])
+            store.delete(['id-5', 'missing'])
+            self.assertEqual(len(store.segments()), 11)
+
+            store.compact()
+            segments = store.segments()
+            self.assertEqual(len(segments), 1)
+            self.assertEqual(segments[0].count, 9)
+            self.assertEqual(len(os.listdir(tmp)), 6) # manifest and the files of one segment
+
+            reopened = SegmentStore(tmp, dims=4)
+            segment  = reopened.segments()[0]
+            records  = {segment.record(r)['id']: (segment.record(r)['metadata']['text'], segment.vectors[r].tolist()) for r in range(segment.count)}
+            self.assertNotIn('id-5', records)
+            self.assertEqual(records['id-3'], ('updated', vectors[0].tolist()))
+            self.assertEqual(records['id-9'], ('ünïcode 9', vectors[9].tolist()))
+
+
+class TestIncrementalIndexing(unittest.TestCase):
+    def test_only_changed_chunks_are_embedded(self):
+        embedded = []
+        class EmbeddingEngine(Engine):
+            def forward(self, prompts, *args, **kwargs):
+                embedded.extend(prompts)
+                return [[[float(len(p)), float(sum(map(ord, p)) % 97), 1.] for p in prompts]], {}
+            def prepare(self, args, kwargs, wrp_params):
+                wrp_params['prompts'] = wrp_params['entries']
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index   = LocalIndexEngine(index_name='docs', index_dims=3, path=tmp)
+            indexer = Indexer(formatter=lambda data: Expression(data.value.split('\n')), batch_size=2, workers=2)
+            indexer.ledger_path = Path(tmp) / 'hashes.json'
+            indexer.lexical     = BM25Index(Path(tmp) / 'lexical.db')
+            with Expression.setup({'embedding': EmbeddingEngine(), 'index': index}, scoped=True):
+                indexer('alpha\nbeta\ngamma\ndelta\nepsilon', document='doc.md')
+                self.assertEqual(sorted(embedded), ['alpha', 'beta', 'delta', 'epsilon', 'gamma'])
+                self.assertEqual(index.size, 5)
+                embedded.clear()
+                stats = indexer.update(['alpha', 'beta v2'], document='doc.md')
+
+            self.assertEqual(embedded, ['beta v2'])
+            self.assertEqual(stats, {'added': 1, 'deleted': 4, 'unchanged': 1})
+
+            # the ledger is kept in memory and only written when the chunks of a document changed
+            os.remove(indexer.ledger_path)
+            with Expression.setup({'embedding': EmbeddingEngine(), 'index': index}, scoped=True):
+                self.assertEqual(indexer.update(['beta v2', 'alpha'], document='doc.md'), {'added': 0, 'deleted': 0, 'unchanged': 2})
+            self.assertFalse(indexer.ledger_path.exists())
+            self.assertEqual(index.size, 2)
+            # chunks which were only found by BM25 are looked up in the vector index
+            with Expression.setup({'index': index}, scoped=True):
+                self.assertEqual(indexer._fuse('beta', []), ['beta v2'])
+
+
+    def test_updates_are_persisted_once_per_block(self):
+        class EmbeddingEngine(Engine):
+            def forward(self, prompts, *args, **kwargs):
+                return [[[float(len(p)), 1., 1.] for p in prompts]], {}
+            def prepare(self, args, kwargs, wrp_params):
+                wrp_params['prompts'] = wrp_params['entries']
+
+        with tempfile.TemporaryDirectory() as tmp:
+            index   = LocalIndexEngine(index_name='docs', index_dims=3, path=tmp)
+            indexer = Indexer()
+            indexer.ledger_path = Path(tmp) / 'hashes.json'
+            indexer.lexical     = BM25Index(Path(tmp) / 'lexical.db')
+            saves   = []
+            save    = indexer._save_ledger
+            indexer._save_ledger = lambda ledger: saves.append(1) or save(ledger)
+            with Expression.setup({'embedding': EmbeddingEngine(), 'index': index}, scoped=True):
+                with indexer:
+                    for i in range(3):
+                        indexer.update([f'file {i}', 'shared'], document=f'file-{i}.py', progress=False)
+                    self.assertFalse(indexer.ledger_path.exists())
+                    self.assertEqual(len(BM25Index(Path(tmp) / 'lexical.db')), 0)
+
+            self.assertEqual(len(saves), 1)
+            self.assertEqual(sorted(json.load(open(indexer.ledger_path))), ['file-0.py', 'file-1.py', 'file-2.py'])
+            self.assertEqual(len(BM25Index(Path(tmp) / 'lexical.db')), 6)
+            self.assertEqual(index.size, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import threading
+import time
+import unittest
+
+from symai import Expression, Symbol
+from symai.components import All, Any, Parallel, Sequence
+
+
+class Check(Expression):
+    def __init__(self, result, delay, calls):
+        super().__init__()
+        self.result = result
+        self.delay  = delay
+        self.calls  = calls
+
+    def forward(self, sym, **kwargs):
+        time.sleep(self.delay)
+        self.calls.append(self.result)
+        return Symbol(self.result)
+
+
+class TestFanOut(unittest.TestCase):
+    def test_any_and_all_short_circuit(self):
+        calls = []
+        start = time.time()
+        res   = Any(Check(False, .05, calls), Check(True, .01, calls), Check(False, .5, calls))('item')
+        self.assertTrue(res.value)
+        self.assertLess(time.time() - start, .3)
+
+        start = time.time()
+        res   = All(Check(True, .05, calls), Check(False, .01, calls), Check(True, .5, calls))('item')
+        self.assertFalse(res.value)
+        self.assertLess(time.time() - start, .3)
+
+        self.assertFalse(Any(Check(False, 0, calls), Check(False, 0, calls))('item').value)
+        self.assertTrue(All(Check(True, 0, calls), Check(True, 0, calls), workers=1)('item').value)
+
+    def test_queued_checks_are_cancelled(self):
+        calls = []
+        res   = Any(Check(True, .01, calls), Check(False, .1, calls), Check(False, .1, calls), workers=1)('item')
+        self.assertTrue(res.value)
+        self.assertEqual(calls, [True])
+
+    def test_parallel_maps_a_sequence(self):
+        active = []
+        peak   = []
+        lock   = threading.Lock()
+        class Upper(Expression):
+            def forward(self, sym, **kwargs):
+                with lock:
+                    active.append(str(sym))
+                    peak.append(len(active))
+                time.sleep(.02)
+                with lock:
+                    active.remove(str(sym))
+                return Symbol(str(sym).upper())
+
+        pipeline = Parallel(Sequence(Upper(), Upper()), workers=3)
+        res      = pipeline([f'item {i}' for i in range(9)])
+        self.assertEqual(res.value, [f'ITEM {i}' for i in range(9)])
+        self.assertEqual(max(peak), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
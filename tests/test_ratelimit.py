@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from symai.backend.ratelimit import RateLimiter
+
+
+class TestRateLimiter(unittest.TestCase):
+    def test_token_budget_delays_requests(self):
+        limiter = RateLimiter(tpm=600) # refills 10 tokens per second
+        self.assertLess(limiter.acquire(600), 0.05)
+        self.assertGreater(limiter.acquire(5), 0.4)
+        self.assertEqual(limiter.stats()['requests'], 2)
+
+    def test_requests_are_served_in_arrival_order(self):
+        limiter = RateLimiter(rpm=600)
+        limiter._requests = 0
+        order   = []
+        def work(i):
+            limiter.acquire()
+            order.append(i)
+        threads = []
+        for i in range(4):
+            threads.append(threading.Thread(target=work, args=(i,)))
+            threads[-1].start()
+            while limiter.stats()['queue_depth'] <= i:
+                pass
+        [t.join() for t in threads]
+        self.assertEqual(order, [0, 1, 2, 3])
+        self.assertEqual(limiter.stats()['queue_depth'], 0)
+
+    def test_async_waits_do_not_occupy_executor_threads(self):
+        limiter = RateLimiter(rpm=600) # refills one request per 0.1 seconds
+        limiter._requests = 0
+        async def _run():
+            asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+            waits = asyncio.gather(*[limiter.aacquire() for _ in range(3)])
+            # the single executor thread is still free for blocking calls while the requests wait
+            self.assertEqual(await asyncio.wait_for(asyncio.to_thread(lambda: 'free'), 0.1), 'free')
+            return await waits
+        waits = asyncio.run(_run())
+        self.assertEqual(waits, sorted(waits))
+        self.assertGreater(waits[-1], 0.25)
+        self.assertEqual(limiter.stats()['requests'], 3)
+
+    def test_cancelled_requests_give_up_their_ticket(self):
+        limiter = RateLimiter(rpm=600)
+        limiter._requests = 0
+        async def _run():
+            first  = asyncio.create_task(limiter.aacquire())
+            second = asyncio.create_task(limiter.aacquire())
+            third  = asyncio.create_task(limiter.aacquire())
+            await asyncio.sleep(0.02)
+            first.cancel()
+            second.cancel()
+            waited = await third
+            return waited, first.cancelled(), second.cancelled()
+        waited, *cancelled = asyncio.run(_run())
+        self.assertEqual(cancelled, [True, True])
+        self.assertLess(waited, 0.2)
+        self.assertEqual(limiter.stats()['queue_depth'], 0)
+        # a synchronous caller is served next, it does not wait for the cancelled tickets
+        self.assertLess(limiter.acquire(), 0.2)
+
+
+if __name__ == '__main__':
+    unittest.main()
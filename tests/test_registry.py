@@ -0,0 +1,43 @@
+import threading
+import unittest
+
+from symai.backend.registry import EngineRegistry
+
+
+class TestEngineRegistry(unittest.TestCase):
+    def test_lazy_init_runs_once(self):
+        registry = EngineRegistry()
+        calls    = []
+        def factory():
+            calls.append(1)
+            return object()
+        threads = [threading.Thread(target=registry.get, args=('neurosymbolic', factory)) for _ in range(8)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        self.assertEqual(len(calls), 1)
+
+    def test_scope_is_context_local(self):
+        registry = EngineRegistry()
+        registry.register('neurosymbolic', 'default')
+        seen = {}
+        def work(tag):
+            with registry.scope({'neurosymbolic': tag}):
+                seen[tag] = registry.get('neurosymbolic')
+        threads = [threading.Thread(target=work, args=(f'tenant-{i}',)) for i in range(4)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+        self.assertEqual(seen, {f'tenant-{i}': f'tenant-{i}' for i in range(4)})
+        self.assertEqual(registry.get('neurosymbolic'), 'default')
+
+    def test_nested_scopes(self):
+        registry = EngineRegistry()
+        with registry.scope({'neurosymbolic': 'outer', 'embedding': 'outer'}):
+            with registry.scope({'neurosymbolic': 'inner'}):
+                self.assertEqual(registry.get('neurosymbolic'), 'inner')
+                self.assertEqual(registry.get('embedding'), 'outer')
+            self.assertEqual(registry.get('neurosymbolic'), 'outer')
+        self.assertIsNone(registry.get('neurosymbolic'))
+
+
+if __name__ == '__main__':
+    unittest.main()
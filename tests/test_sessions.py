@@ -0,0 +1,82 @@
+import socket
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from symai.backend.sessions import SessionPool
+
+
+class ScriptedHandler(BaseHTTPRequestHandler):
+    # the responses (status, headers) are served in order, the last one is repeated
+    script = []
+    hits   = []
+
+    def _respond(self):
+        self.hits.append(self.command)
+        status, headers = self.script[min(len(self.hits), len(self.script)) - 1]
+        body = b'ok' if status == 200 else b'error'
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        self._respond()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestSessionPool(unittest.TestCase):
+    def setUp(self):
+        ScriptedHandler.hits = []
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), ScriptedHandler)
+        self.url    = f'http://127.0.0.1:{self.server.server_address[1]}/predict'
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.pool   = SessionPool(retries=3, backoff_factor=0)
+
+    def tearDown(self):
+        self.pool.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_sessions_are_reused_per_host(self):
+        self.assertIs(self.pool.session(self.url), self.pool.session(self.url.replace('predict', 'other')))
+        self.assertIsNot(self.pool.session(self.url), self.pool.session('http://localhost:1/predict'))
+        # only the connection is bounded by default, responses may take as long as the engine needs
+        self.assertEqual(SessionPool().timeout, (5, None))
+
+    def test_post_is_retried_after_retry_after(self):
+        ScriptedHandler.script = [(429, {'Retry-After': '0'}), (503, {'Retry-After': '0'}), (200, {})]
+        rsp = self.pool.post(self.url, json={'prompt': 'hello'})
+        self.assertEqual(rsp.status_code, 200)
+        self.assertEqual(ScriptedHandler.hits, ['POST', 'POST', 'POST'])
+
+    def test_post_is_not_retried_on_other_errors(self):
+        for script in [[(500, {})], [(503, {})], [(502, {'Retry-After': '0'})]]:
+            ScriptedHandler.hits   = []
+            ScriptedHandler.script = script + [(200, {})]
+            rsp = self.pool.post(self.url, json={'prompt': 'hello'})
+            self.assertEqual(rsp.status_code, script[0][0])
+            self.assertEqual(ScriptedHandler.hits, ['POST'])
+
+    def test_connection_errors_are_retried(self):
+        with socket.socket() as sock:
+            sock.bind(('127.0.0.1', 0))
+            port = sock.getsockname()[1]
+        with self.assertRaises(requests.exceptions.ConnectionError) as ctx:
+            self.pool.post(f'http://127.0.0.1:{port}/predict', json={})
+        self.assertIn('Max retries exceeded', str(ctx.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from symai import Expression, SimilarityClassification, Symbol
+from symai.backend.base import Engine
+from symai.utils import similarity_matrix, top_k_indices
+
+
+class EmbeddingEngine(Engine):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def forward(self, prompts, *args, **kwargs):
+        self.calls += 1
+        return [[[float(p.count(c)) for c in 'abc'] for p in prompts]], {}
+
+    def prepare(self, args, kwargs, wrp_params):
+        wrp_params['prompts'] = wrp_params['entries']
+
+
+class TestSimilarity(unittest.TestCase):
+    def test_metrics(self):
+        a = np.array([[1., 0.], [3., 4.]])
+        b = np.array([[1., 0.], [0., 2.]])
+        np.testing.assert_allclose(similarity_matrix(a, b, 'cosine'), [[1., 0.], [.6, .8]], atol=1e-6)
+        np.testing.assert_allclose(similarity_matrix(a, b, 'dot'), [[1., 0.], [3., 8.]])
+        np.testing.assert_allclose(similarity_matrix(a, b, 'euclidean'), [[0., -5 ** .5], [-20 ** .5, -13 ** .5]], atol=1e-5)
+        np.testing.assert_allclose(similarity_matrix([[1, 1, 0]], [[1, 0, 1], [0, 0, 0]], 'jaccard'), [[1 / 3, 0.]])
+        self.assertEqual(top_k_indices(np.array([[.1, .9, .5, .7]]), 2).tolist(), [[1, 3]])
+
+        self.assertAlmostEqual(Symbol(np.array([3., 4.])).similarity(Symbol([4., 3.])), .96, places=5)
+        self.assertAlmostEqual(Symbol({'a', 'b'}).similarity(Symbol({'b', 'c'}), metric='jaccard'), 1 / 3)
+
+    def test_forward_batch_embeds_inputs_once(self):
+        engine     = EmbeddingEngine()
+        classifier = SimilarityClassification(['aaa', 'bbb', 'ccc'])
+        with Expression.setup({'embedding': engine}, scoped=True):
+            res = classifier.forward_batch(['ab a', 'cc', 'bbc b'])
+            self.assertEqual([str(r) for r in res], ['aaa', 'ccc', 'bbb'])
+            self.assertEqual(engine.calls, 2)
+            self.assertEqual(str(classifier('xcc')), 'ccc')
+            self.assertEqual(classifier('aab', top_k=2).value, ['aaa', 'bbb'])
+            self.assertEqual(engine.calls, 4)
+
+    def test_jaccard_needs_no_embeddings(self):
+        classifier = SimilarityClassification(['book a flight', 'cancel my order', 'track my order'], metric='jaccard')
+        res = classifier.forward_batch(['please cancel the order', 'track where my order is', 'flight to vienna'])
+        self.assertEqual([str(r) for r in res], ['cancel my order', 'track my order', 'book a flight'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import threading
+import time
+import unittest
+
+from symai import Expression, Stream, Symbol
+from symai.backend.base import Engine
+
+
+class CharTokenizer:
+    def encode(self, text, **kwargs):
+        return [ord(c) for c in text]
+
+    def decode(self, tokens):
+        return ''.join(map(chr, tokens))
+
+
+class TokenEngine(Engine):
+    def __init__(self):
+        super().__init__()
+        self.max_tokens = 10
+        self.tokenizer  = CharTokenizer()
+
+
+class TestStream(unittest.TestCase):
+    def test_chunks_are_evaluated_concurrently_in_order(self):
+        active = []
+        peak   = []
+        lock   = threading.Lock()
+        def expr(sym, preview=False, **kwargs):
+            if preview:
+                return sym
+            with lock:
+                active.append(sym)
+                peak.append(len(active))
+            # later chunks finish first
+            time.sleep(0.05 if str(sym).startswith('a') else 0.01)
+            with lock:
+                active.remove(sym)
+            return Symbol(str(sym).upper())
+
+        with Expression.setup({'neurosymbolic': TokenEngine()}, scoped=True):
+            text = 'a' * 6 + 'b' * 6 + 'c' * 6 + 'd' * 3
+            res  = [str(r) for r in Symbol(text).stream(expr, workers=3)]
+            self.assertEqual(res, ['AAAAAA', 'BBBBBB', 'CCCCCC', 'DDD'])
+            self.assertLessEqual(max(peak), 3)
+            self.assertGreater(max(peak), 1)
+
+            res  = [str(r) for r in Symbol(text).stream(expr, workers=4, ordered=False)]
+            self.assertEqual(sorted(res), ['AAAAAA', 'BBBBBB', 'CCCCCC', 'DDD'])
+            self.assertEqual(res[-1], 'AAAAAA')
+
+            longest = Stream(expr, retrieval='longest', workers=4)(text)
+            self.assertEqual(len(longest), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
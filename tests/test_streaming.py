@@ -0,0 +1,31 @@
+import asyncio
+import unittest
+
+from symai.backend.streaming import ResponseStream
+
+
+class TestResponseStream(unittest.TestCase):
+    def test_finalize_is_deferred_until_exhausted(self):
+        calls  = []
+        def finalize(text):
+            calls.append(text)
+            return text.strip().upper()
+        stream = ResponseStream(iter([' hel', 'lo ']), finalize=finalize)
+        self.assertEqual(next(iter(stream)), ' hel')
+        self.assertEqual(calls, [])
+        self.assertEqual(list(stream), [' hel', 'lo '])
+        self.assertEqual(stream.result(), 'HELLO')
+        self.assertEqual(calls, [' hello '])
+
+    def test_async_iteration(self):
+        async def deltas():
+            for delta in ['a', 'b', 'c']:
+                yield delta
+        async def consume():
+            stream = ResponseStream(deltas())
+            return [d async for d in stream], await stream.aresult()
+        self.assertEqual(asyncio.run(consume()), (['a', 'b', 'c'], 'abc'))
+
+
+if __name__ == '__main__':
+    unittest.main()
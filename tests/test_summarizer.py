@@ -0,0 +1,106 @@
+import os
+import tempfile
+import threading
+import unittest
+import warnings
+
+from symai import Expression
+from symai.backend.base import Engine
+from symai.backend.cache import SQLiteCache
+from symai.extended import MapReduceSummarizer
+
+
+class CharTokenizer:
+    def encode(self, text, **kwargs):
+        return [ord(c) for c in text]
+
+    def decode(self, tokens):
+        return ''.join(map(chr, tokens))
+
+
+class InitialsEngine(Engine):
+    def __init__(self):
+        super().__init__()
+        self.max_tokens = 100
+        self.calls      = []
+        self._lock      = threading.Lock()
+
+    def forward(self, prompts, *args, **kwargs):
+        with self._lock:
+            self.calls.append(prompts[0])
+        # the summary of a text are the initials of its words
+        return [''.join([w[0] for w in prompts[0].split()])], {}
+
+    def prepare(self, args, kwargs, wrp_params):
+        wrp_params['prompts'] = [str(wrp_params['wrp_self'])]
+
+
+class TestMapReduceSummarizer(unittest.TestCase):
+    def test_tree_reduce_resumes_from_cache(self):
+        text   = ' '.join([f'Sentence {i} holds words.' for i in range(40)])
+        engine = InitialsEngine()
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SQLiteCache(os.path.join(tmp, 'summaries.db'))
+            summarizer = MapReduceSummarizer(chunk_tokens=60, token_budget=12, workers=4, cache=cache, tokenizer=CharTokenizer())
+            with Expression.setup({'neurosymbolic': engine}, scoped=True):
+                res = summarizer(text)
+                self.assertGreater(summarizer.levels, 2)
+                self.assertTrue(all([len(c) <= 61 for c in engine.calls]))
+                # every reduce node stays within the token budget
+                self.assertTrue(all([len(c) <= 12 for c in engine.calls if '\n\n' in c]))
+                first = len(engine.calls)
+
+                engine.calls.clear()
+                self.assertEqual(str(summarizer(text)), str(res))
+                self.assertEqual(engine.calls, [])
+
+                # only the changed chunk and its ancestors are summarized again
+                summarizer(text[:-6] + 'tokens.')
+                self.assertIn('tokens.', engine.calls[0])
+                self.assertLessEqual(len(engine.calls), summarizer.levels)
+                self.assertLess(len(engine.calls), first)
+
+    def test_group_stays_within_budget(self):
+        summarizer = MapReduceSummarizer(token_budget=12, use_cache=False, tokenizer=CharTokenizer())
+        with self.assertWarns(UserWarning):
+            groups = summarizer.group(['abcdefghij', 'ab', 'abc', 'abcd', 'abcdefgh'], 12)
+        self.assertTrue(all([len('\n\n'.join(g)) <= 12 for g in groups]))
+        self.assertEqual(groups, [['abcde', 'ab'], ['abc', 'abcd'], ['abcde']])
+
+    def test_rejects_budgets_which_cannot_converge(self):
+        # two summaries of one token and the separator of two tokens must fit into a group
+        with self.assertRaises(ValueError):
+            MapReduceSummarizer(token_budget=3, use_cache=False, tokenizer=CharTokenizer())
+        MapReduceSummarizer(token_budget=4, use_cache=False, tokenizer=CharTokenizer())
+        # the budget derived from the engine is checked before anything is summarized
+        summarizer = MapReduceSummarizer(chunk_tokens=20, token_ratio=0.03, use_cache=False, tokenizer=CharTokenizer())
+        engine     = InitialsEngine()
+        with Expression.setup({'neurosymbolic': engine}, scoped=True):
+            with self.assertRaises(ValueError):
+                summarizer('some words ' * 10)
+        self.assertEqual(engine.calls, [])
+
+    def test_oversized_summaries_are_summarized_again(self):
+        text       = ' '.join(['alpha beta gamma delta epsilon zeta eta theta'] * 4)
+        engine     = InitialsEngine()
+        summarizer = MapReduceSummarizer(chunk_tokens=50, token_budget=12, use_cache=False, tokenizer=CharTokenizer())
+        with Expression.setup({'neurosymbolic': engine}, scoped=True):
+            with warnings.catch_warnings():
+                warnings.simplefilter('error')
+                summarizer(text)
+        # the summaries of the chunks exceed half of the budget and are summarized again instead of being truncated
+        self.assertIn('abgdezeta', engine.calls)
+
+    def test_key_depends_on_engine_and_model(self):
+        summarizer = MapReduceSummarizer(use_cache=False, tokenizer=CharTokenizer())
+        engine     = InitialsEngine()
+        with Expression.setup({'neurosymbolic': engine}, scoped=True):
+            engine.model = 'model-a'
+            first        = summarizer.key('text', None)
+            engine.model = 'model-b'
+            self.assertNotEqual(summarizer.key('text', None), first)
+            self.assertNotEqual(summarizer.key('text', None, model='model-a'), summarizer.key('text', None))
+
+
+if __name__ == '__main__':
+    unittest.main()
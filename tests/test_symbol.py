@@ -0,0 +1,60 @@
+import copy
+import json
+import pickle
+import unittest
+
+from symai import Expression, Symbol
+from symai.symbol import SymbolEncoder
+
+
+class TestSymbolCore(unittest.TestCase):
+    def test_lazy_fields_and_unwrapping(self):
+        sym = Symbol(['a', Symbol('b')])
+        self.assertIsNone(sym._extra)
+        self.assertEqual(sym.value, ['a', 'b'])
+        self.assertIsNone(sym.metadata)
+        self.assertEqual(sym.static_context, '')
+        self.assertEqual(Symbol('text').upper(), 'TEXT')
+        with self.assertRaises(AttributeError):
+            Symbol('text').missing
+
+        sym.metadata = {'source': 'doc'}
+        self.assertEqual(Symbol(sym).metadata, {'source': 'doc'})
+        self.assertIsNone(Symbol(Symbol('text'))._extra)
+
+    def test_container_values_are_copied(self):
+        values = [1]
+        sym    = Symbol(values)
+        values.append(2)
+        self.assertEqual(sym.value, [1])
+
+        inner = Symbol('a')
+        sym   = Symbol([inner])
+        inner.value = 'b'
+        self.assertEqual(sym.value, ['a'])
+        self.assertEqual(Symbol({'k': inner}).value, {'k': 'b'})
+        self.assertEqual(Symbol((1, Symbol(2))).value, (1, 2))
+
+    def test_token_cache_is_kept_in_extra_fields(self):
+        sym = Symbol('abc')
+        sym._tokens_cache = ('abc', [97, 98, 99])
+        self.assertEqual(sym.tokens, [97, 98, 99])
+        self.assertIn('_tokens_cache', sym._extra)
+        self.assertNotIn('_tokens_cache', sym.__getstate__())
+        self.assertIsNone(pickle.loads(pickle.dumps(sym))._tokens_cache)
+
+    def test_serialization(self):
+        sym = Symbol({'a': Symbol(1)}, static_context='ctx')
+        sym.metadata = {'source': 'doc'}
+        res = pickle.loads(pickle.dumps(sym))
+        self.assertEqual((res.value, res.metadata, res._static_context), ({'a': 1}, {'source': 'doc'}, 'ctx'))
+        self.assertEqual(json.loads(json.dumps(Symbol([Symbol(1)]), cls=SymbolEncoder))['value'], [1])
+
+        expr = Expression('value')
+        expr.attribute = 42
+        res  = copy.deepcopy(expr)
+        self.assertEqual((res.value, res.attribute, res.sym_return_type), ('value', 42, Expression))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from symai import Expression, SimilarityClassification, Symbol, SymbolArray
+from symai.backend.base import Engine
+
+
+class EmbeddingEngine(Engine):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def forward(self, prompts, *args, **kwargs):
+        self.calls += 1
+        return [[[float(p.count('a')), float(p.count('b')), 1.] for p in prompts]], {}
+
+    def prepare(self, args, kwargs, wrp_params):
+        wrp_params['prompts'] = wrp_params['entries']
+
+
+class TestSymbolArray(unittest.TestCase):
+    def test_similarity_is_one_matrix_product(self):
+        engine = EmbeddingEngine()
+        array  = SymbolArray(['aa', 'bb', 'ab', 'aab'])
+        with Expression.setup({'embedding': engine}, scoped=True):
+            scores = array.similarity('a')
+            self.assertEqual(scores.shape, (4,))
+            self.assertEqual(int(np.argmax(scores)), 0)
+            self.assertEqual(array.similarity(['a', 'b']).shape, (4, 2))
+            self.assertEqual(array.similarity(np.eye(3)).shape, (4, 3))
+            # the array is embedded once, the queries once per call
+            self.assertEqual(engine.calls, 3)
+            np.testing.assert_allclose(array.similarity([Symbol('a'), Symbol('b')]), array.similarity(['a', 'b']))
+
+    def test_empty_arrays(self):
+        engine = EmbeddingEngine()
+        with Expression.setup({'embedding': engine}, scoped=True):
+            self.assertEqual(SymbolArray([]).similarity('a').shape, (0,))
+            self.assertEqual(SymbolArray([]).similarity(['a', 'b']).shape, (0, 2))
+            self.assertEqual(SymbolArray(['a']).similarity([]).shape, (1, 0))
+            self.assertEqual(SymbolArray([]).dedup().value, [])
+            self.assertEqual(SymbolArray([]).cluster().value, {})
+            self.assertEqual(SimilarityClassification(['a']).forward_batch([]), [])
+
+    def test_indexing_and_dedup_keep_embeddings(self):
+        array = SymbolArray(['x', 'y', 'z', 'w'], embeddings=[[1., 0.], [0., 1.], [.99, .01], [0., 1.]])
+        sub   = array[[0, 2]]
+        self.assertIsInstance(sub, SymbolArray)
+        self.assertEqual(sub.value, ['x', 'z'])
+        self.assertEqual(sub.embeddings.shape, (2, 2))
+        self.assertEqual(array[1], 'y')
+        self.assertEqual(array.dedup(threshold=.99, block_size=2).value, ['x', 'y'])
+        self.assertEqual(array.dedup(threshold=.99).value, ['x', 'y'])
+
+        array.value = ['a']
+        self.assertIsNone(array.embeddings)
+        with self.assertRaises(ValueError):
+            SymbolArray(['a', 'b'], embeddings=[[1.]])
+        self.assertEqual(SymbolArray(Symbol(['a', Symbol('b')])).value, ['a', 'b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
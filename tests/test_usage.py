@@ -0,0 +1,71 @@
+import threading
+import unittest
+
+from symai.backend.base import Engine
+from symai.backend.usage import UsageAccumulator, UsageMonitor, usage_monitor
+
+
+class TestUsageMonitor(unittest.TestCase):
+    def test_records_api_usage_and_costs(self):
+        class Engine:
+            model   = 'gpt-4'
+            pricing = {'input': 0.03 / 1_000, 'output': 0.06 / 1_000}
+        monitor = UsageMonitor()
+        tracker = UsageAccumulator()
+        monitor.attach(tracker)
+        usage   = {'prompt_tokens': 1_000, 'completion_tokens': 500, 'total_tokens': 1_500}
+        monitor.record(Engine(), {}, {'usage': usage}, 0.5)
+        monitor.record(Engine(), {}, {'cached': True}, 0.0, cached=True)
+        monitor.detach(tracker)
+        monitor.record(Engine(), {}, {'usage': usage}, 0.5)
+
+        stats = tracker.summary()['gpt-4']
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['cached'], 1)
+        self.assertEqual(stats['total_tokens'], 1_500)
+        self.assertAlmostEqual(stats['cost'], 0.06)
+        self.assertEqual(monitor.accumulator.summary()['gpt-4']['calls'], 3)
+        self.assertIn('symai_tokens_total{engine="Engine",model="gpt-4"} 3000', monitor.accumulator.prometheus())
+
+    def test_attached_accumulators_are_scoped_to_the_context(self):
+        class Engine:
+            model = 'gpt-4'
+        monitor = UsageMonitor()
+        tracker = UsageAccumulator()
+        monitor.attach(tracker)
+        thread  = threading.Thread(target=monitor.record, args=(Engine(), {}, {}, 0.1))
+        thread.start()
+        thread.join()
+        monitor.record(Engine(), {}, {}, 0.1)
+        self.assertEqual(tracker.summary()['gpt-4']['calls'], 1)
+        self.assertEqual(monitor.accumulator.summary()['gpt-4']['calls'], 2)
+        monitor.detach(tracker)
+
+    def test_streamed_calls_record_their_usage_when_consumed(self):
+        class Tokenizer:
+            def encode(self, text, **kwargs):
+                return text.split()
+        class StreamEngine(Engine):
+            model     = 'gpt-4'
+            pricing   = {'input': 0.03 / 1_000, 'output': 0.06 / 1_000}
+            tokenizer = Tokenizer()
+            def compute_required_tokens(self, prompts):
+                return len(' '.join(prompts).split())
+            def forward(self, prompts, *args, **kwargs):
+                return self._prepare_stream(iter([{'text': 'one two '}, {'text': 'three'}]), prompts, kwargs, lambda c: c['text'])
+
+        tracker = UsageAccumulator()
+        usage_monitor.attach(tracker)
+        (deltas,), metadata = StreamEngine()(prompts=['a short prompt'])
+        usage_monitor.detach(tracker)
+        self.assertEqual(tracker.summary(), {})
+        # the trackers which were active when the request was sent receive the usage once the stream is consumed
+        self.assertEqual(''.join(deltas), 'one two three')
+        stats = tracker.summary()['gpt-4']
+        self.assertEqual(stats['calls'], 1)
+        self.assertEqual((stats['prompt_tokens'], stats['completion_tokens']), (3, 3))
+        self.assertAlmostEqual(stats['cost'], 0.27 / 1_000)
+
+
+if __name__ == '__main__':
+    unittest.main()